@@ -1,7 +1,12 @@
 # coding=utf-8
 # !/usr/bin/env python3
 
+import multiprocessing
+import os
+import queue
+import threading
 import time
+import traceback
 from typing import Tuple, Any, TypeVar, Generic, Dict, Collection, Sequence, Type, Optional, List
 
 
@@ -43,14 +48,21 @@ class Experiment(Generic[TYPE_A, TYPE_B]):
     def __str__(self):
         return self._name
 
-    def step(self) -> Tuple[float, float, float, float, float]:
+    def _next_examples(self) -> Tuple[Tuple[Any, ...], float, Tuple[Any, ...], float]:
         examples_test = self._stream_test.next()
+        reward_test = self._stream_test.get_reward()
+        examples_train = self._stream_train.next()
+        reward_train = self._stream_train.get_reward()
+        return examples_test, reward_test, examples_train, reward_train
+
+    def step(self) -> Tuple[float, float, float, float, float]:
+        examples_test, reward_test, examples_train, reward_train = self._next_examples()
+
         inputs_test, targets_test = zip(*examples_test)
-        self.reward_test = smear(self.reward_test, self._stream_test.get_reward(), self._iterations)
+        self.reward_test = smear(self.reward_test, reward_test, self._iterations)
 
-        examples_train = self._stream_train.next()
         inputs_train, targets_train = zip(*examples_train)
-        self.reward_train = smear(self.reward_train, self._stream_train.get_reward(), self._iterations)
+        self.reward_train = smear(self.reward_train, reward_train, self._iterations)
 
         this_time = time.time()
 
@@ -67,6 +79,103 @@ class Experiment(Generic[TYPE_A, TYPE_B]):
 
         return self.duration, self.error_train, self.error_test, self.reward_train, self.reward_test
 
+    def close(self):
+        pass
+
+
+class _Prefetcher:
+    # runs a stream in a background thread, at most depth steps ahead of the consumer
+    def __init__(self, stream: ExampleStream, depth: int):
+        if depth < 1:
+            raise ValueError("Prefetch depth must be positive.")
+        self._stream = stream
+        self._queue = queue.Queue(maxsize=depth)                        # type: queue.Queue
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._produce, daemon=True)
+        self._thread.start()
+
+    def _put(self, item: Tuple[str, Any]):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=.1)
+                return
+            except queue.Full:
+                pass
+
+    def _produce(self):
+        try:
+            while not self._stop.is_set():
+                this_time = time.time()
+                examples = self._stream.next()
+                reward = self._stream.get_reward()
+                self._put(("examples", (examples, reward, (time.time() - this_time) * 1000.)))
+
+        except Exception:
+            self._put(("error", traceback.format_exc()))
+
+    def get(self) -> Tuple[Tuple[Any, ...], float, float]:
+        # examples, reward and milliseconds it took to produce them
+        kind, content = self._queue.get()
+        if kind == "error":
+            raise RuntimeError(f"stream {str(self._stream):s} failed:\n{content:s}")
+        return content
+
+    def close(self):
+        self._stop.set()
+        while self._thread.is_alive():
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._thread.join(timeout=.1)
+
+
+class PipelinedExperiment(Experiment[TYPE_A, TYPE_B]):
+    # streams produce examples in background threads while the predictor learns.
+    # only for streams that do not depend on the predictor, i.e. not for interactive ones.
+    def __init__(self,
+                 name: str,
+                 predictor: Predictor[TYPE_B, TYPE_A],
+                 stream_train: ExampleStream[TYPE_B, TYPE_A],
+                 stream_test: ExampleStream[TYPE_B, TYPE_A],
+                 prefetch_depth: int = 4):
+        super().__init__(name, predictor, stream_train, stream_test)
+        self._prefetch_depth = prefetch_depth
+        self._prefetchers = None                                        # type: Optional[Tuple[_Prefetcher, _Prefetcher]]
+
+        # smeared milliseconds per step
+        self.duration_produce_test = 0.
+        self.duration_produce_train = 0.
+        self.duration_wait = 0.
+
+    def _next_examples(self) -> Tuple[Tuple[Any, ...], float, Tuple[Any, ...], float]:
+        # threads start with the first step, after a worker process was forked
+        if self._prefetchers is None:
+            self._prefetchers = _Prefetcher(self._stream_test, self._prefetch_depth), _Prefetcher(self._stream_train, self._prefetch_depth)
+        prefetch_test, prefetch_train = self._prefetchers
+
+        this_time = time.time()
+        examples_test, reward_test, produce_test = prefetch_test.get()
+        examples_train, reward_train, produce_train = prefetch_train.get()
+
+        self.duration_wait = smear(self.duration_wait, (time.time() - this_time) * 1000., self._iterations)
+        self.duration_produce_test = smear(self.duration_produce_test, produce_test, self._iterations)
+        self.duration_produce_train = smear(self.duration_produce_train, produce_train, self._iterations)
+        return examples_test, reward_test, examples_train, reward_train
+
+    def timing(self) -> Dict[str, float]:
+        return {
+            "produce test": self.duration_produce_test,
+            "produce train": self.duration_produce_train,
+            "wait": self.duration_wait,
+            "model": self.duration}
+
+    def close(self):
+        if self._prefetchers is not None:
+            for each_prefetcher in self._prefetchers:
+                each_prefetcher.close()
+            self._prefetchers = None
+
 
 SENSOR_TYPE = TypeVar("SENSOR_TYPE")
 MOTOR_TYPE = TypeVar("MOTOR_TYPE")
@@ -76,8 +185,9 @@ class ExperimentFactory(Generic[TYPE_A, TYPE_B]):
     def __init__(self,
                  predictor_def: Tuple[Type[Predictor[Tuple[TYPE_A, TYPE_B], TYPE_A]], Dict[str, Any]],
                  streams_def: Tuple[Type[ExampleStream[TYPE_B, TYPE_A]], Dict[str, Any], Dict[str, Any]],
-                 controller_def: Optional[Tuple[Type[Controller], Dict[str, Any]]] = None):
-
+                 controller_def: Optional[Tuple[Type[Controller], Dict[str, Any]]] = None,
+                 no_instance: int = 0):
+        # no_instance numbers the first experiment created, the following ones count up from it
         self._predictor_class, self._predictor_args = predictor_def
         self._stream_class, self._train_stream_args, self._test_stream_args = streams_def
 
@@ -99,9 +209,10 @@ class ExperimentFactory(Generic[TYPE_A, TYPE_B]):
             else:
                 raise ValueError(f"unknown task class '{task_train_class.__name__:s}'")
 
-        self._no_experiment = 0
+        self._no_experiment = no_instance
 
-    def create(self) -> Experiment[TYPE_A, TYPE_B]:
+    def create(self, prefetch_depth: int = 0) -> Experiment[TYPE_A, TYPE_B]:
+        # prefetch_depth above zero pipelines non-interactive experiments
         predictor = self._predictor_class(**self._predictor_args)
 
         if self.is_interactive:
@@ -116,7 +227,10 @@ class ExperimentFactory(Generic[TYPE_A, TYPE_B]):
         test_system = self._stream_class(**self._test_stream_args)
 
         name = f"({str(predictor):s}, {str(train_system):s}, {str(test_system):s}) #{self._no_experiment:03d}"
-        experiment = Experiment(name, predictor, train_system, test_system)
+        if 0 < prefetch_depth and not self.is_interactive:
+            experiment = PipelinedExperiment(name, predictor, train_system, test_system, prefetch_depth=prefetch_depth)
+        else:
+            experiment = Experiment(name, predictor, train_system, test_system)
 
         self._no_experiment += 1
         return experiment
@@ -126,7 +240,9 @@ class Setup(Generic[TYPE_A, TYPE_B]):
     Logger.file_name = get_main_script_name() + ".log"
     Logger.dir_path = f"results/{get_time_string():s}/"
 
-    def __init__(self, factory_args: Collection[Dict[str, Any]], no_instances: int, max_iterations: int, storage_interval_its: int = 1000, visualization_interval_secs: float = 1.):
+    def __init__(self, factory_args: Collection[Dict[str, Any]], no_instances: int, max_iterations: int, storage_interval_its: int = 1000, visualization_interval_secs: float = 1.,
+                 prefetch_depth: int = 0):
+        # prefetch_depth above zero lets streams of non-interactive experiments run ahead in background threads
         self._no_instances = no_instances
         self._max_iterations = max_iterations
 
@@ -134,7 +250,7 @@ class Setup(Generic[TYPE_A, TYPE_B]):
         self._storage_interval = storage_interval_its
 
         factories = tuple(ExperimentFactory[TYPE_A, TYPE_B](**each_args) for each_args in factory_args)
-        self._experiments = tuple(tuple(_f.create() for _ in range(self._no_instances)) for _f in factories)
+        self._experiments = tuple(tuple(_f.create(prefetch_depth=prefetch_depth) for _ in range(self._no_instances)) for _f in factories)
 
         self._visualization = 0. < visualization_interval_secs
         if self._visualization:
@@ -192,6 +308,17 @@ class Setup(Generic[TYPE_A, TYPE_B]):
                 file_dict.add("reward test", each_instance.reward_test)
 
         Setup._save_results_batch(self._iteration, file_data)
+        self._log_timing()
+
+    @staticmethod
+    def _format_timing(timing: Dict[str, float]) -> str:
+        return ", ".join(f"{_stage:s} {_ms:.3f}ms" for _stage, _ms in timing.items())
+
+    def _log_timing(self):
+        for _i, each_array in enumerate(self._experiments):
+            for _j, each_instance in enumerate(each_array):
+                if isinstance(each_instance, PipelinedExperiment):
+                    Logger.log(f"iteration {self._iteration:d} experiment_{_i:02d} instance {_j:d}: {Setup._format_timing(each_instance.timing()):s}")
 
     def _new_frame(self, frames: List[Any]):
         frame = None
@@ -211,28 +338,204 @@ class Setup(Generic[TYPE_A, TYPE_B]):
         frames = []
 
         last_time = time.time()
-        while True:
-            # simulate
-            for _i, each_array in enumerate(self._experiments):
+        try:
+            while True:
+                # simulate
+                for _i, each_array in enumerate(self._experiments):
+                    for each_instance in each_array:
+                        each_instance.step()
+
+                # add new frame
+                if len(frames) < no_frames:
+                    self._new_frame(frames)
+
+                # plot result
+                now_time = time.time()
+                if now_time - last_time >= self._visualization_interval:
+                    self._plot_progress()
+                    self._plot_live(frames)
+                    last_time = now_time
+
+                # store result
+                if 0 < self._storage_interval and self._iteration % self._storage_interval == 0:
+                    self._store()
+
+                # iteration control
+                self._iteration += 1
+                if self._iteration >= self._max_iterations > 0:
+                    break
+
+        finally:
+            # stops prefetching threads also when a step failed
+            for each_array in self._experiments:
                 for each_instance in each_array:
-                    each_instance.step()
+                    each_instance.close()
+
+
+METRICS = Tuple[float, float, float, float, float]
+METRIC_ROW = Tuple[int, int, int, METRICS]
+
+_metric_queue = None                # type: Optional[multiprocessing.Queue]
+_POLL_SECS = .1
+
+
+class ExperimentResult:
+    # latest metrics of an experiment running in a worker process, same attributes as Experiment
+    def __init__(self):
+        self.duration = 0.
+        self.error_train = 0.
+        self.error_test = 0.
+        self.reward_train = 0.
+        self.reward_test = 0.
+        self.iteration = 0
+        self.finished = False
+
+    def update(self, iteration: int, metrics: METRICS):
+        self.iteration = iteration
+        self.duration, self.error_train, self.error_test, self.reward_train, self.reward_test = metrics
+
+
+def _initialize_worker(metric_queue: multiprocessing.Queue):
+    global _metric_queue
+    _metric_queue = metric_queue
+
+
+def _run_worker(no_experiment: int, no_instance: int, factory_args: Dict[str, Any], max_iterations: int, report_interval: int, report_secs: float, prefetch_depth: int = 0):
+    # builds its own experiment, streams and predictors often hold generators that cannot be pickled
+    experiment = None
+    try:
+        factory = ExperimentFactory(no_instance=no_instance, **factory_args)
+        experiment = factory.create(prefetch_depth=prefetch_depth)
+
+        rows = []                                                       # type: List[METRIC_ROW]
+        last_time = time.time()
+        iteration = 0
+        while True:
+            metrics = experiment.step()
+            iteration += 1
+            finished = iteration >= max_iterations > 0
 
-            # add new frame
-            if len(frames) < no_frames:
-                self._new_frame(frames)
+            if iteration % report_interval == 0 or finished:
+                rows.append((no_experiment, no_instance, iteration, metrics))
 
-            # plot result
             now_time = time.time()
-            if now_time - last_time >= self._visualization_interval:
-                self._plot_progress()
-                self._plot_live(frames)
+            if 0 < len(rows) and (finished or now_time - last_time >= report_secs):
+                _metric_queue.put(("rows", rows))
+                rows = []
                 last_time = now_time
 
-            # store result
-            if 0 < self._storage_interval and self._iteration % self._storage_interval == 0:
-                self._store()
-
-            # iteration control
-            self._iteration += 1
-            if self._iteration >= self._max_iterations > 0:
+            if finished:
                 break
+
+    except Exception:
+        _metric_queue.put(("error", (no_experiment, no_instance, traceback.format_exc())))
+        return
+
+    finally:
+        if experiment is not None:
+            experiment.close()
+
+    timing = experiment.timing() if isinstance(experiment, PipelinedExperiment) else None
+    _metric_queue.put(("done", (no_experiment, no_instance, timing)))
+
+
+class ParallelSetup(Setup[TYPE_A, TYPE_B]):
+    # every instance of every experiment runs in its own worker process, at most no_processes at a time.
+    # workers send metric rows over a queue, this process stores and plots them.
+    def __init__(self, factory_args: Collection[Dict[str, Any]], no_instances: int, max_iterations: int, storage_interval_its: int = 1000, visualization_interval_secs: float = 1.,
+                 no_processes: int = -1, prefetch_depth: int = 0):
+        self._no_instances = no_instances
+        self._max_iterations = max_iterations
+
+        self._visualization_interval = visualization_interval_secs
+        self._storage_interval = storage_interval_its
+        self._no_processes = (os.cpu_count() or 1) if no_processes < 1 else no_processes
+        self._prefetch_depth = prefetch_depth
+
+        self._factory_args = tuple(factory_args)
+        self._experiments = tuple(tuple(ExperimentResult() for _ in range(no_instances)) for _ in self._factory_args)
+        self._pending = dict()                                          # type: Dict[Tuple[int, int], Dict[int, METRICS]]
+
+        self._visualization = 0. < visualization_interval_secs
+        if self._visualization:
+            SemioticVisualization.initialize(("reward", "error", "duration"), no_instances, length=max_iterations)
+
+        self._iteration = 0
+
+    def _store_row(self, no_experiment: int, no_instance: int, iteration: int, metrics: METRICS):
+        # a row is written once all instances of the experiment reached the iteration
+        instances = self._pending.setdefault((no_experiment, iteration), dict())
+        instances[no_instance] = metrics
+        if len(instances) < self._no_instances:
+            return
+        del self._pending[(no_experiment, iteration)]
+
+        file_dict = DictList()
+        for _i in range(self._no_instances):
+            duration, error_train, error_test, reward_train, reward_test = instances[_i]
+            file_dict.add("duration", duration)
+            file_dict.add("error train", error_train)
+            file_dict.add("error test", error_test)
+            file_dict.add("reward train", reward_train)
+            file_dict.add("reward test", reward_test)
+        Setup._save_results_batch(iteration, {f"experiment_{no_experiment:02d}": file_dict})
+
+    def _receive(self, message: Tuple[str, Any]):
+        kind, content = message
+        if kind == "rows":
+            for no_experiment, no_instance, iteration, metrics in content:
+                self._experiments[no_experiment][no_instance].update(iteration, metrics)
+                if 0 < self._storage_interval and iteration % self._storage_interval == 0:
+                    self._store_row(no_experiment, no_instance, iteration, metrics)
+
+        elif kind == "done":
+            no_experiment, no_instance, timing = content
+            self._experiments[no_experiment][no_instance].finished = True
+            if timing is not None:
+                Logger.log(f"experiment_{no_experiment:02d} instance {no_instance:d}: {Setup._format_timing(timing):s}")
+
+        elif kind == "error":
+            no_experiment, no_instance, trace = content
+            raise RuntimeError(f"experiment {no_experiment:d} instance {no_instance:d} failed:\n{trace:s}")
+
+        else:
+            raise ValueError(f"unknown message '{kind:s}'")
+
+    def run_experiment(self):
+        no_workers = len(self._factory_args) * self._no_instances
+        report_interval = self._storage_interval if 0 < self._storage_interval else 1000
+        report_secs = self._visualization_interval if self._visualization else 1.
+
+        metric_queue = multiprocessing.Queue()
+        with multiprocessing.Pool(min(self._no_processes, no_workers), initializer=_initialize_worker, initargs=(metric_queue,)) as pool:
+            results = []
+            for no_experiment, each_args in enumerate(self._factory_args):
+                for no_instance in range(self._no_instances):
+                    each_result = pool.apply_async(_run_worker, (no_experiment, no_instance, each_args, self._max_iterations, report_interval, report_secs, self._prefetch_depth))
+                    results.append(each_result)
+            pool.close()
+
+            last_time = time.time()
+            no_finished = 0
+            while no_finished < no_workers:
+                try:
+                    self._receive(metric_queue.get(timeout=_POLL_SECS))
+                except queue.Empty:
+                    pass
+
+                # raises what failed outside of _run_worker, e.g. arguments that cannot be pickled
+                for each_result in results:
+                    if each_result.ready():
+                        each_result.get()
+
+                no_finished = sum(each_instance.finished for each_array in self._experiments for each_instance in each_array)
+                self._iteration = min(each_instance.iteration for each_array in self._experiments for each_instance in each_array)
+
+                now_time = time.time()
+                if now_time - last_time >= self._visualization_interval:
+                    self._plot_progress()
+                    last_time = now_time
+
+            pool.join()
+
+        self._plot_progress()
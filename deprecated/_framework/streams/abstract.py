@@ -1,6 +1,7 @@
 # coding=utf-8
 from typing import TypeVar, Generic, Tuple
 
+from tools.ring_buffer import RingBuffer
 
 INPUT_TYPE = TypeVar("INPUT_TYPE")
 INPUT_HISTORY = Tuple[INPUT_TYPE, ...]
@@ -17,7 +18,7 @@ class ExampleStream(Generic[INPUT_TYPE, OUTPUT_TYPE]):
         self._reward = 0.
         self._history_length = history_length
 
-        self._input_histories = tuple([] for _ in range(no_examples))
+        self._input_histories = tuple(RingBuffer[INPUT_TYPE](max(1, history_length)) for _ in range(no_examples))
 
     def __str__(self):
         raise NotImplementedError()
@@ -28,7 +29,6 @@ class ExampleStream(Generic[INPUT_TYPE, OUTPUT_TYPE]):
 
         for each_history, each_input in zip(self._input_histories, inputs):
             each_history.append(each_input)
-            del each_history[:-self._history_length]
 
     def _before(self):
         raise NotImplementedError()
@@ -48,7 +48,7 @@ class ExampleStream(Generic[INPUT_TYPE, OUTPUT_TYPE]):
         inputs = self._get_inputs()
         self.__memorize_inputs(inputs)
         outputs = self._get_outputs()
-        examples = tuple((tuple(each_input_history), each_output) for each_input_history, each_output in zip(self._input_histories, outputs))
+        examples = tuple((each_input_history.as_tuple(), each_output) for each_input_history, each_output in zip(self._input_histories, outputs))
 
         self._after()
         return examples
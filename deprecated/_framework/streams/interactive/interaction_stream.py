@@ -41,9 +41,9 @@ class InteractionStream(ExampleStream[SENSORIMOTOR_INPUT[SENSOR_TYPE, MOTOR_TYPE
     def _before(self):
         sensorimotor_history = self._input_histories[0]
         if 0 < len(sensorimotor_history):
-            sensorimotor_history.pop(0)
+            sensorimotor_history.popleft()
 
-        perception = tuple(sensorimotor_history), self._sensor, self._predictor.get_state()
+        perception = sensorimotor_history.as_tuple(), self._sensor, self._predictor.get_state()
         self._action = self._controller.decide(perception)                  # (sensor, motor)*, sensor, state
         self._next_sensor, self._reward = self._task.respond(self._action)  # ((sensor, motor)*, sensor, state), motor
 
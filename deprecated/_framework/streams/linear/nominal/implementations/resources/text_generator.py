@@ -1,15 +1,9 @@
 # coding=utf-8
-import string
 from typing import Generator
 
+from tools.corpus import corpus_characters
 
-def sequence_nominal_text(file_path: str) -> Generator[str, None, None]:
-    permissible_non_letter = string.digits + string.punctuation + " "
-    with open(file_path, mode="r") as file:
-        for line in file:
-            for character in line:
-                if character in string.ascii_letters:
-                    yield character.lower()
 
-                elif character in permissible_non_letter:
-                    yield character
+def sequence_nominal_text(file_path: str) -> Generator[str, None, None]:
+    # lower case letters, digits, punctuation and spaces, read from the encoded corpus
+    yield from corpus_characters(file_path, mode="nominal")
@@ -2,7 +2,7 @@
 from typing import Tuple, Sequence
 
 from _framework.data_types import RATIONAL_INPUT, RATIONAL_OUTPUT
-from _framework.streams.linear.rational.implementations.resources.crypto_generator import equisample, binance_generator
+from _framework.streams.linear.rational.implementations.resources.crypto_generator import binance_values
 from _framework.streams.linear.rational.abstract import RationalStream
 from dateutil import parser
 
@@ -23,12 +23,12 @@ class ExchangeRateStream(RationalStream):
         end_ts = dt_obj.timestamp()
 
         self._input_sequences = tuple(
-            equisample(binance_generator(_each_path, start_timestamp=start_ts, end_timestamp=end_ts - offset_seconds), interval_seconds)
+            binance_values(_each_path, interval_seconds, start_timestamp=start_ts, end_timestamp=end_ts - offset_seconds)
             for _each_path in input_file_paths
         )
 
         self._target_sequences = tuple(
-            equisample(binance_generator(_each_path, start_timestamp=start_ts + offset_seconds, end_timestamp=end_ts), interval_seconds)
+            binance_values(_each_path, interval_seconds, start_timestamp=start_ts + offset_seconds, end_timestamp=end_ts)
             for _each_path in target_file_paths
         )
 
@@ -1,10 +1,10 @@
 # coding=utf-8
-import json
 import random
-from typing import Collection
+from typing import Collection, Hashable
 
 from _framework.data_types import NOMINAL_MOTOR, NOMINAL_SENSOR
 from _framework.systems.controllers.nominal.abstract import NominalController
+from tools.q_table import QTable
 
 
 class NominalSarsaController(NominalController):
@@ -15,14 +15,29 @@ class NominalSarsaController(NominalController):
         self._epsilon = epsilon
         self._default_evaluation = default_evaluation
 
-        self._evaluation_function = dict()
+        self._motors = tuple(motor_space)
+        self._motor_indices = {_m: _i for _i, _m in enumerate(self._motors)}
+        self._evaluation_function = QTable(len(self._motors), default_evaluation=default_evaluation)
 
         self._last_condition = None
         self._last_reward = 0.
 
+        # decide and integrate receive the same perception object, its row is looked up once
+        self._cached_perception = None
+        self._cached_row = -1
+
     def store_evaluation_function(self, file_path: str):
-        with open(file_path, mode="w") as file:
-            json.dump(tuple((str(_x), _y) for _x, _y in self._evaluation_function.items()), file, sort_keys=True, indent=2)
+        # binary snapshot, restore with QTable.load_from
+        self._evaluation_function.save_as(file_path)
+
+    def _key(self, perception: NOMINAL_SENSOR) -> Hashable:
+        return perception
+
+    def _row(self, perception: NOMINAL_SENSOR) -> int:
+        if perception is not self._cached_perception:
+            self._cached_row = self._evaluation_function.intern(self._key(perception))
+            self._cached_perception = perception
+        return self._cached_row
 
     def decide(self, perception: NOMINAL_SENSOR) -> NOMINAL_MOTOR:
         # exploration
@@ -30,35 +45,22 @@ class NominalSarsaController(NominalController):
             action = self._random_action()
 
         else:
-            # new perception
-            sub_dict = self._evaluation_function.get(perception)
-            if sub_dict is None:
-                action = self._random_action()
-
-            else:
-                # best action
-                action, _ = max(sub_dict.items(), key=lambda _x: _x[1])
+            # best action, random for new perception
+            best = self._evaluation_function.best(self._row(perception))
+            action = self._random_action() if best < 0 else self._motors[best]
 
         return action
 
     def _integrate(self, perception: NOMINAL_SENSOR, action: NOMINAL_MOTOR, reward: float):
-        sub_dict = self._evaluation_function.get(perception)
-        if sub_dict is None:
-            this_evaluation = self._default_evaluation
-        else:
-            this_evaluation = sub_dict.get(action, self._default_evaluation)
+        this_row = self._row(perception)
+        this_motor = self._motor_indices[action]
+        this_evaluation = self._evaluation_function.evaluate(this_row, this_motor)
 
         if self._last_condition is not None:
-            last_perception, last_action = self._last_condition
+            last_row, last_motor = self._last_condition
 
             new_value = self._last_reward + self._gamma * this_evaluation
-            last_sub_dict = self._evaluation_function.get(last_perception)
-
-            if last_sub_dict is None:
-                self._evaluation_function[last_perception] = {last_action: new_value}
-            else:
-                last_evaluation = last_sub_dict.get(last_action, self._default_evaluation)
-                last_sub_dict[last_action] = last_evaluation + self._alpha * (new_value - last_evaluation)
+            self._evaluation_function.update(last_row, last_motor, new_value, self._alpha)
 
-        self._last_condition = perception, action
+        self._last_condition = this_row, this_motor
         self._last_reward = reward
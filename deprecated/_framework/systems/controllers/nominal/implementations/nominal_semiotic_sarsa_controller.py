@@ -1,17 +1,68 @@
 # coding=utf-8
-from typing import Collection
+from typing import Collection, Hashable, Optional, Sequence
 
-from _framework.data_types import NOMINAL_MOTOR, NOMINAL_SENSOR
-from _framework.systems.controllers.nominal.abstract import NominalController
+import numpy
 
+from _framework.data_types import NOMINAL_MOTOR, NOMINAL_SENSOR, PREDICTOR_STATE
+from _framework.streams.interactive.interaction_stream import CONTROLLER_PERCEPTION
+from _framework.systems.controllers.nominal.implementations.nominal_sarsa_controller import NominalSarsaController
+from tools.q_table import QTable
 
-class NominalSemioticSarsaController(NominalController):
-    def __init__(self, motor_space: Collection[NOMINAL_MOTOR], *args, **kwargs):
-        super().__init__(motor_space, *args, **kwargs)
-        raise NotImplementedError()
 
-    def decide(self, perception: NOMINAL_SENSOR) -> NOMINAL_MOTOR:
-        raise NotImplementedError()
+def _truncate(state: Sequence[int], no_levels: int) -> Sequence[int]:
+    # shapes of the lowest levels, all levels for negative no_levels
+    return tuple(state) if no_levels < 0 else tuple(state[:no_levels])
 
-    def _integrate(self, perception: NOMINAL_SENSOR, action: NOMINAL_MOTOR, reward: float):
-        raise NotImplementedError()
+
+class NominalSemioticSarsaController(NominalSarsaController):
+    # sarsa on the current sensor and the state of the semiotic model instead of the whole sensorimotor history.
+    # the state is the context shape per level and already summarizes the history.
+    def __init__(self, motor_space: Collection[NOMINAL_MOTOR], alpha: float, gamma: float, epsilon: float, default_evaluation: float = 0., no_levels: int = -1, *args, **kwargs):
+        super().__init__(motor_space, alpha, gamma, epsilon, default_evaluation=default_evaluation, *args, **kwargs)
+        self._no_levels = no_levels
+
+    def _key(self, perception: CONTROLLER_PERCEPTION) -> Hashable:
+        _, sensor, predictor_state = perception
+        return sensor, tuple(_truncate(each_state, self._no_levels) for each_state in predictor_state)
+
+
+class NominalSemioticSarsaBatchController:
+    # one sarsa controller per example of a semiotic model with no_agents examples, all sharing one q-table.
+    # motors are indices into motor_space.
+    def __init__(self, motor_space: Collection[NOMINAL_MOTOR], alpha: float, gamma: float, epsilon: float, default_evaluation: float = 0., no_levels: int = -1,
+                 random_state: Optional[numpy.random.Generator] = None):
+        self.motor_space = tuple(motor_space)
+        self._alpha = alpha
+        self._gamma = gamma
+        self._epsilon = epsilon
+        self._no_levels = no_levels
+        self._random_state = numpy.random.default_rng() if random_state is None else random_state
+
+        self.evaluation_function = QTable(len(self.motor_space), default_evaluation=default_evaluation)
+
+        self._rows = None                                           # type: Optional[numpy.ndarray]
+        self._motors = None                                         # type: Optional[numpy.ndarray]
+        self._last_rows = None                                      # type: Optional[numpy.ndarray]
+        self._last_motors = None                                    # type: Optional[numpy.ndarray]
+        self._last_rewards = None                                   # type: Optional[numpy.ndarray]
+
+    def decide_batch(self, sensors: Sequence[NOMINAL_SENSOR], predictor_state: PREDICTOR_STATE) -> numpy.ndarray:
+        # sensors and predictor state hold one entry per agent
+        keys = ((_sensor, _truncate(_state, self._no_levels)) for _sensor, _state in zip(sensors, predictor_state))
+        self._rows = self.evaluation_function.intern_batch(keys)
+        self._motors = self.evaluation_function.select_batch(self._rows, self._epsilon, random_state=self._random_state)
+        return self._motors
+
+    def integrate_batch(self, rewards: Sequence[float]):
+        # rewards for the motors of the last decision
+        if self._rows is None:
+            raise ValueError("No decision to integrate.")
+
+        if self._last_rows is not None:
+            evaluations = self.evaluation_function.evaluate_batch(self._rows, self._motors)
+            targets = self._last_rewards + self._gamma * evaluations
+            self.evaluation_function.update_batch(self._last_rows, self._last_motors, targets, self._alpha)
+
+        self._last_rows, self._last_motors = self._rows, self._motors
+        self._last_rewards = numpy.asarray(rewards, dtype=float)
+        self._rows, self._motors = None, None
@@ -9,6 +9,7 @@ OUTPUT_TYPE = TypeVar("OUTPUT_TYPE")
 
 
 class Predictor(System[Tuple[Tuple[INPUT_TYPE, ...], ...], Tuple[OUTPUT_TYPE, ...]], Generic[INPUT_TYPE, OUTPUT_TYPE]):
+    # one input history and one output per state. implementations may also take numpy arrays with one row per state.
     def __init__(self, no_states: int, *args, **kwargs):
         self._no_states = no_states
 
@@ -1,15 +1,27 @@
 # coding=utf-8
-from typing import Tuple
+from typing import Tuple, Union
+
+import numpy
 
 from _framework.data_types import NOMINAL_INPUT, NOMINAL_OUTPUT, PREDICTOR_STATE
 from _framework.systems.predictors.abstract import Predictor
 
+NOMINAL_INPUTS = Union[Tuple[Tuple[NOMINAL_INPUT, ...], ...], numpy.ndarray]
+NOMINAL_OUTPUTS = Union[Tuple[NOMINAL_OUTPUT, ...], numpy.ndarray]
+
 
 class NominalPredictor(Predictor[NOMINAL_INPUT, NOMINAL_OUTPUT]):
     def __init__(self, no_states: int, *args, **kwargs):
         super().__init__(no_states, *args, **kwargs)
         self._dummy = tuple("#" for _ in range(no_states))
 
+    @staticmethod
+    def _as_tuples(data: Union[NOMINAL_INPUTS, NOMINAL_OUTPUTS]) -> Tuple[NOMINAL_INPUT, ...]:
+        # for predictors that work on tuples, rows of arrays become tuples
+        if isinstance(data, numpy.ndarray):
+            return tuple(tuple(_row) if isinstance(_row, list) else _row for _row in data.tolist())
+        return data
+
     def _predict(self, data_in: Tuple[Tuple[NOMINAL_INPUT, ...], ...]) -> Tuple[NOMINAL_OUTPUT, ...]:
         raise NotImplementedError()
 
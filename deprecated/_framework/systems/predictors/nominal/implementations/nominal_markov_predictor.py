@@ -1,28 +1,49 @@
 # coding=utf-8
-from typing import Tuple
+from typing import Dict, Hashable, List, Tuple
 
-from _framework.data_types import NOMINAL_INPUT, NOMINAL_OUTPUT, PREDICTOR_STATE
-from _framework.systems.predictors.nominal.abstract import NominalPredictor
+import numpy
+
+from _framework.data_types import NOMINAL_OUTPUT, PREDICTOR_STATE
+from _framework.systems.predictors.nominal.abstract import NominalPredictor, NOMINAL_INPUTS, NOMINAL_OUTPUTS
 
 
 class NominalMarkov(NominalPredictor):
+    # output counts per state and input history, the most frequent output is predicted and ties go to the earliest one.
+    # every state has its own table. histories are tuples of symbols or arrays of shape (no_states x history_length),
+    # array inputs are answered with arrays.
     def __init__(self, no_states: int):
         super().__init__(no_states)
-        self._table = dict()
-
-    def _predict(self, data_in: Tuple[Tuple[NOMINAL_INPUT, ...], ...]) -> Tuple[NOMINAL_OUTPUT, ...]:
-        sub_dict = self._table.get(data_in)
-        if sub_dict is None:
-            return self._dummy
-        prediction, _ = max(sub_dict.items(), key=lambda x: x[1])
-        return prediction
-
-    def _fit(self, data_in: Tuple[Tuple[NOMINAL_INPUT, ...], ...], data_out: Tuple[NOMINAL_OUTPUT, ...]):
-        sub_dict = self._table.get(data_in)
-        if sub_dict is None:
-            self._table[data_in] = {data_out: 1}
-        else:
-            sub_dict[data_out] = sub_dict.get(data_out, 0) + 1
+        self._tables = tuple(dict() for _ in range(no_states))                     # type: Tuple[Dict[Hashable, Dict[NOMINAL_OUTPUT, int]], ...]
+
+    def _histories(self, data_in: NOMINAL_INPUTS) -> List[Hashable]:
+        if isinstance(data_in, numpy.ndarray):
+            return [tuple(_h) for _h in data_in.reshape(self._no_states, -1).tolist()]
+        return data_in
+
+    def _predict(self, data_in: NOMINAL_INPUTS) -> NOMINAL_OUTPUTS:
+        outputs = []
+        for each_table, each_history in zip(self._tables, self._histories(data_in)):
+            sub_dict = each_table.get(each_history)
+            if sub_dict is None:
+                outputs.append("#")
+            else:
+                prediction, _ = max(sub_dict.items(), key=lambda x: x[1])
+                outputs.append(prediction)
+
+        if isinstance(data_in, numpy.ndarray):
+            return numpy.fromiter(outputs, dtype=object, count=self._no_states)
+        return tuple(outputs)
+
+    def _fit(self, data_in: NOMINAL_INPUTS, data_out: NOMINAL_OUTPUTS):
+        if isinstance(data_out, numpy.ndarray):
+            data_out = data_out.tolist()
+
+        for each_table, each_history, each_output in zip(self._tables, self._histories(data_in), data_out):
+            sub_dict = each_table.get(each_history)
+            if sub_dict is None:
+                each_table[each_history] = {each_output: 1}
+            else:
+                sub_dict[each_output] = sub_dict.get(each_output, 0) + 1
 
     def get_state(self) -> PREDICTOR_STATE:
         return tuple()
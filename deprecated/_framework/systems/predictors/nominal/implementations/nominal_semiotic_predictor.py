@@ -19,10 +19,10 @@ class NominalSemiotic(NominalPredictor):
         self._predictor = SemioticModel[NOMINAL_INPUT, NOMINAL_OUTPUT](no_states, alpha, sigma, **semiotic_keywords)
 
     def _predict(self, data_in: Tuple[Tuple[NOMINAL_INPUT, ...], ...]) -> Tuple[NOMINAL_OUTPUT, ...]:
-        return self._predictor.predict(data_in)
+        return self._predictor.predict(self._as_tuples(data_in))
 
     def _fit(self, data_in: Tuple[Tuple[NOMINAL_INPUT, ...], ...], data_out: Tuple[NOMINAL_OUTPUT, ...]):
-        self._predictor.fit(data_in, data_out)
+        self._predictor.fit(self._as_tuples(data_in), self._as_tuples(data_out))
 
     def get_state(self) -> PREDICTOR_STATE:
         return self._predictor.get_state()
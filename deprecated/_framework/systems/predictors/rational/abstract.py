@@ -1,11 +1,18 @@
 # coding=utf-8
-from typing import Tuple
+from typing import Tuple, Union
+
+import numpy
 
 from _framework.data_types import RATIONAL_INPUT, RATIONAL_OUTPUT, PREDICTOR_STATE
 from _framework.systems.predictors.abstract import Predictor
 
+RATIONAL_INPUTS = Union[Tuple[Tuple[RATIONAL_INPUT, ...], ...], numpy.ndarray]
+RATIONAL_OUTPUTS = Union[Tuple[RATIONAL_OUTPUT, ...], numpy.ndarray]
+
 
 class RationalPredictor(Predictor[RATIONAL_INPUT, RATIONAL_OUTPUT]):
+    # inputs are tuples of input histories or arrays of shape (no_states x history_length x input_dimensions)
+    # or (no_states x history_length * input_dimensions). array inputs are answered with arrays.
     def __init__(self, no_states: int, input_dimensions: int, output_dimensions: int, drag: int):
         super().__init__(no_states)
         assert drag >= 0
@@ -13,31 +20,32 @@ class RationalPredictor(Predictor[RATIONAL_INPUT, RATIONAL_OUTPUT]):
         self._out_dim = output_dimensions
         self._drag = drag
 
-    def _low_fit(self, data_in: Tuple[Tuple[RATIONAL_INPUT, ...], ...], data_out: Tuple[RATIONAL_OUTPUT, ...]):
-        raise NotImplementedError()
+    def _flat_inputs(self, data_in: RATIONAL_INPUTS) -> numpy.ndarray:
+        # (no_states x history_length * input_dimensions)
+        inputs = numpy.asarray(data_in, dtype=float)
+        assert inputs.ndim in (2, 3) and len(inputs) == self._no_states
+        assert inputs.shape[-1] % self._in_dim == 0 if inputs.ndim == 2 else inputs.shape[-1] == self._in_dim
+        return inputs.reshape(self._no_states, -1)
 
-    def _low_predict(self, data_in: Tuple[Tuple[RATIONAL_INPUT, ...], ...]) -> Tuple[RATIONAL_OUTPUT, ...]:
+    def _low_fit(self, inputs: numpy.ndarray, targets: numpy.ndarray):
         raise NotImplementedError()
 
-    def _fit(self, data_in: Tuple[Tuple[RATIONAL_INPUT, ...], ...], data_out: Tuple[RATIONAL_OUTPUT, ...]):
-        assert len(data_in) == self._no_states
-        assert len(data_out) == self._no_states
-
-        assert all(len(_i) == self._in_dim for _h in data_in for _i in _h)
-        assert all(len(_o) == self._out_dim for _o in data_out)
-
-        self._low_fit(data_in, data_out)
+    def _low_predict(self, inputs: numpy.ndarray) -> numpy.ndarray:
+        raise NotImplementedError()
 
-    def _predict(self, data_in: Tuple[Tuple[RATIONAL_INPUT, ...], ...]) -> Tuple[RATIONAL_OUTPUT, ...]:
-        assert len(data_in) == self._no_states
-        assert all(len(_i) == self._in_dim for _h in data_in for _i in _h)
+    def _fit(self, data_in: RATIONAL_INPUTS, data_out: RATIONAL_OUTPUTS):
+        targets = numpy.asarray(data_out, dtype=float)
+        assert targets.shape == (self._no_states, self._out_dim)
 
-        data_out = self._low_predict(data_in)
+        self._low_fit(self._flat_inputs(data_in), targets)
 
-        assert len(data_out) == self._no_states
-        assert all(len(_o) == self._out_dim for _o in data_out)
+    def _predict(self, data_in: RATIONAL_INPUTS) -> RATIONAL_OUTPUTS:
+        outputs = numpy.asarray(self._low_predict(self._flat_inputs(data_in)), dtype=float)
+        assert outputs.shape == (self._no_states, self._out_dim)
 
-        return data_out
+        if isinstance(data_in, numpy.ndarray):
+            return outputs
+        return tuple(tuple(_o) for _o in outputs.tolist())
 
     def get_state(self) -> PREDICTOR_STATE:
         raise NotImplementedError()
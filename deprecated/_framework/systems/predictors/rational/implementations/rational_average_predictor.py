@@ -1,7 +1,7 @@
 # coding=utf-8
-from typing import Tuple
+import numpy
 
-from _framework.data_types import RATIONAL_INPUT, RATIONAL_OUTPUT, PREDICTOR_STATE
+from _framework.data_types import PREDICTOR_STATE
 from _framework.systems.predictors.rational.abstract import RationalPredictor
 from tools.functionality import smear
 
@@ -9,18 +9,15 @@ from tools.functionality import smear
 class RationalAverage(RationalPredictor):
     def __init__(self, no_states: int, input_dimensions: int, output_dimensions: int, drag: int):
         super().__init__(no_states, input_dimensions, output_dimensions, drag)
-        self._average = tuple([0. for _ in range(output_dimensions)] for _ in range(no_states))
+        self._average = numpy.zeros((no_states, output_dimensions))
         self._iteration = 0
 
-    def _low_predict(self, data_in: Tuple[Tuple[RATIONAL_INPUT, ...], ...]) -> Tuple[RATIONAL_OUTPUT, ...]:
-        return tuple(tuple(_o) for _o in self._average)
+    def _low_predict(self, inputs: numpy.ndarray) -> numpy.ndarray:
+        return self._average.copy()
 
-    def _low_fit(self, data_in: Tuple[Tuple[RATIONAL_INPUT, ...], ...], data_out: Tuple[RATIONAL_OUTPUT, ...]):
+    def _low_fit(self, inputs: numpy.ndarray, targets: numpy.ndarray):
         inertia = self._iteration if self._drag == 0 else self._drag
-
-        for each_target, each_average in zip(data_out, self._average):
-            for _i, (_t, _a) in enumerate(zip(each_target, each_average)):
-                each_average[_i] = smear(_a, _t, inertia)
+        self._average = smear(self._average, targets, inertia)
 
     def get_state(self) -> PREDICTOR_STATE:
         return tuple()
@@ -1,6 +1,8 @@
 # coding=utf-8
 from typing import Callable, Tuple
 
+import numpy
+
 from _framework.data_types import RATIONAL_INPUT, PREDICTOR_STATE
 from _framework.systems.predictors.nominal.resources.semiotic_model import SemioticModel
 from _framework.systems.predictors.rational.abstract import RationalPredictor
@@ -20,13 +22,12 @@ class RationalSemiotic(RationalPredictor):
             "drag": 1}
         self._predictor = SemioticModel[Tuple[RATIONAL_INPUT, ...], RATIONAL_INPUT](no_states, alpha, sigma, **semiotic_keywords)
 
-    def _low_predict(self, data_in: Tuple[Tuple[RATIONAL_INPUT, ...], ...]) -> Tuple[RATIONAL_INPUT, ...]:
-        flat_input = tuple(tuple(_value for _vector in _input_history for _value in _vector) for _input_history in data_in)
-        return self._predictor.predict(flat_input)
+    def _low_predict(self, inputs: numpy.ndarray) -> Tuple[RATIONAL_INPUT, ...]:
+        # the semiotic model works on tuples, one example after the other
+        return self._predictor.predict(tuple(tuple(_input) for _input in inputs.tolist()))
 
-    def _low_fit(self, data_in: Tuple[Tuple[RATIONAL_INPUT, ...], ...], data_out: Tuple[RATIONAL_INPUT, ...]):
-        flat_input = tuple(tuple(_value for _vector in _input_history for _value in _vector) for _input_history in data_in)
-        self._predictor.fit(flat_input, data_out)
+    def _low_fit(self, inputs: numpy.ndarray, targets: numpy.ndarray):
+        self._predictor.fit(tuple(tuple(_input) for _input in inputs.tolist()), tuple(tuple(_target) for _target in targets.tolist()))
 
     def get_state(self) -> PREDICTOR_STATE:
         return self._predictor.get_state()
@@ -0,0 +1,92 @@
+# coding=utf-8
+import string
+from typing import Optional, Sequence, Tuple
+
+import numpy
+
+from _framework.systems.tasks.nominal.implementations.grid_world.resources.grid_world import GridWorldGlobal
+
+# x and y offsets of north, east, south, west
+STEPS = numpy.array([(0, -1), (1, 0), (0, 1), (-1, 0)])
+
+ROTATIONAL_MOTORS = "f", "b", "l", "r"
+TRANSITIONAL_MOTORS = "n", "e", "s", "w"
+
+# (motor x orientation) heading of the move, -1 for no move
+ROTATIONAL_HEADINGS = numpy.array([
+    [0, 1, 2, 3],
+    [2, 3, 0, 1],
+    [-1, -1, -1, -1],
+    [-1, -1, -1, -1]])
+TRANSITIONAL_HEADINGS = numpy.array([
+    [0, 0, 0, 0],
+    [1, 1, 1, 1],
+    [2, 2, 2, 2],
+    [3, 3, 3, 3]])
+
+# change of orientation per motor
+ROTATIONAL_TURNS = numpy.array([0, 0, -1, 1])
+TRANSITIONAL_TURNS = numpy.array([0, 0, 0, 0])
+
+
+class BatchGridWorld:
+    # no_agents independent agents in the same grid, motors are indices into motor_space.
+    # moves and perceptions follow GridWorldGlobal and GridWorldLocal.
+    def __init__(self, file_path: str, no_agents: int, rotational: bool = True, local: bool = True):
+        if no_agents < 1:
+            raise ValueError("Number of agents must be positive.")
+
+        grid = numpy.array(GridWorldGlobal._parse_text_to_grid(file_path))
+        self.height, self.width = grid.shape
+        self.walls = grid == "x"                                            # type: numpy.ndarray
+        self._size = numpy.array([self.width, self.height])
+
+        start_y, start_x = numpy.nonzero(grid == "s")
+        goals = sorted((int(_g), _x, _y) for _y, each_row in enumerate(grid.tolist()) for _x, _g in enumerate(each_row) if _g in string.digits)
+        self.goal_positions = numpy.array([(_x, _y) for _, _x, _y in goals])
+        self.start_position = numpy.array([start_x[0], start_y[0]])
+
+        self.motor_space = ROTATIONAL_MOTORS if rotational else TRANSITIONAL_MOTORS     # type: Tuple[str, ...]
+        self._headings = ROTATIONAL_HEADINGS if rotational else TRANSITIONAL_HEADINGS
+        self._turns = ROTATIONAL_TURNS if rotational else TRANSITIONAL_TURNS
+        self._local = local
+
+        self.no_agents = no_agents
+        self.positions = numpy.tile(self.start_position, (no_agents, 1))   # type: numpy.ndarray
+        self.orientations = numpy.zeros(no_agents, dtype=int)               # type: numpy.ndarray
+        self.goal_indices = numpy.zeros(no_agents, dtype=int)               # type: numpy.ndarray
+
+    def encode_motors(self, motors: Sequence[str]) -> numpy.ndarray:
+        lookup = {_m: _i for _i, _m in enumerate(self.motor_space)}
+        return numpy.array([lookup[_m] for _m in motors], dtype=int)
+
+    def _change_states(self, motors: numpy.ndarray):
+        headings = self._headings[motors, self.orientations]
+        targets = (self.positions + STEPS[headings]) % self._size
+        free = (0 <= headings) & ~self.walls[targets[:, 1], targets[:, 0]]
+        self.positions = numpy.where(free[:, None], targets, self.positions)
+        self.orientations = (self.orientations + self._turns[motors]) % 4
+
+    def _local_perceptions(self) -> numpy.ndarray:
+        # (no_agents x 4) walls ahead, right, behind, left
+        headings = (self.orientations[:, None] + numpy.arange(4)) % 4
+        neighbours = (self.positions[:, None, :] + STEPS[headings]) % self._size
+        return self.walls[neighbours[..., 1], neighbours[..., 0]]
+
+    def react_to_batch(self, motors: Optional[numpy.ndarray]) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        # local: (no_agents x 4) bool perceptions, global: (no_agents x 4) x, y, orientation, goal index
+        if motors is not None:
+            motors = numpy.asarray(motors)
+            if motors.shape != (self.no_agents,):
+                raise ValueError("Expected {:d} motors.".format(self.no_agents))
+            self._change_states(motors)
+
+        sensors = self._local_perceptions() if self._local else None
+
+        reached = numpy.all(self.positions == self.goal_positions[self.goal_indices], axis=1)
+        self.goal_indices = numpy.where(reached, (self.goal_indices + 1) % len(self.goal_positions), self.goal_indices)
+        rewards = numpy.where(reached, 10., -1.)
+
+        if sensors is None:
+            sensors = numpy.column_stack((self.positions, self.orientations, self.goal_indices))
+        return sensors, rewards
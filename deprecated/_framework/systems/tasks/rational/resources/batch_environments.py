@@ -0,0 +1,155 @@
+# coding=utf-8
+import math
+from typing import Optional, Tuple
+
+import numpy
+
+# headless dynamics of InfiniteCartPoleEnv, ContinuousMountainCarEnv and MountainCar for no_environments
+# environments at once. states are (no_environments x 2|4) arrays, actions (no_environments x 1).
+
+STEP = Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+
+
+def _check_actions(actions: numpy.ndarray, no_environments: int) -> numpy.ndarray:
+    actions = numpy.asarray(actions, dtype=float)
+    if actions.shape != (no_environments, 1):
+        raise ValueError("Expected actions of shape ({:d}, 1).".format(no_environments))
+    return actions[:, 0]
+
+
+class BatchInfiniteCartPole:
+    def __init__(self, no_environments: int, kinematics_integrator: str = "euler"):
+        self.no_environments = no_environments
+        self.gravity = 9.8
+        self.mass_cart = 1.
+        self.mass_pole = .1
+        self.total_mass = (self.mass_pole + self.mass_cart)
+        self.length = .5                                        # actually half the pole's length
+        self.pole_mass_length = (self.mass_pole * self.length)
+        self.force_mag = 10.
+        self.tau = .02                                          # seconds between state updates
+        self.kinematics_integrator = kinematics_integrator
+        self.x_threshold = 2.4
+
+        self.state = numpy.empty((no_environments, 4))
+        self.reset()
+
+    def reset(self, mask: Optional[numpy.ndarray] = None) -> numpy.ndarray:
+        # all environments or those selected by mask
+        self.state[slice(None) if mask is None else mask] = 0., 0., math.pi, 0.
+        return self.state.copy()
+
+    def step(self, actions: numpy.ndarray) -> STEP:
+        actions = _check_actions(actions, self.no_environments)
+        if numpy.any((actions < -1.) | (1. < actions)):
+            raise ValueError("Actions must be within [-1, 1].")
+
+        x_pos, x_vel, theta_ang, theta_vel = self.state.T.copy()
+        force = self.force_mag * actions
+        cos_theta = numpy.cos(theta_ang)
+        sin_theta = numpy.sin(theta_ang)
+        temp = (force + self.pole_mass_length * theta_vel * theta_vel * sin_theta) / self.total_mass
+        theta_acc = (self.gravity * sin_theta - cos_theta * temp) / (self.length * (4. / 3. - self.mass_pole * cos_theta * cos_theta / self.total_mass))
+        x_acc = temp - self.pole_mass_length * theta_acc * cos_theta / self.total_mass
+
+        if self.kinematics_integrator == "euler":
+            x_pos += self.tau * x_vel
+            x_vel += self.tau * x_acc
+            theta_ang += self.tau * theta_vel
+            theta_vel += self.tau * theta_acc
+
+        else:   # semi-implicit euler
+            x_vel += self.tau * x_acc
+            x_pos += self.tau * x_vel
+            theta_vel += self.tau * theta_acc
+            theta_ang += self.tau * theta_vel
+
+        theta_vel *= .99    # friction
+        x_vel = numpy.clip(x_vel, -10., 10.)
+
+        x_pos = numpy.where(x_pos < -self.x_threshold, x_pos + (self.x_threshold + self.x_threshold), x_pos)
+        x_pos = numpy.where(self.x_threshold < x_pos, x_pos + (-self.x_threshold - self.x_threshold), x_pos)
+
+        self.state = numpy.column_stack((x_pos, x_vel, theta_ang, theta_vel))
+        rewards = numpy.abs(numpy.abs(theta_ang % (2. * math.pi)) - math.pi) / math.pi - 1.
+        return self.state.copy(), rewards, numpy.zeros(self.no_environments, dtype=bool)
+
+
+class BatchContinuousMountainCar:
+    def __init__(self, no_environments: int, random_state: Optional[numpy.random.Generator] = None):
+        self.no_environments = no_environments
+        self.min_position = -1.2
+        self.max_position = .6
+        self.max_speed = .07
+        self.goal_position = .45
+        self.power = .0015
+
+        self.random_state = numpy.random.default_rng() if random_state is None else random_state
+        self.state = numpy.empty((no_environments, 2))
+        self.reset()
+
+    def reset(self, mask: Optional[numpy.ndarray] = None) -> numpy.ndarray:
+        # all environments or those selected by mask, finished environments are not reset by step
+        indices = numpy.arange(self.no_environments) if mask is None else numpy.arange(self.no_environments)[mask]
+        self.state[indices, 0] = self.random_state.uniform(low=-.6, high=-.4, size=len(indices))
+        self.state[indices, 1] = 0.
+        return self.state.copy()
+
+    def step(self, actions: numpy.ndarray) -> STEP:
+        actions = _check_actions(actions, self.no_environments)
+        position, velocity = self.state.T.copy()
+        force = numpy.clip(actions, -1., 1.)
+
+        velocity += force * self.power - .0025 * numpy.cos(3. * position)
+        velocity = numpy.clip(velocity, -self.max_speed, self.max_speed)
+
+        position += velocity
+        position = numpy.clip(position, self.min_position, self.max_position)
+        velocity = numpy.where((position == self.min_position) & (velocity < 0.), 0., velocity)
+
+        done = position >= self.goal_position
+        rewards = numpy.where(done, 100., 0.) - actions ** 2 * .1
+
+        self.state = numpy.column_stack((position, velocity))
+        return self.state.copy(), rewards, done
+
+
+class BatchMountainCar:
+    def __init__(self, no_environments: int):
+        self.no_environments = no_environments
+        self.mass = 100.
+        self.at_top = numpy.zeros(no_environments, dtype=bool)
+        self.state = numpy.empty((no_environments, 2))
+        self.reset()
+
+    def reset(self, mask: Optional[numpy.ndarray] = None) -> numpy.ndarray:
+        # all environments or those selected by mask
+        self.state[slice(None) if mask is None else mask] = 0.
+        return self.state.copy()
+
+    @staticmethod
+    def hill(locations: numpy.ndarray) -> numpy.ndarray:
+        return (-numpy.cos(locations) + 1.) / 2.
+
+    @staticmethod
+    def hill_force(locations: numpy.ndarray) -> numpy.ndarray:
+        return -numpy.sign(locations) * (-numpy.cos(locations * 2.) + 1.) / 2.
+
+    def step(self, actions: numpy.ndarray) -> STEP:
+        actions = _check_actions(actions, self.no_environments)
+        location, velocity = self.state.T.copy()
+
+        force = actions + BatchMountainCar.hill_force(location)
+        acceleration = force / self.mass
+        velocity = (velocity + acceleration) * .999
+        location += velocity
+
+        over = location >= math.pi
+        under = ~over & (-math.pi >= location)
+        location = numpy.where(over, location + -2. * math.pi, location)
+        location = numpy.where(under, 2. * math.pi - location, location)
+        self.at_top = over | under
+
+        self.state = numpy.column_stack((location, velocity))
+        rewards = BatchMountainCar.hill(location) - 1.
+        return self.state.copy(), rewards, numpy.zeros(self.no_environments, dtype=bool)
@@ -0,0 +1,103 @@
+# coding=utf-8
+from typing import List, Sequence, Tuple
+
+import numpy
+
+from tools.ring_buffer import RingBuffer
+
+
+class _Level:
+    def __init__(self, width: int, capacity: int):
+        self.x = RingBuffer[float](capacity, dtype=float)
+        self.y = RingBuffer[float](capacity, dtype=float, item_shape=(width,))
+        self.pending_x = []                                             # type: List[float]
+        self.pending_y = []                                             # type: List[numpy.ndarray]
+
+    def append(self, x: float, y: numpy.ndarray):
+        self.x.append(x)
+        self.y.append(y)
+
+
+class MultiResolutionSeries:
+    # min/max bucket pyramid over ring buffers. level 0 holds the raw points, every bucket of fan_out points
+    # of a level becomes two points of the next level, its minimum and its maximum in the order they occurred
+    # in the sum over all series.
+    # x positions are shared by all series of the plot. each level keeps its most recent capacity points,
+    # so fine levels cover the recent past and coarse levels the whole run with bounded memory.
+    def __init__(self, width: int, fan_out: int = 8, capacity: int = 4096):
+        if fan_out < 4 or fan_out % 2 != 0:
+            raise ValueError("Fan out must be an even number of at least four.")
+        self._width = width
+        self._fan_out = fan_out
+        self._capacity = capacity
+        self._levels = [_Level(width, capacity)]                       # type: List[_Level]
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    def __len__(self) -> int:
+        return len(self._levels[0].x)
+
+    def append(self, x: float, y: Sequence[float]):
+        values = numpy.asarray(y, dtype=float)
+        if values.shape != (self._width,):
+            raise ValueError("inconsistent width")
+        self._append(0, x, values)
+
+    def _append(self, level_index: int, x: float, y: numpy.ndarray):
+        level = self._levels[level_index]
+        level.append(x, y)
+        level.pending_x.append(x)
+        level.pending_y.append(y)
+        if len(level.pending_x) < self._fan_out:
+            return
+
+        bucket = numpy.array(level.pending_y)
+        first_x, second_x = level.pending_x[0], level.pending_x[self._fan_out // 2]
+        level.pending_x.clear()
+        level.pending_y.clear()
+
+        # one order for all series of the bucket, so series that are ordered at every point stay ordered
+        minimum, maximum = bucket.min(axis=0), bucket.max(axis=0)
+        totals = bucket.sum(axis=1)
+        if totals.argmin() <= totals.argmax():
+            first_y, second_y = minimum, maximum
+        else:
+            first_y, second_y = maximum, minimum
+
+        if level_index + 1 >= len(self._levels):
+            self._levels.append(_Level(self._width, self._capacity))
+        self._append(level_index + 1, first_x, first_y)
+        self._append(level_index + 1, second_x, second_y)
+
+    def view(self, x_min: float, x_max: float, max_points: int) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        # finest level that still covers x_min with at most max_points points in [x_min, x_max]
+        chosen = None
+        for level_index, each_level in enumerate(self._levels):
+            x = each_level.x.view()
+            if len(x) < 1:
+                continue
+            from_index = int(numpy.searchsorted(x, x_min, side="left"))
+            to_index = int(numpy.searchsorted(x, x_max, side="right"))
+            chosen = level_index, from_index, to_index
+            covers = not each_level.x.is_full() or x[0] <= x_min
+            if covers and to_index - from_index <= max_points:
+                break
+
+        if chosen is None:
+            return numpy.empty(0), numpy.empty((0, self._width))
+        level_index, from_index, to_index = chosen
+        level = self._levels[level_index]
+        x, y = level.x.view()[from_index:to_index], level.y.view()[from_index:to_index]
+
+        # points not yet bucketed into the chosen level wait in the finer levels
+        tail_x, tail_y = [], []
+        for each_level in reversed(self._levels[:level_index]):
+            tail_x.extend(each_level.pending_x)
+            tail_y.extend(each_level.pending_y)
+        if len(tail_x) < 1:
+            return x, y
+        tail_x = numpy.array(tail_x)
+        in_view = (x_min <= tail_x) & (tail_x <= x_max)
+        return numpy.concatenate((x, tail_x[in_view])), numpy.concatenate((y, numpy.array(tail_y).reshape(-1, self._width)[in_view]))
@@ -1,4 +1,5 @@
 # coding=utf-8
+import gzip
 import json
 from typing import Tuple, Sequence, Dict, List, Any
 
@@ -10,6 +11,7 @@ from matplotlib.colors import hsv_to_rgb
 from plotly import graph_objs
 from plotly.basedatatypes import BasePlotlyType
 
+from _framework.visualization_server.downsampling import MultiResolutionSeries
 from tools.logger import Logger
 from tools.math_functions import distribute_circular
 
@@ -20,19 +22,25 @@ IP = "127.0.0.1"
 # TODO: refactor visualization server
 
 class VisualizationModel:
-    def __init__(self, axes: Sequence[Tuple[str, int]], length: int = 0):
+    # every plot is a multi resolution series, views are downsampled to at most max_points per trace
+    def __init__(self, axes: Sequence[Tuple[str, int]], length: int = 0, max_points: int = 2000):
         self.axes = tuple(_name for _name, _ in axes)
         self._axes_width = {_name: (dict(), _width) for _name, _width in axes}
         self._is_trailing = length < 0
         self._length = abs(length)
-        self.x_range = []
+        self._max_points = max_points
+        self.last_iteration = -1
+        self.version = 0
 
     def __len__(self) -> int:
         return abs(self._length)
 
-    def _new_plot(self, axis_name: str, plot_name: str) -> Tuple[List[float], ...]:
+    def is_empty(self) -> bool:
+        return self.last_iteration < 0
+
+    def _new_plot(self, axis_name: str, plot_name: str) -> MultiResolutionSeries:
         _named_series, _width = self._axes_width[axis_name]
-        new_series = tuple([] for _ in range(_width))
+        new_series = MultiResolutionSeries(_width, capacity=4 * self._max_points)
         _named_series[plot_name] = new_series
         return new_series
 
@@ -40,19 +48,14 @@ class VisualizationModel:
         _named_series, _ = self._axes_width[axis_name]
         return tuple(_named_series.keys())
 
-    def get_plot(self, axis_name: str, plot_name: str) -> Tuple[Sequence[float], ...]:
+    def get_plot(self, axis_name: str, plot_name: str, x_min: float, x_max: float) -> Tuple[List[float], Tuple[List[float], ...]]:
+        # x positions and one value list per series, downsampled to the visible range
         _named_series, _ = self._axes_width[axis_name]
-        series = _named_series[plot_name]
-        return series
+        x, y = _named_series[plot_name].view(x_min, x_max, self._max_points)
+        return x.tolist(), tuple(y.T.tolist())
 
     def add_batch(self, iteration: int, batch: Sequence[Tuple[str, str, Sequence[float]]]):
-        self.x_range.append(iteration)
-
-        if self._is_trailing:
-            while iteration - self.x_range[0] >= self._length:
-                self.x_range.pop(0)
-
-        no_iterations = len(self.x_range)
+        self.last_iteration = iteration
 
         for axis_name, plot_name, values in batch:
             _named_series, _width = self._axes_width[axis_name]
@@ -64,10 +67,9 @@ class VisualizationModel:
             if series is None:
                 series = self._new_plot(axis_name, plot_name)
 
-            values = sorted(values)
-            for _v, _s in zip(values, series):
-                _s.append(_v)
-                del _s[:-no_iterations]
+            series.append(iteration, sorted(values))
+
+        self.version += 1
 
 
 def get_layout():
@@ -108,6 +110,9 @@ class VisualizationView:
 
     _iterations = 0
 
+    _graphs = []
+    _graphs_version = -1
+
     @staticmethod
     @_flask.route("/init_model", methods=["POST"])
     def init_model():
@@ -124,6 +129,7 @@ class VisualizationView:
 
         axes_model = tuple((_axis_name, _width) for _axis_name, _width, _ in axes)
         VisualizationView._model = VisualizationModel(axes_model, length=VisualizationView.length)
+        VisualizationView._graphs_version = -1
 
         VisualizationView._dash.layout = get_layout()
         _iterations = 0
@@ -143,6 +149,7 @@ class VisualizationView:
 
         VisualizationView._plot_styles.clear()
         VisualizationView._plot_styles.update(d["plots"])
+        VisualizationView._graphs_version = -1
 
         return jsonify("styling done")
 
@@ -164,11 +171,28 @@ class VisualizationView:
         return jsonify(f"added batch of size {len(batch):d}")
 
     @staticmethod
-    def _get_concentration(_axis_name: str, this_plot_style: Dict[str, Any]) -> Sequence[BasePlotlyType]:
+    @_flask.route("/data_batch", methods=["POST"])
+    def add_data_batches():
+        if VisualizationView._model is None:
+            raise ValueError("visualization model not initialized")
+
+        data = request.data
+        if request.headers.get("Content-Encoding") == "gzip":
+            data = gzip.decompress(data)
+
+        d = json.loads(data)
+        batches = d["batches"]
+        for iteration, batch in batches:
+            VisualizationView._model.add_batch(iteration, batch)
+
+        return jsonify(f"added {len(batches):d} batches")
+
+    @staticmethod
+    def _get_concentration(_axis_name: str, this_plot_style: Dict[str, Any], x_min: float, x_max: float) -> Sequence[BasePlotlyType]:
         axis_data = []
 
         for _j, _plot_name in enumerate(VisualizationView._model.get_plot_names(_axis_name)):
-            series = VisualizationView._model.get_plot(_axis_name, _plot_name)
+            range_a, series = VisualizationView._model.get_plot(_axis_name, _plot_name, x_min, x_max)
             no_series = len(series)
             half_plus_one = no_series // 2 + 1
             no_bands = no_series - half_plus_one + 1
@@ -183,7 +207,6 @@ class VisualizationView:
                 series_a = series[_i]
                 series_b = series[_i + half_plus_one - 1]
                 outline = series_a + series_b[::-1]
-                range_a = VisualizationView._model.x_range
                 each_range = range_a + range_a[::-1]
 
                 data = graph_objs.Scatter(
@@ -207,7 +230,7 @@ class VisualizationView:
         return axis_data
 
     @staticmethod
-    def _get_lines(_axis_name: str, this_plot_style: Dict[str, Any]) -> Sequence[BasePlotlyType]:
+    def _get_lines(_axis_name: str, this_plot_style: Dict[str, Any], x_min: float, x_max: float) -> Sequence[BasePlotlyType]:
         axis_data = []
 
         for _j, _plot_name in enumerate(VisualizationView._model.get_plot_names(_axis_name)):
@@ -216,13 +239,13 @@ class VisualizationView:
 
             plot_properties = this_plot_style.get(_plot_name, dict())
 
-            series = VisualizationView._model.get_plot(_axis_name, _plot_name)
+            x_range, series = VisualizationView._model.get_plot(_axis_name, _plot_name, x_min, x_max)
 
             for each_series in series:
                 data = graph_objs.Scatter(
                     **plot_properties,
                     showlegend=True,
-                    x=VisualizationView._model.x_range,
+                    x=x_range,
                     y=each_series,
                     name=_plot_name,
                     mode="lines",
@@ -241,11 +264,15 @@ class VisualizationView:
     @_dash.callback(dependencies.Output("graphs", "children"), events=[dependencies.Event("graph-update", "interval")])
     def __update_graph():
         graphs = []
-        if VisualizationView._model is None or len(VisualizationView._model.x_range) < 1:
+        if VisualizationView._model is None or VisualizationView._model.is_empty():
             return graphs
 
+        # nothing new since the last refresh
+        if VisualizationView._graphs_version == VisualizationView._model.version:
+            return VisualizationView._graphs
+
         if VisualizationView.length < 0:
-            x_min = max(0, VisualizationView._model.x_range[-1] + VisualizationView.length)
+            x_min = max(0, VisualizationView._model.last_iteration + VisualizationView.length)
             x_max = x_min - VisualizationView.length
 
         elif 0 < VisualizationView.length:
@@ -254,16 +281,16 @@ class VisualizationView:
 
         else:
             x_min = 0
-            x_max = VisualizationView._model.x_range[-1]
+            x_max = VisualizationView._model.last_iteration
 
         for _axis_name in VisualizationView._model.axes:
             this_plot_style = VisualizationView._plot_styles.get(_axis_name, dict())
 
             if _axis_name not in VisualizationView._dist_axes:
-                axis_data = VisualizationView._get_lines(_axis_name, this_plot_style)
+                axis_data = VisualizationView._get_lines(_axis_name, this_plot_style, x_min, x_max)
 
             else:
-                axis_data = VisualizationView._get_concentration(_axis_name, this_plot_style)
+                axis_data = VisualizationView._get_concentration(_axis_name, this_plot_style, x_min, x_max)
 
             axis_properties = VisualizationView._axis_styles.get(_axis_name, dict())
 
@@ -308,6 +335,8 @@ class VisualizationView:
                 )
             ]))
 
+        VisualizationView._graphs = graphs
+        VisualizationView._graphs_version = VisualizationView._model.version
         return graphs
 
 
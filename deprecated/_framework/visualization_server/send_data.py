@@ -1,5 +1,10 @@
 # coding=utf-8
-from typing import Sequence, Tuple, Dict, Any
+import atexit
+import gzip
+import json
+import threading
+from collections import OrderedDict
+from typing import Sequence, Tuple, Dict, Any, List, Optional
 
 import requests
 
@@ -30,6 +35,100 @@ def send_data(iteration: int, batch: Sequence[Tuple[str, str, Sequence[float]]])
     return r.status_code, r.json()
 
 
+BATCH = Sequence[Tuple[str, str, Sequence[float]]]
+
+
+def send_batches(batches: Sequence[Tuple[int, BATCH]], url: str = URL):
+    # several iterations in one gzip compressed request
+    content = gzip.compress(json.dumps({"batches": batches}).encode("utf-8"))
+    r = requests.post(url + "data_batch?", data=content, headers={"Content-Type": "application/json", "Content-Encoding": "gzip"})
+    return r.status_code, r.json()
+
+
+class BatchSender:
+    # collects batches in memory and ships them from a background thread every interval_secs.
+    # batches for the same iteration are merged, if more than max_pending iterations wait
+    # the oldest are dropped, so a slow server never blocks the training loop.
+    def __init__(self, url: str = URL, interval_secs: float = .5, max_pending: int = 10000):
+        self._url = url
+        self._interval = interval_secs
+        self._max_pending = max_pending
+
+        self._pending = OrderedDict()                                   # type: OrderedDict[int, Dict[Tuple[str, str], Sequence[float]]]
+        self._condition = threading.Condition()
+        self._sending = False
+        self._flush_requested = False
+        self._closed = False
+        self.no_dropped = 0
+        self.no_failed = 0
+
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def put(self, iteration: int, batch: BATCH):
+        with self._condition:
+            if self._closed:
+                raise ValueError("sender closed")
+
+            records = self._pending.get(iteration)
+            if records is None:
+                records = dict()
+                self._pending[iteration] = records
+            for axis_name, plot_name, values in batch:
+                records[(axis_name, plot_name)] = values
+
+            while len(self._pending) > self._max_pending:
+                self._pending.popitem(last=False)
+                self.no_dropped += 1
+
+    def _take(self) -> List[Tuple[int, BATCH]]:
+        batches = [
+            (_iteration, [(_axis, _plot, list(_values)) for (_axis, _plot), _values in _records.items()])
+            for _iteration, _records in self._pending.items()
+        ]
+        self._pending.clear()
+        return batches
+
+    def _work(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._closed or self._flush_requested, timeout=self._interval)
+                self._flush_requested = False
+                if self._closed and len(self._pending) < 1:
+                    break
+                batches = self._take()
+                self._sending = True
+
+            try:
+                if 0 < len(batches):
+                    send_batches(batches, url=self._url)
+            except Exception as e:
+                # whatever goes wrong, the thread keeps going and flush does not wait forever
+                self.no_failed += len(batches)
+                Logger.log(f"sending {len(batches):d} batches failed: {e.__class__.__name__:s} {str(e):s}")
+            finally:
+                with self._condition:
+                    self._sending = False
+                    self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        # sends everything put so far without waiting for the interval
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            return self._condition.wait_for(lambda: len(self._pending) < 1 and not self._sending, timeout=timeout)
+
+    def close(self):
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        atexit.unregister(self.close)
+
+
 def update(steps: int = 1):
     params = {
         "steps": steps
@@ -48,6 +147,8 @@ def style(axis_styles: Dict[str, Dict[str, Any]], plot_styles: Dict[str, Dict[st
 
 
 class SemioticVisualization:
+    _sender = None                  # type: Optional[BatchSender]
+
     @staticmethod
     def initialize(axes: Sequence[str], no_experiments: int, length: int = 0):
         status, json_response = initialize(tuple((_name, no_experiments) for _name in axes), length=length)
@@ -58,10 +159,21 @@ class SemioticVisualization:
         status, json_response = style(axis_styles, plot_styles)
         Logger.log(f"{status:d}\n{json_response:s}")
 
+        if SemioticVisualization._sender is not None:
+            SemioticVisualization._sender.close()
+        SemioticVisualization._sender = BatchSender()
+
     @staticmethod
     def plot(iteration: int, batch: Sequence[Tuple[str, str, Sequence[float]]]):
-        status, json_response = send_data(iteration, batch)
-        Logger.log(f"{status:d}\n{json_response:s}")
+        # returns immediately, the data is sent in the background
+        if SemioticVisualization._sender is None:
+            raise ValueError("visualization not initialized")
+        SemioticVisualization._sender.put(iteration, batch)
+
+    @staticmethod
+    def flush():
+        if SemioticVisualization._sender is not None:
+            SemioticVisualization._sender.flush()
 
     @staticmethod
     def update(steps: int = 1):
@@ -2,10 +2,6 @@
 import random
 from typing import Hashable, Tuple, Sequence
 
-import networkx
-from matplotlib import pyplot
-from networkx_viewer import Viewer
-
 from modelling.predictors.abstract_predictor import Predictor, INPUT_TYPE, OUTPUT_TYPE
 
 NOMINAL_INPUT = Hashable
@@ -30,6 +26,10 @@ class BayesDecayModel(Predictor[NOMINAL_INPUT, NOMINAL_OUTPUT]):
 
 
 if __name__ == "__main__":
+    import networkx
+    from matplotlib import pyplot
+    from networkx_viewer import Viewer
+
     G = networkx.petersen_graph()
     pyplot.subplot(121)
     networkx.draw(G, with_labels=True, font_weight='bold')
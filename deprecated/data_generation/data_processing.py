@@ -1,77 +1,35 @@
-import datetime
-from typing import Generator, Tuple, Iterator, TypeVar
+from typing import Generator, Tuple, Iterator, TypeVar, Any, Callable, Optional, Iterable, Union
 
-from dateutil.tz import tzutc
+import numpy
+
+from tools.resampling import equisample_blocks, sample_blocks
+from tools.ring_buffer import RingBuffer
+from tools.series_cache import series_values
 
 
 def series_generator(file_path: str, start_timestamp: int = -1, end_timestamp: int = -1) -> Generator[Tuple[float, float], None, None]:
-    print("Reading time series from {:s}...".format(file_path))
-
-    with open(file_path, mode="r") as file:
-        row_ts = -1
-        for i, line in enumerate(file):
-            row = line.strip().split("\t")
-            row_ts = float(row[0]) / 1000.
-            if -1 < start_timestamp:
-                if start_timestamp < row_ts:
-                    if i < 1:
-                        first_date = datetime.datetime.fromtimestamp(row_ts, tz=tzutc())
-                        start_time = datetime.datetime.fromtimestamp(start_timestamp, tz=tzutc())
-                        msg = "Source {:s} starts after {:s} (ts {:f}) at {:s} (ts {:f})!"
-                        raise ValueError(msg.format(file_path, str(start_time), start_timestamp, str(first_date), row_ts))
-                elif row_ts < end_timestamp:
-                    continue
-
-            if -1 < end_timestamp < row_ts:
-                break
-
-            close = float(row[4])
-            yield row_ts, close
-
-        if row_ts < end_timestamp:
-            last_date = datetime.datetime.fromtimestamp(row_ts, tz=tzutc())
-            end_time = datetime.datetime.fromtimestamp(end_timestamp, tz=tzutc())
-            msg = "Source {:s} ends before {:s} (ts {:f}) at {:s} (ts {:f})!"
-            raise ValueError(msg.format(file_path, str(end_time), end_timestamp, str(last_date), row_ts))
+    # parsed once into memory mapped columns next to the source, see tools.series_cache
+    yield from series_values(file_path, start_timestamp=start_timestamp, end_timestamp=end_timestamp)
 
 
 def equisample(iterator: Iterator[Tuple[float, float]], target_delta: float) -> Generator[Tuple[float, float], None, None]:
-    assert 0 < target_delta
-    last_time = -1
-    last_value = 0.
-    for time_stamp, value in iterator:
-        delta = time_stamp - last_time
-
-        if delta < target_delta:
-            continue
-
-        elif delta == target_delta or last_time < 0:
-            assert last_time < 0 or time_stamp == last_time + target_delta
-            yield time_stamp, value
-
-            last_value = value
-            last_time = time_stamp
-
-        else:
-            value_change = (value - last_value) / delta
-            no_intermediate_steps = round(delta // target_delta)
-            for each_step in range(no_intermediate_steps):
-                last_value += value_change
-                last_time += target_delta
-                yield last_time, last_value
+    for each_grid, each_values in equisample_blocks(sample_blocks(iterator), target_delta):
+        yield from zip(each_grid.tolist(), each_values.tolist())
 
 
 TYPE_A = TypeVar("TYPE_A")
 
 
-def trail(sequence: Iterator[TYPE_A], trail_length: int) -> Generator[Tuple[TYPE_A, ...], None, None]:
-    trace = []
+def trail(sequence: Iterator[TYPE_A], trail_length: int, dtype: Any = object, view: bool = False) -> Generator[Union[Tuple[TYPE_A, ...], numpy.ndarray], None, None]:
+    # tuples by default. with view, zero-copy arrays that are overwritten by the next step, copy to keep.
+    trace = RingBuffer[TYPE_A](trail_length, dtype=dtype)
     for _ in range(trail_length):
         trace.append(next(sequence))
-    while True:
-        yield tuple(trace)
-        trace.pop(0)
-        trace.append(next(sequence))
+
+    for each_value in sequence:
+        yield trace.view() if view else trace.as_tuple()
+        trace.append(each_value)
+    yield trace.view() if view else trace.as_tuple()
 
 
 def difference(source_generator: Generator[float, None, None]) -> Generator[float, None, None]:
@@ -110,7 +68,117 @@ def zscore_normalization(source_generator: Generator[float, None, None], drag: i
         deviation = (deviation * drag + this_deviation) / (drag + 1)
 
 
+BLOCK_STAGE = Callable[[numpy.ndarray], numpy.ndarray]
+
+
+# block versions of the generators above. each stage carries its state from block to block.
+# the drag recurrences run over python floats in the order of the generators, so the outputs are identical.
+# a closed form or a linear filter rounds differently and z-scores amplify that where deviations cross zero.
+
+def smear_blocks(values: numpy.ndarray, drag: int, initial: float) -> numpy.ndarray:
+    # every average of average = (average * drag + value) / (drag + 1) in turn, starting from initial
+    average = initial
+    drag_1 = drag + 1.
+    averages = []
+    for each_value in numpy.asarray(values, dtype=float).tolist():
+        average = (average * drag + each_value) / drag_1
+        averages.append(average)
+    return numpy.array(averages, dtype=float)
+
+
+class Difference:
+    def __init__(self):
+        self._last_value = None                                 # type: Optional[float]
+
+    def __call__(self, values: numpy.ndarray) -> numpy.ndarray:
+        values = numpy.asarray(values, dtype=float)
+        if len(values) < 1:
+            return values
+        if self._last_value is None:
+            differences = numpy.diff(values)
+        else:
+            differences = numpy.diff(values, prepend=self._last_value)
+        self._last_value = values[-1]
+        return differences
+
+
+class Smoothing:
+    # tools.math_functions.smoothing_generator
+    def __init__(self, drag: int):
+        self._drag = drag
+        self._smooth = None                                     # type: Optional[float]
+
+    def __call__(self, values: numpy.ndarray) -> numpy.ndarray:
+        values = numpy.asarray(values, dtype=float)
+        if len(values) < 1:
+            return values
+        if self._smooth is None:
+            # the first value starts the average
+            smooth = numpy.concatenate((values[:1], smear_blocks(values[1:], self._drag, values[0])))
+        else:
+            smooth = smear_blocks(values, self._drag, self._smooth)
+        self._smooth = smooth[-1]
+        return smooth
+
+
+class MinMaxNormalization:
+    # my_normalization
+    def __init__(self, drag: int):
+        self._drag = drag
+        self._min_v = 0.
+        self._max_v = 1.
+
+    def __call__(self, values: numpy.ndarray) -> numpy.ndarray:
+        drag = self._drag
+        drag_1 = drag + 1.
+        min_v, max_v = self._min_v, self._max_v
+        output = []
+        for each_value in numpy.asarray(values, dtype=float).tolist():
+            if max_v < each_value:
+                max_v = each_value
+                min_v = (drag * min_v + each_value) / drag_1
+            elif each_value < min_v:
+                max_v = (drag * max_v + each_value) / drag_1
+                min_v = each_value
+            else:
+                max_v = (drag * max_v + each_value) / drag_1
+                min_v = (drag * min_v + each_value) / drag_1
+            output.append((each_value - min_v) / (max_v - min_v))
+        self._min_v, self._max_v = min_v, max_v
+        return numpy.array(output)
+
+
+class ZScoreNormalization:
+    # zscore_normalization
+    def __init__(self, drag: int):
+        self._drag = drag
+        self._mean = 0.
+        self._deviation = 0.
+
+    def __call__(self, values: numpy.ndarray) -> numpy.ndarray:
+        values = numpy.asarray(values, dtype=float)
+        if len(values) < 1:
+            return values
+        means = smear_blocks(values, self._drag, self._mean)
+        deviations = values - means
+        # each value is scaled by the deviation before its own
+        scales = numpy.concatenate(([self._deviation], smear_blocks(deviations[:-1], self._drag, self._deviation)))
+        self._mean = means[-1]
+        self._deviation = float(smear_blocks(deviations[-1:], self._drag, scales[-1])[0])
+
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            return numpy.where(scales == 0., (values >= means).astype(float), deviations / scales)
+
+
+def process_blocks(blocks: Iterable[numpy.ndarray], *stages: BLOCK_STAGE) -> Generator[numpy.ndarray, None, None]:
+    # e.g. process_blocks(blocks, Difference(), ZScoreNormalization(drag))
+    for each_block in blocks:
+        for each_stage in stages:
+            each_block = each_stage(each_block)
+        yield each_block
+
+
 if __name__ == "__main__":
     X = (_x for _x in range(1000))
-    for _x in trail(X, 3):
+    for _x in trail(X, 3, dtype=int):
         print(_x)
@@ -2,25 +2,20 @@
 import random
 import string
 from math import sin, cos
-from typing import Generator, Union, Tuple, Optional
+from typing import Generator, Union, Tuple, Optional, Sequence
 
 from dateutil import parser
-from matplotlib import pyplot
 
-from data_generation.data_processing import equisample, series_generator
+from data_generation.data_processing import BLOCK_STAGE, process_blocks
+from tools.resampling import equisample_blocks
+from tools.corpus import corpus_characters
+from tools.ring_buffer import RingBuffer
+from tools.series_cache import series_blocks
 
 
 def sequence_nominal_text(file_path: str) -> Generator[str, None, None]:
-    permissible_non_letter = string.digits + string.punctuation + " "
     while True:
-        with open(file_path, mode="r") as file:
-            for line in file:
-                for character in line:
-                    if character in string.ascii_letters:
-                        yield character.lower()
-
-                    elif character in permissible_non_letter:
-                        yield character
+        yield from corpus_characters(file_path, mode="nominal")
 
 
 def _convert_to_timestamp(time_val: Optional[Union[int, str]]) -> int:
@@ -37,14 +32,17 @@ def _convert_to_timestamp(time_val: Optional[Union[int, str]]) -> int:
 
 def sequence_rational_crypto(file_path: str, interval_seconds: int,
                              start_val: Optional[Union[int, str]] = None,
-                             end_val: Optional[Union[int, str]]= None) -> Generator[float, None, None]:
+                             end_val: Optional[Union[int, str]]= None,
+                             stages: Sequence[BLOCK_STAGE] = ()) -> Generator[float, None, None]:
+    # stages run on the equisampled blocks, e.g. (Difference(), ZScoreNormalization(drag))
     start_ts = _convert_to_timestamp(start_val)
     end_ts = _convert_to_timestamp(end_val)
 
     while True:
-        raw_generator = series_generator(file_path, start_timestamp=start_ts, end_timestamp=end_ts)
-        for t, value in equisample(raw_generator, interval_seconds):
-            yield value
+        raw_blocks = series_blocks(file_path, start_timestamp=start_ts, end_timestamp=end_ts)
+        value_blocks = (each_values for _, each_values in equisample_blocks(raw_blocks, interval_seconds))
+        for each_block in process_blocks(value_blocks, *stages):
+            yield from each_block.tolist()
 
 
 def test_env_text():
@@ -54,6 +52,7 @@ def test_env_text():
 
 
 def test_env_crypto():
+    from matplotlib import pyplot
     rate_path = "D:/Data/binance/01Jan2010--1m/EOSETH.csv"
     delta = 60
 
@@ -94,19 +93,19 @@ def alternating_examples() -> Generator[Tuple[str, str], None, None]:
 def examples_rational_trigonometric(history_length: int = 1) -> Generator[Tuple[Tuple[float], Tuple[float]], None, None]:
     # examples = [(sin(t / 100.), cos(t / 70.)*3. + sin(t/13.)*.7)]
     i = 0
-    history = []
+    history = RingBuffer[float](max(history_length, 1), dtype=float)
     while True:
-        history.append(sin(i / 100.))
-        while history_length < len(history):
-            history.pop(0)
+        if 0 < history_length:
+            history.append(sin(i / 100.))
         if len(history) == history_length:
-            input_value = tuple(history)
+            input_value = history.as_tuple()
             target_value = float(cos(i / 100.) >= 0.) * 2. - 1.,
             yield input_value, target_value
         i += 1
 
 
 def test_trigonometric_rational():
+    from matplotlib import pyplot
     g = examples_rational_trigonometric()
     time_axis = []
     x1 = []
@@ -1,55 +1,94 @@
 # coding=utf-8
 import os
 import time
-from typing import Generator, Tuple
+from typing import Generator, Tuple, Iterator
 
-from PIL import Image
+import numpy
 
 from tools.load_configs import Config
 
 
-def generate_rbg_pixels(file_path, window_size=1) -> Generator[Tuple[Tuple[int, int, int], ...], None, None]:
+def decode_frames(file_path: str) -> numpy.ndarray:
+    # (frames, height, width, 3) uint8, every frame converted once
+    from PIL import Image
     assert file_path.endswith(".gif")
     frame = Image.open(file_path)
+    frames = []
     n_frames = 0
-
-    square = window_size ** 2
-    while frame:
-        frame_rgb = frame.convert("RGB")
-
-        pixels = []
-        for _y in range(0, (frame_rgb.height // window_size) * window_size, window_size):
-            for _x in range(0, (frame_rgb.width // window_size) * window_size, window_size):
-                window = tuple(frame_rgb.getpixel((_x + __x, _y + __y)) for __y in range(window_size) for __x in range(window_size))
-                _r, _g, _b = zip(*window)
-                each_pixel = sum(_r) // square, sum(_g) // square, sum(_b) // square
-                pixels.append(each_pixel)
-        yield tuple(pixels)
-
+    while True:
+        frames.append(numpy.asarray(frame.convert("RGB")))
         n_frames += 1
         try:
             frame.seek(n_frames)
         except EOFError:
-            n_frames = 0
+            break
+    return numpy.stack(frames)
+
+
+def pool_frames(frames: numpy.ndarray, window_size: int) -> numpy.ndarray:
+    # integer average over non-overlapping windows, incomplete windows at the borders are dropped.
+    # summed frame by frame in uint32, enough for windows up to 4104 pixels wide.
+    no_frames, height, width, no_channels = frames.shape
+    rows, columns = height // window_size, width // window_size
+    pooled = numpy.empty((no_frames, rows, columns, no_channels), dtype=frames.dtype)
+    for _i, each_frame in enumerate(frames):
+        windows = each_frame[:rows * window_size, :columns * window_size].reshape(rows, window_size, columns, window_size, no_channels)
+        pooled[_i] = windows.sum(axis=(1, 3), dtype=numpy.uint32) // window_size ** 2
+    return pooled
+
+
+def load_frames(file_path: str, window_size: int = 1, cache: bool = False) -> numpy.ndarray:
+    # (frames, pixels, 3) pooled frames, optionally cached next to the gif
+    cache_path = "{:s}.{:d}.npy".format(file_path, window_size)
+    if cache and os.path.isfile(cache_path) and os.path.getmtime(file_path) <= os.path.getmtime(cache_path):
+        return numpy.load(cache_path)
+
+    pooled = pool_frames(decode_frames(file_path), window_size)
+    frames = pooled.reshape(pooled.shape[0], -1, pooled.shape[-1])
+    if cache:
+        numpy.save(cache_path, frames)
+    return frames
+
+
+def generate_pixel_arrays(file_path: str, window_size: int = 1, cache: bool = False) -> Generator[numpy.ndarray, None, None]:
+    # loops over the frames forever, decoded only once. every pass starts at frame 0. the seek loop this
+    # replaced repeated the last frame and skipped frame 0 when it wrapped around.
+    frames = load_frames(file_path, window_size=window_size, cache=cache)
+    while True:
+        yield from frames
 
 
-def generate_grayscale_pixels(pixel_generator) -> Generator[Tuple[Tuple[int], ...], None, None]:
+def generate_grayscale_arrays(pixel_generator: Iterator[numpy.ndarray]) -> Generator[numpy.ndarray, None, None]:
     for each_frame in pixel_generator:
-        yield tuple((sum(_p) // 3, ) for _p in each_frame)
+        yield each_frame.sum(axis=-1, keepdims=True) // 3
 
 
-def generate_pixel_examples(pixel_generator):
-    last_pixels = next(pixel_generator)
-    while True:
-        pixels = next(pixel_generator)
-        transitions = zip(last_pixels, pixels)
-        change = tuple(((__l, ), (float(__n >= __l), )) for _l, _n in transitions for __l, __n in zip(_l, _n))
-        yield change
-        # yield tuple(transitions)
+def generate_pixel_example_arrays(pixel_generator: Iterator[numpy.ndarray]) -> Generator[Tuple[numpy.ndarray, numpy.ndarray], None, None]:
+    # per pixel channel: last value as input, whether it did not decrease as target
+    last_pixels = numpy.asarray(next(pixel_generator)).ravel()
+    for each_frame in pixel_generator:
+        pixels = numpy.asarray(each_frame).ravel()
+        yield last_pixels[:, None], (last_pixels <= pixels).astype(float)[:, None]
         last_pixels = pixels
 
 
+def generate_rbg_pixels(file_path, window_size=1, cache: bool = False) -> Generator[Tuple[Tuple[int, int, int], ...], None, None]:
+    for each_frame in generate_pixel_arrays(file_path, window_size=window_size, cache=cache):
+        yield tuple(map(tuple, each_frame.tolist()))
+
+
+def generate_grayscale_pixels(pixel_generator) -> Generator[Tuple[Tuple[int], ...], None, None]:
+    for each_frame in generate_grayscale_arrays(numpy.asarray(_f) for _f in pixel_generator):
+        yield tuple(map(tuple, each_frame.tolist()))
+
+
+def generate_pixel_examples(pixel_generator):
+    for last_pixels, targets in generate_pixel_example_arrays(numpy.asarray(_f) for _f in pixel_generator):
+        yield tuple(((_l, ), (_t, )) for _l, _t in zip(last_pixels.ravel().tolist(), targets.ravel().tolist()))
+
+
 def write_image(greyscale_pixels, width, height, file_path):
+    from PIL import Image
     assert len(greyscale_pixels) == width * height
     frame = Image.new("RGB", (width, height))
     grid = frame.load()
@@ -70,6 +109,7 @@ def write_image(greyscale_pixels, width, height, file_path):
 
 
 def check_frames():
+    from PIL import Image
     config = Config("../../../configs/config.json")
     size = 5
     original = Image.open(config["data_dir"] + "gifs/tenor.gif")
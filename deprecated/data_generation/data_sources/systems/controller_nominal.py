@@ -4,6 +4,7 @@ import random
 from typing import Sequence, Hashable, Tuple, TypeVar
 
 from data_generation.data_sources.systems.abstract_classes import Controller, SENSOR_TYPE, MOTOR_TYPE
+from tools.q_table import QTable
 
 NOMINAL_SENSOR = TypeVar("NOMINAL_SENSOR", bound=Hashable)
 NOMINAL_MOTOR = TypeVar("NOMINAL_MOTOR", bound=Hashable)
@@ -31,17 +32,15 @@ class SarsaController(NominalController):
     def __init__(self, motor_range: Sequence[NOMINAL_MOTOR], alpha: float, gamma: float, epsilon: float, default_evaluation: float = 1000.):
         super().__init__(motor_range)
         self.alpha, self.gamma, self.epsilon = alpha, gamma, epsilon
-        self.evaluation = dict()
+        self.motor_indices = {_m: _i for _i, _m in enumerate(self.motor_range)}
+        self.evaluation = QTable(len(self.motor_range), default_evaluation=default_evaluation)
         self.last_perception = None
         self.last_action = None
         self.action = self.motor_range[0]
         self.default_evaluation = default_evaluation
 
     def _evaluate(self, perception: NOMINAL_SENSOR, action: NOMINAL_MOTOR):
-        sub_dict = self.evaluation.get(perception)
-        if sub_dict is None:
-            return self.default_evaluation
-        return sub_dict.get(action, self.default_evaluation)
+        return self.evaluation.evaluate(self.evaluation.row(perception), self.motor_indices[action])
 
     def _select_action(self, perception: NOMINAL_SENSOR) -> Tuple[NOMINAL_MOTOR, float]:
         # exploration
@@ -50,27 +49,22 @@ class SarsaController(NominalController):
             return action, self._evaluate(perception, action)
 
         # new perception
-        sub_dict = self.evaluation.get(perception)
-        if sub_dict is None:
+        row = self.evaluation.row(perception)
+        best = self.evaluation.best(row)
+        if best < 0:
             action = random.choice(self.motor_range)
             return action, self._evaluate(perception, action)
 
         # best action
-        return max(sub_dict.items(), key=lambda _x: _x[1])
+        return self.motor_range[best], self.evaluation.evaluate(row, best)
 
     def _update_evaluation(self, reward: float, evaluation: float):
+        # nothing to evaluate before the first action
+        if self.last_action is None:
+            return
         new_value = reward + self.gamma * evaluation
-        sub_dict = self.evaluation.get(self.last_perception)
-
-        # new perception
-        if sub_dict is None:
-            self.evaluation[self.last_perception] = {self.last_action: new_value}
-
-        # known perception
-        else:
-            last_evaluation = sub_dict.get(self.last_action, self.default_evaluation)
-            last_evaluation += self.alpha * (new_value - last_evaluation)
-            sub_dict[self.last_action] = last_evaluation
+        row = self.evaluation.intern(self.last_perception)
+        self.evaluation.update(row, self.motor_indices[self.last_action], new_value, self.alpha)
 
     def react_to(self, sensor: NOMINAL_SENSOR, reward: float) -> NOMINAL_MOTOR:
         action, evaluation = self._select_action(sensor)
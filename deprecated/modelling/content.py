@@ -1,6 +1,8 @@
-from typing import Hashable, Any, Dict, Tuple, Generic, TypeVar, Optional
+from typing import Hashable, Any, Dict, Tuple, Generic, TypeVar, Optional, List, Set
 
-from tools.regression_experiments import LinearRegressor
+import numpy
+
+from tools.regression_experiments import LinearRegressor, RecursiveLeastSquares
 
 CONDITION = TypeVar("CONDITION")
 CONSEQUENCE = TypeVar("CONSEQUENCE")
@@ -77,43 +79,163 @@ class NominalContent(Content[Hashable, Hashable]):
         return consequence
 
 
+# below this many coefficients per content, one closed form regression per output is faster than recursive least squares.
+# zero drag always uses the closed form, it follows the latest sample like smear and recursive least squares cannot.
+RLS_MIN_COEFFICIENTS = 32
+
+
 class RationalContent(Content[Tuple[float, ...], Tuple[float, ...]]):
-    def __init__(self, input_dimension: int, output_dimension: int, shape: int, drag: int, alpha: int):
+    def __init__(self, input_dimension: int, output_dimension: int, shape: int, drag: int, alpha: int, parameters: Optional["RationalParameters"] = None):
         super().__init__(shape, alpha)
         self.input_dimension = input_dimension
         self.output_dimension = output_dimension
-        self.regressions = tuple(LinearRegressor(input_dimension, drag) for _ in range(output_dimension))
+        if drag == 0 or (input_dimension + 1) * output_dimension < RLS_MIN_COEFFICIENTS:
+            self.regressions = tuple(LinearRegressor(input_dimension, drag) for _ in range(output_dimension))     # type: Optional[Tuple[LinearRegressor, ...]]
+            self.regression = None                                                                                  # type: Optional[RecursiveLeastSquares]
+        else:
+            self.regressions = None
+            self.regression = RecursiveLeastSquares(input_dimension, output_dimension, drag)
+
+        self.parameters = parameters
+        self._row = -1 if parameters is None else parameters.add(self)
+
+    def get_parameters(self) -> numpy.ndarray:
+        # (input + 1, output), offsets in the last row
+        if self.regression is None:
+            return numpy.array([each_regression.get_parameters() for each_regression in self.regressions]).T
+        return self.regression.get_parameters()
+
+    def get_variances(self) -> numpy.ndarray:
+        if self.regression is None:
+            return numpy.array([each_regression.get_variance() for each_regression in self.regressions])
+        return self.regression.get_variances()
+
+    def adapt(self, condition: CONDITION, consequence: CONSEQUENCE):
+        super().adapt(condition, consequence)
+        if self.parameters is not None:
+            self.parameters.invalidate(self._row)
 
     def _adapt(self, condition: CONDITION, consequence: CONSEQUENCE):
         assert len(condition) == self.input_dimension
         assert len(consequence) == self.output_dimension
-        for _i, each_consequence in enumerate(consequence):
-            each_regression = self.regressions[_i]
-            each_regression.fit(condition, each_consequence)
+        if self.regression is None:
+            for _i, each_consequence in enumerate(consequence):
+                each_regression = self.regressions[_i]
+                each_regression.fit(condition, each_consequence)
+        else:
+            self.regression.fit(condition, consequence)
 
     def predict(self, condition: CONDITION, default: Optional[CONSEQUENCE] = None) -> Tuple[float, ...]:
         assert len(condition) == self.input_dimension
-        return tuple(each_regression.output(condition) for each_regression in self.regressions)
+        if self.regression is None:
+            return tuple(each_regression.output(condition) for each_regression in self.regressions)
+        return tuple(self.regression.output(condition).tolist())
 
     def _probability(self, condition: CONDITION, consequence: CONSEQUENCE, default: float = 1.) -> float:
         assert len(condition) == self.input_dimension
         assert len(consequence) == self.output_dimension
-        sim_sum = 0.
-        for _i, each_consequence in enumerate(consequence):
-            each_regression = self.regressions[_i]
-            sim_sum += each_regression.sim(condition, each_consequence)
-        return sim_sum / self.output_dimension
+        if self.regression is None:
+            sim_sum = 0.
+            for _i, each_consequence in enumerate(consequence):
+                each_regression = self.regressions[_i]
+                sim_sum += each_regression.sim(condition, each_consequence)
+            return sim_sum / self.output_dimension
+        return float(self.regression.sim(condition, consequence).mean())
+
+
+class RationalParameters:
+    # coefficients of all rational contents of a level as one (contents, input + 1, output) tensor, one row per content
+    # in the order they were added. contents mark their row after adapting and only marked rows are rewritten
+    # before the next evaluation, so evaluating the level against a query is one matrix multiply without restacking.
+    def __init__(self, input_dimension: int, output_dimension: int, capacity: int = 16):
+        self.contents = []                                                                      # type: List[RationalContent]
+        self._weights = numpy.zeros((capacity, input_dimension + 1, output_dimension))         # type: numpy.ndarray
+        self._variances = numpy.zeros((capacity, output_dimension))                            # type: numpy.ndarray
+        self._iterations = numpy.zeros(capacity)                                               # type: numpy.ndarray
+        self._alphas = numpy.zeros(capacity)                                                   # type: numpy.ndarray
+        self._changed = set()                                                                   # type: Set[int]
+
+    def __len__(self) -> int:
+        return len(self.contents)
+
+    def _grow(self):
+        capacity = 2 * len(self._alphas)
+        no_rows = len(self)
+        for each_name in ("_weights", "_variances", "_iterations", "_alphas"):
+            values = getattr(self, each_name)
+            grown = numpy.zeros((capacity,) + values.shape[1:])
+            grown[:no_rows] = values[:no_rows]
+            setattr(self, each_name, grown)
+
+    def add(self, content: RationalContent) -> int:
+        row = len(self)
+        if row >= len(self._alphas):
+            self._grow()
+        self.contents.append(content)
+        self._alphas[row] = content.alpha
+        self._changed.add(row)
+        return row
+
+    def invalidate(self, row: int):
+        self._changed.add(row)
+
+    def _update(self):
+        for each_row in self._changed:
+            content = self.contents[each_row]
+            self._weights[each_row] = content.get_parameters()
+            self._variances[each_row] = content.get_variances()
+            self._iterations[each_row] = content.iterations
+        self._changed.clear()
+
+    def predict(self, condition: Tuple[float, ...]) -> numpy.ndarray:
+        # predictions of all contents for one condition, one row per content
+        self._update()
+        return numpy.einsum("i,kio->ko", _augmented(condition), self._weights[:len(self)])
+
+    def probabilities(self, condition: Tuple[float, ...], consequence: Tuple[float, ...], default: float = 1.) -> numpy.ndarray:
+        # same as [_c.probability(condition, consequence, default=default) for _c in self.contents]
+        predictions = self.predict(condition)
+        no_rows = len(self)
+        variances = self._variances[:no_rows]
+        iterations = self._iterations[:no_rows]
+        alphas = self._alphas[:no_rows]
+
+        d = (predictions - numpy.asarray(consequence, dtype=float)) ** 2.
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            similarity = 1. - numpy.minimum(1., d / variances)
+        similarity[variances == 0.] = 0.
+        similarity[0. >= d] = 1.
+        p = similarity.mean(axis=1)
+        p[0. >= iterations] = default
+
+        factor = alphas / (alphas + iterations + 1.)
+        return factor + (1. - factor) * p
+
+    def most_probable(self, condition: Tuple[float, ...], consequence: Tuple[float, ...]) -> RationalContent:
+        # first maximum, like max()
+        return self.contents[int(self.probabilities(condition, consequence).argmax())]
+
+
+def _augmented(condition: Tuple[float, ...]) -> numpy.ndarray:
+    augmented = numpy.empty(len(condition) + 1)
+    augmented[:-1] = condition
+    augmented[-1] = 1.
+    return augmented
 
 
 class ContentFactory:
+    # rational contents of a factory share one parameter table, they only exist on the base level
     def __init__(self, input_dimension: int, output_dimensions: int, drag: int, alpha: int):
         self.input_dimension = input_dimension
         self.output_dimensions = output_dimensions
         self.drag = drag
         self.alpha = alpha
+        self.rational_parameters = None                                 # type: Optional[RationalParameters]
 
     def rational(self, shape: int):
-        return RationalContent(self.input_dimension, self.output_dimensions, shape, self.drag, self.alpha)
+        if self.rational_parameters is None:
+            self.rational_parameters = RationalParameters(self.input_dimension, self.output_dimensions)
+        return RationalContent(self.input_dimension, self.output_dimensions, shape, self.drag, self.alpha, parameters=self.rational_parameters)
 
     def nominal(self, shape: int):
         return NominalContent(shape, self.alpha)
@@ -1,7 +1,8 @@
 # coding=utf-8
 from typing import TypeVar, Tuple, List, Dict, Optional, Callable, Iterable
 
-from modelling.content import Content, ContentFactory
+from modelling.content import Content, ContentFactory, RationalContent
+from tools.ring_buffer import RingBuffer
 
 TIME = TypeVar("TIME")
 BASIC_IN = TypeVar("BASIC_IN")
@@ -11,7 +12,7 @@ APPEARANCE = int
 LEVEL = Dict[APPEARANCE, Content]
 MODEL = List[LEVEL]
 STATE = List[APPEARANCE]
-HISTORY = List[int]
+HISTORY = RingBuffer[int]
 TRACE = List[HISTORY]
 
 
@@ -49,9 +50,8 @@ def update_traces(traces: Tuple[TRACE, ...], states: Tuple[STATE, ...], history_
         assert no_trace_layers == no_state_layers
 
         for each_shape, each_trace_layer in zip(each_state, each_trace):
+            assert each_trace_layer.capacity == history_length
             each_trace_layer.append(each_shape)
-            while history_length < len(each_trace_layer):
-                each_trace_layer.pop(0)
 
 
 def generate_content(model: MODEL, states: Tuple[STATE, ...], content_factory: ContentFactory, nominal: bool):
@@ -97,13 +97,21 @@ def adapt_abstract_content(model: MODEL, traces: Tuple[TRACE, ...], states: Tupl
             shape_out = each_state[_i]
 
             if _i == 0 or simple:
-                abstract_shape = tuple(each_trace[_i])
+                abstract_shape = each_trace[_i].as_tuple()
             else:
-                abstract_shape = tuple(each_trace[_i]), tuple(each_trace[_i - 1])          # TODO: keep shape of content? see below
+                abstract_shape = each_trace[_i].as_tuple(), each_trace[_i - 1].as_tuple()          # TODO: keep shape of content? see below
 
             content.adapt(abstract_shape, shape_out)
 
 
+def _most_probable(layer: LEVEL, shape: BASIC_IN, target_value: BASIC_OUT) -> Content:
+    first = next(iter(layer.values()))
+    if isinstance(first, RationalContent) and first.parameters is not None:
+        # the parameter table holds the contents of the layer in the same order
+        return first.parameters.most_probable(shape, target_value)
+    return max(layer.values(), key=lambda _x: _x.probability(shape, target_value))
+
+
 def update_state(shape: BASIC_IN, target_value: BASIC_OUT, model: MODEL, trace: TRACE, state: STATE, sigma: float, fix_at: Callable[[int], int]):
     no_model_layers = len(model)
     level = 0                                                                                                   # type: int
@@ -120,9 +128,9 @@ def update_state(shape: BASIC_IN, target_value: BASIC_OUT, model: MODEL, trace:
         # TODO: preventive switch if next content is better
 
         if level == 0 or simple:
-            abstract_shape = tuple(trace[level])
+            abstract_shape = trace[level].as_tuple()
         else:
-            abstract_shape = tuple(trace[level]), shape                     # TODO: keep shape of content? see above
+            abstract_shape = trace[level].as_tuple(), shape                 # TODO: keep shape of content? see above
 
         if level + 1 < no_model_layers:
             context = get_content(model, state, level + 1)                                                      # type: Content
@@ -136,7 +144,7 @@ def update_state(shape: BASIC_IN, target_value: BASIC_OUT, model: MODEL, trace:
                     level += 1
                     continue
 
-        content = max(layer.values(), key=lambda _x: _x.probability(shape, target_value))               # type: Content
+        content = _most_probable(layer, shape, target_value)                                                # type: Content
         abstract_target = hash(content)                                                                           # type: APPEARANCE
         if content.probability(shape, target_value) >= sigma or no_representations >= fix_at(level) > 0:
             if abstract_target == state[level]:
@@ -177,7 +185,7 @@ def generate_trace_layer(history_length: int, model: MODEL, traces: Tuple[TRACE]
     for each_trace in traces:
         no_trace_layers = len(each_trace)  # type: int
         if no_trace_layers == no_model_layers - 1:
-            each_trace.append([0 for _ in range(history_length)])
+            each_trace.append(RingBuffer[int](history_length, dtype=int, fill=0))
         elif no_trace_layers == no_model_layers:
             pass
         else:
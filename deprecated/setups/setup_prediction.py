@@ -5,7 +5,7 @@ from math import sqrt
 from typing import Tuple, Generator, Any, Union, Hashable, Iterator, TypeVar
 
 from modelling.predictors.abstract_predictor import Predictor
-from tools.logger import DataLogger
+from tools.logger import MetricsSink
 from tools.timer import Timer
 from visualization.visualization import Visualize
 
@@ -42,6 +42,7 @@ class SetupPrediction(Iterator[Tuple[Any, ...]]):
         self.stats_file_path = _time_str + "_" + name + ".log"
         self.logging_steps = logging_steps
         self.header = []
+        self._sink = None
 
     def __log_data(self, header, duration, errors_train, errors_test):
         if len(self.header) < 1:
@@ -53,6 +54,7 @@ class SetupPrediction(Iterator[Tuple[Any, ...]]):
             for _i in range(len(errors_test)):
                 self.header.append(f"error_test_{_i:05d}")
             self.header.append("error_test_all")
+            self._sink = MetricsSink(self.stats_file_path, self.header, formats=["%010d"] + ["%.5f"] * (len(self.header) - 1))
 
         if self.logging_steps >= self.iterations:
             self.average_duration = duration
@@ -68,10 +70,12 @@ class SetupPrediction(Iterator[Tuple[Any, ...]]):
 
         complete_train_error = sum(self.average_train_error) / len(self.average_train_error)
         complete_test_error = sum(self.average_test_error) / len(self.average_test_error)
-        data_floats = [self.average_duration] + self.average_train_error + [complete_train_error] + self.average_test_error + [complete_test_error]
-        data_str = (f"{self.iterations:010d}", ) + tuple(f"{_x:.5f}" for _x in data_floats)
+        data_floats = [self.iterations, self.average_duration] + self.average_train_error + [complete_train_error] + self.average_test_error + [complete_test_error]
+        self._sink.write(data_floats)
 
-        DataLogger.log_to(self.stats_file_path, header, data_str)
+    def close(self):
+        if self._sink is not None:
+            self._sink.close()
 
     @staticmethod
     def __get_error__(outputs, targets) -> float:
@@ -1,7 +1,57 @@
 import itertools
-from functools import reduce
+from functools import lru_cache
 from typing import Sequence, Tuple
 
+import numpy
+
+
+@lru_cache(maxsize=None)
+def input_distribution(input_dimensionality: int, degree: int) -> Tuple[Tuple[Tuple[int, ...], ...], ...]:
+    # input indices of each monomial, grouped by degree, offset first
+    return tuple(
+        ((-1,),) if _i < 0 else tuple(itertools.combinations_with_replacement(range(input_dimensionality), _i + 1))
+        for _i in range(-1, degree)
+    )
+
+
+@lru_cache(maxsize=None)
+def exponent_matrix(input_dimensionality: int, degree: int) -> numpy.ndarray:
+    # (monomials x input_dimensionality) exponents in the order of combinations_with_replacement, without offset
+    exponents = numpy.array([
+        [each_combination.count(_j) for _j in range(input_dimensionality)]
+        for each_degree in input_distribution(input_dimensionality, degree)[1:]
+        for each_combination in each_degree
+    ], dtype=int)
+    exponents.flags.writeable = False
+    return exponents
+
+
+@lru_cache(maxsize=None)
+def degree_bounds(input_dimensionality: int, degree: int) -> Tuple[int, ...]:
+    # column boundaries between the degrees in a row of polynomial features
+    bounds = [0]
+    for each_degree in input_distribution(input_dimensionality, degree)[1:]:
+        bounds.append(bounds[-1] + len(each_degree))
+    return tuple(bounds)
+
+
+def polynomial_features(input_values: numpy.ndarray, degree: int) -> numpy.ndarray:
+    # (N x d) inputs to (N x monomials) features
+    assert degree >= 1
+    exponents = exponent_matrix(input_values.shape[-1], degree)
+    return numpy.prod(input_values[..., None, :] ** exponents, axis=-1)
+
+
+@lru_cache(maxsize=None)
+def _derivation_map(input_distribution_: Tuple[Tuple[Tuple[int, ...], ...], ...], derive_by: int) -> Tuple[Tuple[Tuple[int, ...], Tuple[int, ...]], ...]:
+    # per degree above zero: indices of the monomials containing derive_by and their exponents in it
+    derivation_map = []
+    for _inputs in input_distribution_[1:]:
+        indices = tuple(_j for _j, _each_input in enumerate(_inputs) if derive_by in _each_input)
+        factors = tuple(_inputs[_j].count(derive_by) for _j in indices)
+        derivation_map.append((indices, factors))
+    return tuple(derivation_map)
+
 
 class Function:
     def __init__(self, input_dimensionality: int):
@@ -63,10 +113,7 @@ class MultiplePolynomialFunction(Function):
         super().__init__(input_dimensionality)
         self._degree = degree
 
-        self._input_indices = tuple(
-            ((-1,),) if _i < 0 else tuple(itertools.combinations_with_replacement(range(self._in_dim), _i + 1))
-            for _i in range(-1, degree)
-        )
+        self._input_indices = input_distribution(self._in_dim, degree)
         self.coefficients = tuple([0. for _ in _d] for _d in self._input_indices)
 
     @staticmethod
@@ -81,13 +128,9 @@ class MultiplePolynomialFunction(Function):
         )
         """
         assert degree >= 1
-        return tuple(
-            tuple(
-                reduce(lambda _x, _y: _x * _y, each_combination)
-                for each_combination in itertools.combinations_with_replacement(input_values, _i + 1)
-            )
-            for _i in range(degree)
-        )
+        features = polynomial_features(numpy.asarray(input_values, dtype=float), degree).tolist()
+        bounds = degree_bounds(len(input_values), degree)
+        return tuple(tuple(features[_b:_e]) for _b, _e in zip(bounds[:-1], bounds[1:]))
 
     def __str__(self):
         lst = []
@@ -107,18 +150,12 @@ class MultiplePolynomialFunction(Function):
         return left_hand + " = " + right_hand
 
     @staticmethod
-    def derive_coefficients(coefficients: Sequence[Sequence[float]], input_distribution: Sequence[Sequence[Sequence[int]]], derive_by: int) -> Tuple[Sequence[float], ...]:
+    def derive_coefficients(coefficients: Sequence[Sequence[float]], input_distribution: Tuple[Tuple[Tuple[int, ...], ...], ...], derive_by: int) -> Tuple[Sequence[float], ...]:
         derived_coefficients = []
-        for _i, (_coefficients, _inputs) in enumerate(zip(coefficients, input_distribution)):
-            if _i < 1:
-                continue
-            new_ = []
-            for _each_input, _base_coef in zip(_inputs, _coefficients):
-                degree = _each_input.count(derive_by)
-                if 0 < degree:
-                    new_.append(degree * _base_coef)
-            if 0 < len(new_):
-                derived_coefficients.append(new_)
+        derivation_map = _derivation_map(input_distribution, derive_by)
+        for _coefficients, (_indices, _factors) in zip(coefficients[1:], derivation_map):
+            if 0 < len(_indices):
+                derived_coefficients.append([_f * _coefficients[_j] for _j, _f in zip(_indices, _factors)])
 
         return tuple(derived_coefficients)
 
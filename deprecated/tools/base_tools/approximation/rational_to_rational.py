@@ -1,16 +1,13 @@
 # coding=utf-8
-import itertools
 import math
 import random
 from collections import deque
-from functools import reduce
 from math import cos
 from typing import Sequence, Tuple, Callable
 
 import numpy
-from matplotlib import pyplot
 
-from tools.base_tools.approximation.functions import MultiplePolynomialFunction
+from tools.base_tools.approximation.functions import MultiplePolynomialFunction, input_distribution, exponent_matrix, polynomial_features
 
 from tools.functionality import smear, get_min_max, combinations
 from tools.timer import Timer
@@ -195,7 +192,7 @@ class MultipleLinearRegression(MultipleRegression):
 
 class MultiplePolynomialFromLinearRegression(MultipleRegression):
     def __init__(self, input_dimensionality: int, degree: int, past_scope: int = -1., learning_drag: int = -1):
-        no_polynomial_coefficients = len(MultiplePolynomialFromLinearRegression.polynomial_inputs(tuple(0. for _ in range(input_dimensionality)), degree))
+        no_polynomial_coefficients = len(exponent_matrix(input_dimensionality, degree))
         # no_polynomial_parameters = sum(combinations(_i + 1, _i + input_dimensionality) for _i in range(degree))
         super().__init__(no_polynomial_coefficients)
         self._raw_in_dim = input_dimensionality
@@ -204,10 +201,7 @@ class MultiplePolynomialFromLinearRegression(MultipleRegression):
         self._regression = MultipleLinearRegression(no_polynomial_coefficients, past_scope=past_scope, learning_drag=learning_drag)
         self._past_scope = past_scope
         self._learning_drag = learning_drag
-        self._input_distribution = tuple(
-            ((-1,),) if _i < 0 else tuple(itertools.combinations_with_replacement(range(self._raw_in_dim), _i + 1))
-            for _i in range(-1, degree)
-        )
+        self._input_distribution = input_distribution(input_dimensionality, degree)
 
     def no_parameters(self) -> int:
         return self._regression.no_parameters()
@@ -299,11 +293,7 @@ class MultiplePolynomialFromLinearRegression(MultipleRegression):
         )
         """
         assert degree >= 1
-        return tuple(
-            reduce(lambda _x, _y: _x * _y, each_combination)
-            for _i in range(degree)
-            for each_combination in itertools.combinations_with_replacement(input_values, _i + 1)
-        )
+        return tuple(polynomial_features(numpy.asarray(input_values, dtype=float), degree).tolist())
 
     def _output(self, input_values: Sequence[float]):
         return self._regression._output(input_values)
@@ -443,6 +433,7 @@ class MultivariatePolynomialRegression(MultivariateRegression):
 
 
 def setup_2d_axes():
+    from matplotlib import pyplot
     fig = pyplot.figure()
     plot_axis = fig.add_subplot(211)
     plot_axis.set_xlabel("x")
@@ -455,6 +446,7 @@ def setup_2d_axes():
 
 
 def test_2d():
+    from matplotlib import pyplot
     dim_range = -10., 10.
 
     plot_axis, error_axis = setup_2d_axes()
@@ -511,7 +503,7 @@ def test_2d():
         iterations += 1
 
 
-def plot_surface(axis: pyplot.Axes.axes, _fun: Callable[[float, float], float], dim_ranges: Tuple[Tuple[float, float], Tuple[float, float]], colormap=None, resize: bool = False):
+def plot_surface(axis: "pyplot.Axes.axes", _fun: Callable[[float, float], float], dim_ranges: Tuple[Tuple[float, float], Tuple[float, float]], colormap=None, resize: bool = False):
     _x = numpy.linspace(dim_ranges[0][0], dim_ranges[0][1], endpoint=True, num=100)
     _y = numpy.linspace(dim_ranges[1][0], dim_ranges[1][1], endpoint=True, num=100)
 
@@ -537,7 +529,8 @@ def plot_surface(axis: pyplot.Axes.axes, _fun: Callable[[float, float], float],
     return axis.plot_surface(_X, _Y, _Z, alpha=.2, antialiased=False, cmap=colormap)
 
 
-def plot_4d(axis: pyplot.Axes.axes, _fun: Callable[[float, float, float], float], dim_ranges: Tuple[Tuple[float, float], ...]):
+def plot_4d(axis: "pyplot.Axes.axes", _fun: Callable[[float, float, float], float], dim_ranges: Tuple[Tuple[float, float], ...]):
+    from matplotlib import pyplot
     resolution = 10
     _X, _Y, _Z = tuple(numpy.linspace(*_range, endpoint=True, num=resolution) for _range in dim_ranges)
 
@@ -561,6 +554,7 @@ def plot_4d(axis: pyplot.Axes.axes, _fun: Callable[[float, float, float], float]
 
 
 def setup_3d_axes():
+    from matplotlib import pyplot
     fig = pyplot.figure()
     plot_axis = fig.add_subplot(211, projection='3d')
     plot_axis.set_aspect('equal')
@@ -575,6 +569,7 @@ def setup_3d_axes():
 
 
 def test_3d():
+    from matplotlib import pyplot
     from mpl_toolkits.mplot3d import Axes3D
 
     dim_range = -10., 10.
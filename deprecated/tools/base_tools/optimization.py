@@ -1,14 +1,13 @@
 #!/usr/bin/env python3
 # coding=utf-8
-import itertools
+import heapq
 import json
 import math
 import random
-from math import sqrt, sin, cos
+from math import sin, cos
 from typing import Sequence, Tuple, List, Generator, Optional, Callable
 
 import numpy
-from matplotlib import pyplot
 
 from data_generation.data_processing import series_generator
 from tools.functionality import normalize_vector, signum, cartesian_distance, get_min_max
@@ -18,58 +17,82 @@ POINT = Tuple[float, ...]
 SAMPLE = Tuple[POINT, float]
 AREA = Tuple[POINT, POINT]
 PRIORITY_ELEMENT = Tuple[float, POINT, AREA]
+CANDIDATE = Tuple[Tuple[numpy.ndarray, numpy.ndarray], numpy.ndarray, float]
+
+
+class RegionOptimizer:
+    # best first bisection. every region is split at its center into 2^d subregions spanned by one of its corners
+    # and the center. the centers of these are suggested, and a region is split again in the order of
+    # its value times its diagonal. the frontier is a heap of at most two times limit regions.
+    def __init__(self, ranges: Sequence[RANGE], limit: int = 1000):
+        if limit < 1:
+            raise ValueError("Limit must be positive.")
+        self._dimensionality = len(ranges)                                  # type: int
+        self._limit = limit                                                 # type: int
+        origin = numpy.array([min(_x) for _x in ranges], dtype=float)
+        destination = numpy.array([max(_x) for _x in ranges], dtype=float)
+
+        # (2^d x d) corner selection in the order of itertools.product
+        exponents = numpy.arange(self._dimensionality - 1, -1, -1)
+        self._corners = (numpy.arange(1 << self._dimensionality)[:, None] >> exponents) & 1 == 1
+
+        self._counter = 0                                                   # type: int
+        self._frontier = [(-0., 0, (origin + destination) / 2., (origin, destination))]
+        self._pending = []                                                  # type: List[CANDIDATE]
+        self._suggested = []                                                # type: List[CANDIDATE]
+
+    def _divide(self, region: Tuple[numpy.ndarray, numpy.ndarray], center: numpy.ndarray) -> List[CANDIDATE]:
+        # all subregions at once, with their centers and diagonals
+        point_a, point_b = region
+        corners = numpy.where(self._corners, point_b, point_a)
+        centers = (corners + center) / 2.
+        diagonals = numpy.linalg.norm(corners - center, axis=1)
+        return [((_corner, center), _center, _diagonal) for _corner, _center, _diagonal in zip(corners, centers, diagonals.tolist())]
+
+    def suggest(self, no_points: int = 1) -> Tuple[POINT, ...]:
+        # at most no_points centers, fewer only while the frontier is still smaller than the batch
+        if 0 < len(self._suggested):
+            raise ValueError("Values of the last {:d} suggestions are missing.".format(len(self._suggested)))
+
+        while len(self._suggested) < no_points:
+            if len(self._pending) < 1:
+                if len(self._frontier) < 1:
+                    break
+                _, _, center, region = heapq.heappop(self._frontier)
+                self._pending.extend(self._divide(region, center))
+            self._suggested.append(self._pending.pop())
+
+        return tuple(tuple(_center.tolist()) for _, _center, _ in self._suggested)
+
+    def update(self, values: Sequence[float]):
+        if len(values) != len(self._suggested):
+            raise ValueError("Expected {:d} values, got {:d}.".format(len(self._suggested), len(values)))
+
+        for each_value, (each_region, each_center, each_diagonal) in zip(values, self._suggested):
+            assert each_value >= 0.
+            self._counter += 1
+            # ties go to the most recent region
+            heapq.heappush(self._frontier, (-each_diagonal * each_value, -self._counter, each_center, each_region))
+        self._suggested.clear()
+
+        if len(self._frontier) >= 2 * self._limit:
+            self._frontier = heapq.nsmallest(self._limit, self._frontier)
+
+
+def batch_optimizer(ranges: Sequence[RANGE], batch_size: int, limit: int = 1000) -> Generator[Tuple[POINT, ...], Optional[Sequence[float]], None]:
+    # yields batches of points and expects the values of all of them to be sent back
+    optimizer = RegionOptimizer(ranges, limit=limit)
+    while True:
+        values = yield optimizer.suggest(no_points=batch_size)
+        optimizer.update(values)
 
 
 def stateful_optimizer(ranges: Sequence[RANGE], limit: int = 1000) -> Generator[POINT, Optional[float], None]:
-    dimensionality = len(ranges)                                        # type: int
-    origin = tuple(min(_x) for _x in ranges)                            # type: POINT
-    destination = tuple(max(_x) for _x in ranges)                       # type: POINT
-    complete_region = origin, destination                               # type: AREA
-
-    def __check_edges(_point_a: POINT, _point_b: POINT):
-        len_a, len_b = len(_point_a), len(_point_b)                     # type: int, int
-        if not (len_a == len_b == dimensionality):
-            raise ValueError("Not all edges have a dimensionality of {:d}.".format(dimensionality))
-
-    def __diagonal(_region: AREA) -> float:
-        point_a, point_b = region                                       # type: POINT, POINT
-        __check_edges(point_a, point_b)
-        return sqrt(sum((point_a[_i] - point_b[_i]) ** 2. for _i in range(dimensionality)))
-
-    def __enqueue(_value: float, _center: POINT, _region: AREA):
-        no_values = len(priority_list)                                  # type: int
-        priority = __diagonal(_region) * _value                         # type: float
-        i = 0                                                           # type: int
-        while i < no_values and priority < priority_list[i][0]:
-            i += 1
-        priority_element = priority, _center, _region                   # type: PRIORITY_ELEMENT
-        priority_list.insert(i, priority_element)
-
-    def __center(_region: AREA) -> POINT:
-        point_a, point_b = _region                                      # type: POINT, POINT
-        __check_edges(point_a, point_b)
-        return tuple((point_a[_i] + point_b[_i]) / 2. for _i in range(dimensionality))
-
-    def _divide(_borders: AREA, _center: POINT) -> Tuple[AREA, ...]:
-        return tuple((_x, _center) for _x in itertools.product(*zip(*_borders)))
-
-    genesis_element = 0., __center(complete_region), complete_region    # type: PRIORITY_ELEMENT
-    priority_list = [genesis_element]                                   # type: List[PRIORITY_ELEMENT]
-    cache_list = []                                                     # type: List[AREA]
-
+    optimizer = RegionOptimizer(ranges, limit=limit)
     while True:
-        if len(cache_list) < 1:
-            _, center, region = priority_list.pop(0)                    # type: float, POINT, AREA
-            sub_regions = _divide(region, center)                       # type: Tuple[AREA, ...]
-            cache_list.extend(sub_regions)
-
-        current_region = cache_list.pop()                               # type: AREA
-        current_center = __center(current_region)                       # type: POINT
+        current_center, = optimizer.suggest(no_points=1)
         current_value = yield current_center
-        assert current_value >= 0.
-
-        __enqueue(current_value, current_center, current_region)
-        del(priority_list[limit:])
+        optimizer.update((current_value,))
 
 
 class GradientOptimizer:
@@ -107,6 +130,7 @@ def gradient_optimizer(ranges: Sequence[RANGE], step_size: float) -> Generator[P
 
 
 def test_optimizer_2d():
+    from matplotlib import pyplot
     length = 1000
     x_values = list(range(length))
     f = lambda _x: sin(_x * .07) + cos(_x * .03) + 5.
@@ -141,7 +165,7 @@ def test_optimizer_2d():
     pyplot.show()
 
 
-def plot_surface(axis: pyplot.Axes.axes, _fun: Callable[[float, float], float], dim_ranges: Tuple[Tuple[float, float], Tuple[float, float]], colormap=None, resize: bool = False):
+def plot_surface(axis: "pyplot.Axes.axes", _fun: Callable[[float, float], float], dim_ranges: Tuple[Tuple[float, float], Tuple[float, float]], colormap=None, resize: bool = False):
     _x = numpy.linspace(dim_ranges[0][0], dim_ranges[0][1], endpoint=True, num=100)
     _y = numpy.linspace(dim_ranges[1][0], dim_ranges[1][1], endpoint=True, num=100)
 
@@ -168,6 +192,7 @@ def plot_surface(axis: pyplot.Axes.axes, _fun: Callable[[float, float], float],
 
 
 def test_optimizer_3d():
+    from matplotlib import pyplot
     dim_range = -10., 10.
 
     from mpl_toolkits.mplot3d import Axes3D
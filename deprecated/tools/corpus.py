@@ -0,0 +1,119 @@
+# coding=utf-8
+import hashlib
+import json
+import os
+import string
+import sys
+from typing import Callable, Dict, Generator, Iterable, Tuple
+
+import numpy
+
+from tools.series_cache import replace_file
+
+PERMISSIBLE_NON_LETTER = string.digits + string.punctuation + " "
+BLOCK_SIZE = 1 << 16
+
+
+def _nominal(text: str) -> Iterable[str]:
+    # same filter as sequence_nominal_text
+    for character in text:
+        if character in string.ascii_letters:
+            yield character.lower()
+
+        elif character in PERMISSIBLE_NON_LETTER:
+            yield character
+
+
+FILTERS = {
+    "nominal": _nominal,
+}                                                                   # type: Dict[str, Callable[[str], Iterable[str]]]
+
+
+def _paths(file_path: str, mode: str) -> Tuple[str, str]:
+    prefix = "{:s}.{:s}".format(file_path, mode)
+    return prefix + ".symbols.npy", prefix + ".alphabet.json"
+
+
+def _signature(file_path: str) -> Dict[str, int]:
+    status = os.stat(file_path)
+    return {"size": status.st_size, "modified": status.st_mtime_ns}
+
+
+def _content_hash(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, mode="rb") as file:
+        for each_chunk in iter(lambda: file.read(BLOCK_SIZE), b""):
+            digest.update(each_chunk)
+    return digest.hexdigest()
+
+
+def encode_corpus(file_path: str, mode: str = "nominal") -> Tuple[numpy.ndarray, str]:
+    # symbol codes and alphabet of a text file, stored next to it
+    if mode not in FILTERS:
+        raise ValueError("Unknown corpus mode {:s}.".format(mode))
+
+    signature = _signature(file_path)
+    content_hash = _content_hash(file_path)
+    with open(file_path, mode="r") as file:
+        characters = "".join(FILTERS[mode](file.read()))
+
+    alphabet = "".join(sorted(set(characters)))
+    dtype = numpy.uint8 if len(alphabet) <= 1 << 8 else numpy.uint16
+    lookup = {_c: _i for _i, _c in enumerate(alphabet)}
+    symbols = numpy.fromiter((lookup[_c] for _c in characters), dtype=dtype, count=len(characters))
+
+    symbols_path, alphabet_path = _paths(file_path, mode)
+    # replaced, not overwritten, memory maps of the old symbols stay valid
+    replace_file(symbols_path, lambda _file: numpy.save(_file, symbols))
+    # written last, an interrupted encoding is repeated
+    meta = dict(signature, alphabet=alphabet, sha256=content_hash, length=len(symbols))
+    replace_file(alphabet_path, lambda _file: json.dump(meta, _file), binary=False)
+    return symbols, alphabet
+
+
+def load_corpus(file_path: str, mode: str = "nominal") -> Tuple[numpy.ndarray, str]:
+    # memory mapped symbol codes, encoded again if the text changed since.
+    # the text is only hashed when its size or modification time changed.
+    symbols_path, alphabet_path = _paths(file_path, mode)
+    try:
+        with open(alphabet_path, mode="r") as file:
+            meta = json.load(file)
+    except (OSError, ValueError):
+        return encode_corpus(file_path, mode=mode)
+
+    signature = _signature(file_path)
+    if any(meta.get(_key) != _value for _key, _value in signature.items()):
+        if meta["sha256"] != _content_hash(file_path):
+            return encode_corpus(file_path, mode=mode)
+        meta.update(signature)
+        replace_file(alphabet_path, lambda _file: json.dump(meta, _file), binary=False)
+    if meta["length"] < 1:
+        return numpy.empty(0, dtype=numpy.uint8), meta["alphabet"]
+    return numpy.load(symbols_path, mmap_mode="r"), meta["alphabet"]
+
+
+def corpus_characters(file_path: str, mode: str = "nominal") -> Generator[str, None, None]:
+    symbols, alphabet = load_corpus(file_path, mode=mode)
+    characters = numpy.array(list(alphabet))
+    for _i in range(0, len(symbols), BLOCK_SIZE):
+        yield from characters[symbols[_i:_i + BLOCK_SIZE]].tolist()
+
+
+def transition_matrix(symbols: numpy.ndarray, no_symbols: int) -> numpy.ndarray:
+    # (no_symbols x no_symbols) counts of symbol pairs, row is cause, column is effect
+    causes = numpy.asarray(symbols[:-1], dtype=numpy.int64)
+    effects = numpy.asarray(symbols[1:], dtype=numpy.int64)
+    counts = numpy.bincount(causes * no_symbols + effects, minlength=no_symbols ** 2)
+    return counts.reshape(no_symbols, no_symbols)
+
+
+if __name__ == "__main__":
+    # python -m tools.corpus [--mode nominal] text files...
+    arguments = sys.argv[1:]
+    corpus_mode = "nominal"
+    if 2 <= len(arguments) and arguments[0] == "--mode":
+        corpus_mode = arguments[1]
+        arguments = arguments[2:]
+    for each_path in arguments:
+        each_symbols, each_alphabet = encode_corpus(each_path, mode=corpus_mode)
+        print("{:s}: {:d} symbols, alphabet of {:d}".format(each_path, len(each_symbols), len(each_alphabet)))
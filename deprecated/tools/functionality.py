@@ -1,52 +1,76 @@
 # coding=utf-8
+import itertools
 import math
 import random
-from typing import Tuple, Hashable, Sequence, Collection, Dict, TypeVar, Generic, List, Type, Any, Optional
+from typing import Tuple, Hashable, Sequence, Collection, Dict, TypeVar, Generic, List, Type, Any, Optional, Iterable
 
-from matplotlib import pyplot
+import numpy
 
 from data_generation.data_sources.sequences.non_interactive import sequence_nominal_text, sequence_rational_crypto, examples_rational_trigonometric
 from tools.load_configs import Config
 from tools.timer import Timer
 
 
-# TODO: make generic to handle x input dimensions and y output dimensions
-def functionality_rational_linear(sequence: Sequence[Tuple[float, float]]) -> float:
-    x_total = 0.
-    y_total = 0.
-    no_examples = 0
-
-    for each_input, each_output in sequence:
-        x_total += each_input
-        y_total += each_output
-        no_examples += 1
-
-    x_mean = x_total / no_examples
-    y_mean = y_total / no_examples
+WINDOW_SIZE = 1 << 20
 
-    cov = 0.
-    var = 0.
-    for each_input, each_output in sequence:
-        x_diff = each_input - x_mean
-        cov += x_diff * (each_output - y_mean)
-        var += x_diff ** 2.
 
-    a = 0. if var == 0. else cov / var
-    t = y_mean - a * x_mean
+class LinearMoments:
+    # count, means, squared deviation of x and co-deviation of x and y, merged window by window
+    def __init__(self):
+        self.no_examples = 0                            # type: int
+        self.x_mean = 0.                                # type: float
+        self.y_mean = 0.                                # type: float
+        self.var = 0.                                   # type: float
+        self.cov = 0.                                   # type: float
+
+    def feed(self, x: numpy.ndarray, y: numpy.ndarray):
+        no_window = len(x)
+        if no_window < 1:
+            return
+        x_mean, y_mean = float(x.mean()), float(y.mean())
+        x_diff = x - x_mean
+        var = float(numpy.dot(x_diff, x_diff))
+        cov = float(numpy.dot(x_diff, y - y_mean))
+
+        no_total = self.no_examples + no_window
+        x_delta, y_delta = x_mean - self.x_mean, y_mean - self.y_mean
+        weight = self.no_examples * no_window / no_total
+        self.var += var + x_delta * x_delta * weight
+        self.cov += cov + x_delta * y_delta * weight
+        self.x_mean += x_delta * no_window / no_total
+        self.y_mean += y_delta * no_window / no_total
+        self.no_examples = no_total
+
+
+def functionality_rational_arrays(x: numpy.ndarray, y: numpy.ndarray, window_size: int = WINDOW_SIZE) -> float:
+    # one pass for the moments of the linear fit and one for the clipped residuals, both window by window
+    moments = LinearMoments()
+    for _i in range(0, len(x), window_size):
+        moments.feed(numpy.asarray(x[_i:_i + window_size], dtype=float), numpy.asarray(y[_i:_i + window_size], dtype=float))
+
+    no_examples, var = moments.no_examples, moments.var
+    a = 0. if var == 0. else moments.cov / var
+    t = moments.y_mean - a * moments.x_mean
 
     dist_total = 0.
-    for each_input, each_output in sequence:
-        predicted = each_input * a + t
-        each_var = (each_output - predicted) ** 2.
+    for _i in range(0, len(x), window_size):
+        predicted = numpy.asarray(x[_i:_i + window_size], dtype=float) * a + t
+        each_var = (numpy.asarray(y[_i:_i + window_size], dtype=float) - predicted) ** 2.
         if var == 0.:
-            normalized_distance = float(not each_var == 0.)
+            normalized_distance = (each_var != 0.).astype(float)
         else:
             normalized_distance = no_examples * each_var / var
-        dist_total += min(1., max(0., normalized_distance))
+        dist_total += float(numpy.clip(normalized_distance, 0., 1.).sum())
 
     return 1. - dist_total / no_examples
 
 
+# TODO: make generic to handle x input dimensions and y output dimensions
+def functionality_rational_linear(sequence: Sequence[Tuple[float, float]]) -> float:
+    x, y = numpy.array(sequence, dtype=float).reshape(-1, 2).T
+    return functionality_rational_arrays(x, y)
+
+
 TYPE_A = TypeVar("TYPE_A")
 TYPE_B = TypeVar("TYPE_B")
 
@@ -69,31 +93,51 @@ class DictList(Dict[TYPE_A, List[TYPE_B]]):
             self.add(_k, _v)
 
 
-def functionality_nominal(sequence: Sequence[Hashable]) -> float:
-    examples = dict()
-    for _t, (each_input, each_output) in enumerate(sequence):
-        sub_dict = examples.get(each_input)
-        if sub_dict is None:
-            sub_dict = {each_output: 1}
-            examples[each_input] = sub_dict
-        else:
-            sub_dict[each_output] = sub_dict.get(each_output, 0) + 1
-
-        if Timer.time_passed(2000):
-            print("{:05d} examples processed...".format(_t))
+def encode_symbols(values: Iterable[Hashable]) -> numpy.ndarray:
+    # integer code per value in the order of first occurrence
+    codes = dict()
+    return numpy.fromiter((codes.setdefault(_v, len(codes)) for _v in values), dtype=numpy.int64)
 
-    best = 0
-    total = 0
-    for _i, (each_input, output_frequencies) in enumerate(examples.items()):
-        frequencies = output_frequencies.values()
-        max_frequency = max(frequencies)
-        best += max_frequency
-        total += sum(frequencies)
 
+class NominalFunctionality:
+    # counts of (input, output) code pairs, accumulated window by window
+    def __init__(self):
+        self._keys = numpy.empty(0, dtype=numpy.int64)
+        self._counts = numpy.empty(0, dtype=numpy.int64)
+
+    def feed(self, inputs: numpy.ndarray, outputs: numpy.ndarray):
+        inputs = numpy.asarray(inputs, dtype=numpy.int64)
+        outputs = numpy.asarray(outputs, dtype=numpy.int64)
+        if numpy.any((inputs < 0) | (inputs >= 1 << 31) | (outputs < 0) | (outputs >= 1 << 32)):
+            raise ValueError("Codes must be non-negative and smaller than 2^31 for inputs and 2^32 for outputs.")
+        keys, counts = numpy.unique((inputs << 32) | outputs, return_counts=True)
+
+        keys = numpy.concatenate((self._keys, keys))
+        counts = numpy.concatenate((self._counts, counts))
+        self._keys, inverse = numpy.unique(keys, return_inverse=True)
+        self._counts = numpy.bincount(inverse, weights=counts).astype(numpy.int64)
+
+    def value(self) -> float:
+        # share of examples predicted by the most frequent output of their input, keys are sorted by input
+        inputs = self._keys >> 32
+        starts = numpy.flatnonzero(numpy.concatenate(([True], inputs[1:] != inputs[:-1])))
+        best = numpy.maximum.reduceat(self._counts, starts).sum()
+        return int(best) / int(self._counts.sum())
+
+
+def functionality_nominal_arrays(inputs: numpy.ndarray, outputs: numpy.ndarray, window_size: int = WINDOW_SIZE) -> float:
+    functionality = NominalFunctionality()
+    for _i in range(0, len(inputs), window_size):
+        functionality.feed(inputs[_i:_i + window_size], outputs[_i:_i + window_size])
         if Timer.time_passed(2000):
-            print("{:05d} examples processed...".format(total))
+            print("{:05d} examples processed...".format(_i + window_size))
+    return functionality.value()
+
 
-    return best / total
+def functionality_nominal(sequence: Sequence[Tuple[Hashable, Hashable]]) -> float:
+    inputs = encode_symbols(_x for _x, _ in sequence)
+    outputs = encode_symbols(_y for _, _y in sequence)
+    return functionality_nominal_arrays(inputs, outputs)
 
 
 def test_nominal_functionality():
@@ -121,6 +165,7 @@ def test_debug_rational_linear_functionality():
 
 
 def test_crypto_linear_functionality():
+    from matplotlib import pyplot
     config = Config("../configs/config.json")
     g = sequence_rational_crypto(config["data_dir"] + "23Jun2017-23Jun2018-1m/EOSETH.csv", 60 * 60 * 24)
     examples = []
@@ -135,6 +180,7 @@ def test_crypto_linear_functionality():
 
 
 def test_trigonometry_rational_linear_functionality():
+    from matplotlib import pyplot
     g = examples_rational_trigonometric()
     examples = []
     for _ in range(1000):
@@ -152,11 +198,7 @@ def main_test():
 
 
 def generic_functionality(examples, iterations: int, rational: bool = False) -> float:
-    example_sequence = []
-    for _i, each_example in enumerate(examples):
-        if _i >= iterations:
-            break
-        example_sequence.append(each_example)
+    example_sequence = list(itertools.islice(examples, iterations))
     if rational:
         return functionality_rational_linear(example_sequence)
     return functionality_nominal(example_sequence)
@@ -0,0 +1,58 @@
+# coding=utf-8
+import json
+import os
+import subprocess
+import sys
+from typing import Sequence, Tuple
+
+# importable without any plotting or visualization package, these load on first use only
+CORE_MODULES = (
+    "modelling.content",
+    "modelling.semiotic_functions",
+    "modelling.predictors.nominal.semiotic",
+    "modelling.predictors.rational.semiotic",
+    "_framework.systems.predictors.nominal.resources.semiotic_model",
+    "_framework.setup",
+    "tools.regression_experiments",
+    "tools.functionality",
+    "tools.base_tools.optimization",
+    "tools.base_tools.approximation.rational_to_rational",
+    "data_generation.data_processing",
+    "data_generation.data_sources.sequences.non_interactive",
+    "data_generation.data_sources.sequences.read_gif",
+)
+
+VISUALIZATION_PACKAGES = "matplotlib", "mpl_toolkits", "networkx", "PIL", "dash", "plotly", "flask"
+
+_PROBE = """
+import importlib, json, sys, time
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+duration = time.perf_counter() - start
+loaded = sorted(_p for _p in sys.argv[2:] if _p in sys.modules)
+print(json.dumps({"seconds": duration, "loaded": loaded}))
+"""
+
+
+def import_cost(module_name: str) -> Tuple[float, Sequence[str]]:
+    # seconds to import module_name in a fresh interpreter and the visualization packages it pulled in
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    environment = dict(os.environ, PYTHONPATH=root)
+    output = subprocess.check_output([sys.executable, "-c", _PROBE, module_name] + list(VISUALIZATION_PACKAGES), cwd=root, env=environment)
+    result = json.loads(output.decode().strip().splitlines()[-1])
+    return result["seconds"], result["loaded"]
+
+
+def check_imports(max_seconds: float = 1.) -> bool:
+    passed = True
+    for each_module in CORE_MODULES:
+        seconds, loaded = import_cost(each_module)
+        failed = 0 < len(loaded) or max_seconds < seconds
+        passed &= not failed
+        print("{:s} {:s}: {:.3f}s{:s}".format("FAIL" if failed else "ok  ", each_module, seconds, "" if len(loaded) < 1 else ", loads " + ", ".join(loaded)))
+    return passed
+
+
+if __name__ == "__main__":
+    # python -m tools.import_check [max seconds per module]
+    sys.exit(0 if check_imports(*(float(_x) for _x in sys.argv[1:2])) else 1)
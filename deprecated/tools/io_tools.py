@@ -2,6 +2,10 @@
 import pickle
 from typing import Sequence, Union, List, Generator, TypeVar, Any, Tuple
 
+import numpy
+
+from tools.ring_buffer import RingBuffer
+
 
 class PersistenceMixin:
     def save_as(self, file_path: str):
@@ -42,9 +46,13 @@ def generate_values(file_path: str, columns: Union[Sequence[str], Sequence[int]]
 T = TypeVar("T")
 
 
-def generate_window(generator: Generator[T, Any, Any], size: int) -> Generator[Tuple[T, ...], None, None]:
-    window = [next(generator) for _ in range(size)]
-    while True:
-        yield tuple(window)
+def generate_window(generator: Generator[T, Any, Any], size: int, dtype: Any = object, view: bool = False) -> Generator[Union[Tuple[T, ...], numpy.ndarray], None, None]:
+    # tuples by default. with view, zero-copy arrays that are overwritten by the next step, copy to keep.
+    window = RingBuffer[T](size, dtype=dtype)
+    for _ in range(size):
         window.append(next(generator))
-        window.pop(0)
+
+    for each_value in generator:
+        yield window.view() if view else window.as_tuple()
+        window.append(each_value)
+    yield window.view() if view else window.as_tuple()
@@ -1,8 +1,15 @@
 # coding=utf-8
+import atexit
 import datetime
+import json
 import os
+import queue
 import sys
-from typing import Sequence, Optional
+import threading
+import time
+from typing import Sequence, Optional, List
+
+import numpy
 
 
 def get_time_string():
@@ -64,3 +71,113 @@ class DataLogger:
 
         with open(file_path, mode="a") as file:
             file.write(content + "\n")
+
+
+class MetricsSink:
+    # rows are queued by the caller and written in batches by a background thread.
+    # the schema is fixed by the header. text writes tab separated rows like DataLogger,
+    # binary appends float64 rows to <file>.f64 next to a json description of the columns.
+    # a failed write stops the thread and is raised by the next write or close.
+    def __init__(self, file_path: str, header: Sequence[str],
+                 binary: bool = False, formats: Optional[Sequence[str]] = None,
+                 flush_rows: int = 1000, flush_secs: float = 5.):
+        if formats is not None and len(formats) != len(header):
+            raise ValueError("inconsistent sizes")
+
+        dir_path = os.path.dirname(file_path)
+        if 0 < len(dir_path) and not os.path.isdir(dir_path):
+            os.makedirs(dir_path)
+
+        self._header = tuple(header)
+        self._binary = binary
+        self._formats = ["%.5f" for _ in header] if formats is None else list(formats)
+        self._flush_rows = flush_rows
+        self._flush_secs = flush_secs
+
+        if binary:
+            self._file_path = file_path + ".f64"
+            with open(file_path + ".json", mode="w") as file:
+                json.dump({"columns": self._header, "dtype": "float64"}, file)
+            self._file = open(self._file_path, mode="ab")
+
+        else:
+            self._file_path = file_path
+            is_new = not os.path.isfile(file_path)
+            self._file = open(file_path, mode="a")
+            if is_new:
+                self._file.write("\t".join(self._header) + "\n")
+
+        self._queue = queue.Queue()                                     # type: queue.Queue
+        self._error = None                                              # type: Optional[BaseException]
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __enter__(self) -> "MetricsSink":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write(self, values: Sequence[float]):
+        if not len(values) == len(self._header):
+            raise ValueError("inconsistent sizes")
+        if self._error is not None:
+            raise self._error
+        self._queue.put(values)
+
+    def _flush(self, rows: List[Sequence[float]]):
+        if len(rows) < 1:
+            return
+        block = numpy.array(rows, dtype=float)
+        if self._binary:
+            block.tofile(self._file)
+        else:
+            numpy.savetxt(self._file, block, fmt=self._formats, delimiter="\t")
+        self._file.flush()
+        rows.clear()
+
+    def _work(self):
+        try:
+            self._write_rows()
+        except Exception as e:
+            self._error = e
+
+    def _write_rows(self):
+        rows = []
+        last_flush = time.time()
+        while True:
+            try:
+                row = self._queue.get(timeout=self._flush_secs)
+            except queue.Empty:
+                row = ()
+
+            if row is None:
+                break
+            if 0 < len(row):
+                rows.append(row)
+
+            now = time.time()
+            if len(rows) >= self._flush_rows or now - last_flush >= self._flush_secs:
+                self._flush(rows)
+                last_flush = now
+
+        self._flush(rows)
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+        atexit.unregister(self.close)
+        if self._error is not None:
+            raise self._error
+
+
+def read_metrics(file_path: str) -> numpy.ndarray:
+    # (rows x columns) of a binary metrics file written by MetricsSink
+    with open(file_path + ".json", mode="r") as file:
+        description = json.load(file)
+    values = numpy.fromfile(file_path + ".f64", dtype=description["dtype"])
+    return values.reshape(-1, len(description["columns"]))
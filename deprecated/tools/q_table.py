@@ -0,0 +1,151 @@
+# coding=utf-8
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+import numpy
+
+from tools.io_tools import PersistenceMixin
+
+_NOT_VISITED = numpy.iinfo(numpy.int64).max
+
+
+class QTable(PersistenceMixin):
+    # (perceptions x motors) evaluations. perceptions are interned to rows in the order they are first updated,
+    # motors are column indices. rows double in number when full.
+    # only visited entries compete for the best motor, they are kept a second time with -inf for all others.
+    # of several best motors the one visited first wins, like max over a dict of motors in insertion order.
+    def __init__(self, no_motors: int, default_evaluation: float = 0., capacity: int = 64):
+        if no_motors < 1 or capacity < 1:
+            raise ValueError("Number of motors and capacity must be positive.")
+        self._no_motors = no_motors                                                     # type: int
+        self._default_evaluation = default_evaluation                                   # type: float
+        self._rows = dict()                                                             # type: Dict[Hashable, int]
+        self._perceptions = []                                                          # type: List[Hashable]
+        self._values = numpy.full((capacity, no_motors), default_evaluation)            # type: numpy.ndarray
+        self._ranking = numpy.full((capacity, no_motors), -numpy.inf)                   # type: numpy.ndarray
+        self._known = numpy.zeros(capacity, dtype=bool)                                 # type: numpy.ndarray
+        self._first_visits = numpy.full((capacity, no_motors), _NOT_VISITED)            # type: numpy.ndarray
+        self._no_visits = 0                                                             # type: int
+
+    def __len__(self) -> int:
+        return len(self._perceptions)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = dict(self.__dict__)
+        state["_values"] = self._values[:len(self)].copy()
+        state["_ranking"] = self._ranking[:len(self)].copy()
+        state["_known"] = self._known[:len(self)].copy()
+        state["_first_visits"] = self._first_visits[:len(self)].copy()
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._grow(max(len(self), 1))
+
+    @property
+    def perceptions(self) -> List[Hashable]:
+        return self._perceptions
+
+    def values(self) -> numpy.ndarray:
+        # zero-copy view of the used rows
+        return self._values[:len(self)]
+
+    def _grow(self, capacity: int):
+        values = numpy.full((capacity, self._no_motors), self._default_evaluation)
+        ranking = numpy.full((capacity, self._no_motors), -numpy.inf)
+        known = numpy.zeros(capacity, dtype=bool)
+        first_visits = numpy.full((capacity, self._no_motors), _NOT_VISITED)
+        no_rows = len(self)
+        values[:no_rows] = self._values[:no_rows]
+        ranking[:no_rows] = self._ranking[:no_rows]
+        known[:no_rows] = self._known[:no_rows]
+        first_visits[:no_rows] = self._first_visits[:no_rows]
+        self._values, self._ranking, self._known, self._first_visits = values, ranking, known, first_visits
+
+    def row(self, perception: Hashable) -> int:
+        # -1 for unknown perceptions
+        return self._rows.get(perception, -1)
+
+    def intern(self, perception: Hashable) -> int:
+        row = self._rows.get(perception)
+        if row is None:
+            row = len(self._perceptions)
+            if row >= len(self._values):
+                self._grow(2 * len(self._values))
+            self._rows[perception] = row
+            self._perceptions.append(perception)
+        return row
+
+    def intern_batch(self, perceptions: Iterable[Hashable]) -> numpy.ndarray:
+        return numpy.fromiter((self.intern(_p) for _p in perceptions), dtype=int)
+
+    def evaluate(self, row: int, motor: int) -> float:
+        if row < 0:
+            return self._default_evaluation
+        return float(self._values[row, motor])
+
+    def best(self, row: int) -> int:
+        # best visited motor, -1 if there is none
+        if row < 0 or not self._known[row]:
+            return -1
+        ranking = self._ranking[row]
+        best = numpy.flatnonzero(ranking == ranking.max())
+        if len(best) == 1:
+            return int(best[0])
+        return int(best[self._first_visits[row, best].argmin()])
+
+    def update(self, row: int, motor: int, target: float, alpha: float):
+        # first evaluation of a perception is set to the target, all others move towards it
+        if self._known[row]:
+            value = self._values[row, motor] + alpha * (target - self._values[row, motor])
+        else:
+            value = target
+            self._known[row] = True
+        if self._first_visits[row, motor] == _NOT_VISITED:
+            self._first_visits[row, motor] = self._no_visits
+            self._no_visits += 1
+        self._values[row, motor] = self._ranking[row, motor] = value
+
+    def evaluate_batch(self, rows: numpy.ndarray, motors: numpy.ndarray) -> numpy.ndarray:
+        return numpy.where(rows < 0, self._default_evaluation, self._values[rows, motors])
+
+    def select_batch(self, rows: numpy.ndarray, epsilon: float, random_state: Optional[numpy.random.Generator] = None) -> numpy.ndarray:
+        # epsilon greedy motors, random for unknown perceptions
+        random_state = numpy.random.default_rng() if random_state is None else random_state
+        rows = numpy.asarray(rows)
+        ranking = self._ranking[rows]
+        best = ranking == ranking.max(axis=1, keepdims=True)
+        greedy = numpy.where(best, self._first_visits[rows], _NOT_VISITED).argmin(axis=1)
+        explore = (random_state.random(len(rows)) < epsilon) | (rows < 0) | ~self._known[rows]
+        return numpy.where(explore, random_state.integers(self._no_motors, size=len(rows)), greedy)
+
+    def update_batch(self, rows: numpy.ndarray, motors: numpy.ndarray, targets: numpy.ndarray, alpha: float):
+        # same result as update for each pair in order. identical pairs are applied in rounds, one occurrence per round.
+        rows, motors, targets = numpy.asarray(rows), numpy.asarray(motors), numpy.asarray(targets, dtype=float)
+        no_pairs = len(rows)
+        if no_pairs < 1:
+            return
+
+        cells = rows * self._no_motors + motors
+        order = numpy.argsort(cells, kind="stable")
+        sorted_cells = cells[order]
+        starts = numpy.flatnonzero(numpy.concatenate(([True], sorted_cells[1:] != sorted_cells[:-1])))
+        occurrences = numpy.empty(no_pairs, dtype=int)
+        occurrences[order] = numpy.arange(no_pairs) - numpy.repeat(starts, numpy.diff(numpy.append(starts, no_pairs)))
+
+        # only the first pair of an unknown perception is set to its target
+        _, first_pairs = numpy.unique(rows, return_index=True)
+        is_set = numpy.zeros(no_pairs, dtype=bool)
+        is_set[first_pairs] = ~self._known[rows[first_pairs]]
+
+        # first visits are numbered in the order of the pairs
+        first_cells = numpy.flatnonzero((occurrences == 0) & (self._first_visits[rows, motors] == _NOT_VISITED))
+        self._first_visits[rows[first_cells], motors[first_cells]] = self._no_visits + numpy.arange(len(first_cells))
+        self._no_visits += len(first_cells)
+
+        for each_occurrence in range(occurrences.max() + 1):
+            pairs = numpy.flatnonzero(occurrences == each_occurrence)
+            each_rows, each_motors, each_targets = rows[pairs], motors[pairs], targets[pairs]
+            values = self._values[each_rows, each_motors]
+            values = numpy.where(is_set[pairs], each_targets, values + alpha * (each_targets - values))
+            self._values[each_rows, each_motors] = self._ranking[each_rows, each_motors] = values
+        self._known[rows] = True
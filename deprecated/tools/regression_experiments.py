@@ -1,11 +1,8 @@
 # coding=utf-8
 import random
 from typing import Tuple, Sequence, Optional, Callable
-from matplotlib import pyplot, cm
 
 # TODO: implement polynomial regressor for rational reinforcement learning
-from mpl_toolkits.mplot3d import Axes3D
-
 from tools.functionality import smear, get_min_max
 import numpy
 
@@ -21,27 +18,55 @@ class SinglePolynomialRegressor:
     def __init__(self, degree: int):
         assert degree >= 1
         self._degree = degree
-        self._var_matrix = tuple([0. for _ in range(degree + 1)] for _ in range(degree + 1))
-        self._cov_matrix = [0. for _ in range(degree + 1)]
+        self._exponents = numpy.arange(degree + 1)
+        self._var_matrix = numpy.zeros((degree + 1, degree + 1))
+        self._cov_matrix = numpy.zeros(degree + 1)
+        self._parameters = None
 
     def fit(self, in_value: float, out_value: float, drag: int):
         assert drag >= 0
-        for _r, _var_row in enumerate(self._var_matrix):
-            for _c in range(self._degree + 1):
-                _var_row[_c] = smear(_var_row[_c], in_value ** (_r + _c), drag)
-            self._cov_matrix[_r] = smear(self._cov_matrix[_r], out_value * in_value ** _r, drag)
+        powers = in_value ** self._exponents
+        self._var_matrix = (drag * self._var_matrix + numpy.outer(powers, powers)) / (drag + 1.)
+        self._cov_matrix = (drag * self._cov_matrix + out_value * powers) / (drag + 1.)
+        self._parameters = None
 
         # one matrix for each input?
 
+    def fit_batch(self, in_values: Sequence[float], out_values: Sequence[float], drag: int):
+        # same result as calling fit for each example in order
+        assert drag >= 0
+        in_array = numpy.asarray(in_values, dtype=float)
+        out_array = numpy.asarray(out_values, dtype=float)
+        assert in_array.shape == out_array.shape
+        no_examples, = in_array.shape
+        if no_examples < 1:
+            return
+
+        inertia = drag / (drag + 1.)
+        weights = (1. - inertia) * inertia ** numpy.arange(no_examples - 1, -1, -1)
+        powers = in_array[:, None] ** self._exponents
+        weighted = powers * weights[:, None]
+
+        decay = inertia ** no_examples
+        self._var_matrix = decay * self._var_matrix + weighted.T @ powers
+        self._cov_matrix = decay * self._cov_matrix + weighted.T @ out_array
+        self._parameters = None
+
     def get_parameters(self) -> Tuple[float, ...]:
-        try:
-            return tuple(numpy.linalg.solve(self._var_matrix, self._cov_matrix))
-        except numpy.linalg.linalg.LinAlgError:
-            return tuple(0. for _ in range(self._degree + 1))
+        if self._parameters is None:
+            try:
+                self._parameters = numpy.linalg.solve(self._var_matrix, self._cov_matrix)
+            except numpy.linalg.LinAlgError:
+                self._parameters = numpy.zeros(self._degree + 1)
+        return tuple(self._parameters.tolist())
 
     def output(self, in_value: float) -> float:
-        parameters = self.get_parameters()
-        return sum(_c * in_value ** _i for _i, _c in enumerate(parameters))
+        self.get_parameters()
+        return float(numpy.dot(self._parameters, in_value ** self._exponents))
+
+    def output_batch(self, in_values: Sequence[float]) -> numpy.ndarray:
+        self.get_parameters()
+        return numpy.asarray(in_values, dtype=float)[:, None] ** self._exponents @ self._parameters
 
 
 class MultiplePolynomialRegressor:
@@ -55,6 +80,12 @@ class MultiplePolynomialRegressor:
         for _in_value, _regressor in zip(in_values, self._regressors):
             _regressor.fit(_in_value, out_value, drag)
 
+    def fit_batch(self, in_values: Sequence[Sequence[float]], out_values: Sequence[float], drag: int):
+        in_array = numpy.asarray(in_values, dtype=float)
+        assert in_array.shape[1:] == (self._input_dimensions,)
+        for _i, _regressor in enumerate(self._regressors):
+            _regressor.fit_batch(in_array[:, _i], out_values, drag)
+
     def output(self, in_values: Tuple[float, ...]) -> float:
         return sum(_regressor.output(_in_value) for _in_value, _regressor in zip(in_values, self._regressors)) / self._input_dimensions
 
@@ -79,6 +110,12 @@ class FullPolynomialRegressor:
         for _each_regressor, _each_output in zip(self._regressors, out_values):
             _each_regressor.fit(in_values, _each_output, drag)
 
+    def fit_batch(self, in_values: Sequence[Sequence[float]], out_values: Sequence[Sequence[float]], drag: int):
+        out_array = numpy.asarray(out_values, dtype=float)
+        assert out_array.shape[1:] == (self._out_dim,)
+        for _i, _each_regressor in enumerate(self._regressors):
+            _each_regressor.fit_batch(in_values, out_array[:, _i], drag)
+
     def output(self, in_values: Tuple[float, ...]) -> Tuple[float, ...]:
         return tuple(_each_regressor.output(in_values) for _each_regressor in self._regressors)
 
@@ -95,6 +132,7 @@ class LinearRegressor:
         self._var_y = 0.
         self._cov_xy = [0. for _ in range(input_dimensions)]
         self._iterations = 0
+        self._parameters = None
 
     def __str__(self):
         parameters = self.get_parameters()
@@ -139,12 +177,17 @@ class LinearRegressor:
 
         self._mean_y = smear(self._mean_y, y, self._drag)
         self._iterations = 1    # TODO: change
+        self._parameters = None
+
+    def get_variance(self) -> float:
+        return self._var_y
 
     def get_parameters(self) -> Tuple[float, ...]:
-        xn = tuple(0. if _var_x == 0. else _cov_xy / _var_x for (_cov_xy, _var_x) in zip(self._cov_xy, self._var_x))
-        x0 = self._mean_y - sum(_xn * _mean_x for (_xn, _mean_x) in zip(xn, self._mean_x))
-        parameters = *xn, x0
-        return parameters
+        if self._parameters is None:
+            xn = tuple(0. if _var_x == 0. else _cov_xy / _var_x for (_cov_xy, _var_x) in zip(self._cov_xy, self._var_x))
+            x0 = self._mean_y - sum(_xn * _mean_x for (_xn, _mean_x) in zip(xn, self._mean_x))
+            self._parameters = *xn, x0
+        return self._parameters
 
     def output(self, x: Tuple[float, ...]) -> float:
         assert len(x) == self._input_dimensions
@@ -153,7 +196,233 @@ class LinearRegressor:
         return sum(_x * _xn for _x, _xn in zip(x, xn[:-1])) + xn[-1]
 
 
-def plot_surface(axis: pyplot.Axes.axes, _fun: Callable[[float, float], float], dim_range: Tuple[float, float], colormap=None):
+class BatchLinearRegressor:
+    # one LinearRegressor per regression and output dimension, fitted at once with the same operations in the same order.
+    # inputs (no_regressions x input_dimensions), targets (no_regressions x output_dimensions)
+    def __init__(self, no_regressions: int, input_dimensions: int, output_dimensions: int, drag: int):
+        self._drag = drag
+        self._no_regressions = no_regressions
+        self._input_dimensions = input_dimensions
+        self._output_dimensions = output_dimensions
+        self._mean_x = numpy.zeros((no_regressions, input_dimensions))
+        self._mean_y = numpy.zeros((no_regressions, output_dimensions))
+        self._var_x = numpy.zeros((no_regressions, input_dimensions))
+        self._var_y = numpy.zeros((no_regressions, output_dimensions))
+        self._cov_xy = numpy.zeros((no_regressions, input_dimensions, output_dimensions))
+        self._iterations = 0
+        self._parameters = None
+
+    def fit(self, x: numpy.ndarray, y: numpy.ndarray):
+        x = numpy.asarray(x, dtype=float)
+        y = numpy.asarray(y, dtype=float)
+        assert x.shape == (self._no_regressions, self._input_dimensions)
+        assert y.shape == (self._no_regressions, self._output_dimensions)
+        if self._drag < 0:
+            return
+
+        dy = y - self._mean_y
+        dx = x - self._mean_x
+        self._var_x = smear(self._var_x, dx ** 2., self._drag)
+        self._cov_xy = smear(self._cov_xy, dx[:, :, None] * dy[:, None, :], self._drag)
+
+        self._var_y = smear(self._var_y, dy ** 2., self._drag)
+
+        if 0 >= self._iterations:
+            self._mean_x = x
+            self._mean_y = y
+
+        self._mean_x = smear(self._mean_x, x, self._drag)
+        self._mean_y = smear(self._mean_y, y, self._drag)
+        self._iterations = 1
+        self._parameters = None
+
+    def get_variances(self) -> numpy.ndarray:
+        return self._var_y
+
+    def get_parameters(self) -> numpy.ndarray:
+        # no_regressions x (input_dimensions + 1) x output_dimensions, offsets in the last row
+        if self._parameters is None:
+            with numpy.errstate(divide="ignore", invalid="ignore"):
+                xn = numpy.where(self._var_x[:, :, None] == 0., 0., self._cov_xy / self._var_x[:, :, None])
+            # summed one input after the other like LinearRegressor
+            x0 = 0.
+            for _i in range(self._input_dimensions):
+                x0 = x0 + xn[:, _i] * self._mean_x[:, _i, None]
+            self._parameters = numpy.concatenate((xn, (self._mean_y - x0)[:, None, :]), axis=1)
+        return self._parameters
+
+    def output(self, x: numpy.ndarray) -> numpy.ndarray:
+        x = numpy.asarray(x, dtype=float)
+        assert x.shape == (self._no_regressions, self._input_dimensions)
+        parameters = self.get_parameters()
+        outputs = 0.
+        for _i in range(self._input_dimensions):
+            outputs = outputs + x[:, _i, None] * parameters[:, _i]
+        return outputs + parameters[:, -1]
+
+
+class RecursiveLeastSquares:
+    # https://en.wikipedia.org/wiki/Recursive_least_squares_filter
+    # one weight matrix for all output dimensions, forgetting factor derived from drag like smear
+    def __init__(self, input_dimensions: int, output_dimensions: int, drag: int, initial_covariance: float = 1000.):
+        assert 0. < initial_covariance
+        if drag == 0:
+            # smear with zero drag follows the latest sample only, which has no least squares solution
+            raise ValueError("Recursive least squares needs a non-zero drag, use LinearRegressor to follow the latest sample.")
+        self._drag = drag
+        self._input_dimensions = input_dimensions
+        self._output_dimensions = output_dimensions
+        self._forgetting = 1. if drag < 0 else drag / (drag + 1.)             # same weight of the past as smear, negative drag does not fit
+        self._max_trace = initial_covariance * (input_dimensions + 1)
+
+        self._weights = numpy.zeros((input_dimensions + 1, output_dimensions))     # last row is the offset
+        self._covariance = numpy.identity(input_dimensions + 1) * initial_covariance
+        self._mean_y = numpy.zeros(output_dimensions)
+        self._var_y = numpy.zeros(output_dimensions)
+        self._iterations = 0
+
+    def __str__(self):
+        arguments = ", ".join(["x{:d}".format(_i) for _i in range(self._input_dimensions)])
+        functions = []
+        for _o, parameters in enumerate(self._weights.T.tolist()):
+            components = " + ".join(["{:.4f} * x{:d}".format(_p, _i) for _i, _p in enumerate(parameters[:-1])])
+            functions.append("f{:d}({:s}) = {:s} + {:.4f}".format(_o, arguments, components, parameters[-1]))
+        return "\n".join(functions)
+
+    def _augmented(self, x: Sequence[float]) -> numpy.ndarray:
+        assert len(x) == self._input_dimensions
+        augmented = numpy.empty(self._input_dimensions + 1)
+        augmented[:-1] = x
+        augmented[-1] = 1.
+        return augmented
+
+    def get_parameters(self) -> numpy.ndarray:
+        # (input_dimensions + 1) x output_dimensions, offsets in the last row
+        return self._weights
+
+    def get_variances(self) -> numpy.ndarray:
+        return self._var_y
+
+    def fit(self, x: Sequence[float], y: Sequence[float]):
+        assert len(y) == self._output_dimensions
+        if self._drag < 0:
+            return
+
+        target = numpy.asarray(y, dtype=float)
+        augmented = self._augmented(x)
+
+        dy = target - self._mean_y
+        self._var_y = smear(self._var_y, dy ** 2., self._drag)
+        if 0 >= self._iterations:
+            self._mean_y = target
+        self._mean_y = smear(self._mean_y, target, self._drag)
+
+        projected = self._covariance @ augmented
+        gain = projected / (self._forgetting + augmented @ projected)
+        error = target - augmented @ self._weights
+        self._weights += numpy.outer(gain, error)
+        self._covariance -= numpy.outer(gain, projected)
+        self._covariance /= self._forgetting
+        # rounding makes the covariance asymmetric, it then loses definiteness and the weights diverge
+        self._covariance = (self._covariance + self._covariance.T) / 2.
+
+        trace = numpy.trace(self._covariance)
+        if self._max_trace < trace:
+            # prevent covariance wind-up in directions without excitation
+            self._covariance *= self._max_trace / trace
+
+        self._iterations += 1
+
+    def output(self, x: Sequence[float]) -> numpy.ndarray:
+        return self._augmented(x) @ self._weights
+
+    def sim(self, x: Sequence[float], y: Sequence[float], default: float = 1.) -> numpy.ndarray:
+        # same measure as LinearRegressor.sim, one value per output dimension
+        assert len(y) == self._output_dimensions
+        if 0 >= self._iterations:
+            return numpy.full(self._output_dimensions, default)
+
+        d = (self.output(x) - numpy.asarray(y, dtype=float)) ** 2.
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            similarity = 1. - numpy.minimum(1., d / self._var_y)
+        similarity[self._var_y == 0.] = 0.
+        similarity[0. >= d] = 1.
+        return similarity
+
+
+
+class BatchRecursiveLeastSquares:
+    # no_regressions independent RecursiveLeastSquares fitted at once, inputs (no_regressions x input_dimensions),
+    # targets (no_regressions x output_dimensions)
+    def __init__(self, no_regressions: int, input_dimensions: int, output_dimensions: int, drag: int, initial_covariance: float = 1000.):
+        assert 0. < initial_covariance
+        if drag == 0:
+            # smear with zero drag follows the latest sample only, which has no least squares solution
+            raise ValueError("Recursive least squares needs a non-zero drag, use LinearRegressor to follow the latest sample.")
+        self._drag = drag
+        self._no_regressions = no_regressions
+        self._input_dimensions = input_dimensions
+        self._output_dimensions = output_dimensions
+        self._forgetting = 1. if drag < 0 else drag / (drag + 1.)             # same weight of the past as smear, negative drag does not fit
+        self._max_trace = initial_covariance * (input_dimensions + 1)
+
+        self._weights = numpy.zeros((no_regressions, input_dimensions + 1, output_dimensions))     # last row is the offset
+        self._covariance = numpy.tile(numpy.identity(input_dimensions + 1) * initial_covariance, (no_regressions, 1, 1))
+        self._mean_y = numpy.zeros((no_regressions, output_dimensions))
+        self._var_y = numpy.zeros((no_regressions, output_dimensions))
+        self._iterations = 0
+
+    def _augmented(self, x: numpy.ndarray) -> numpy.ndarray:
+        x = numpy.asarray(x, dtype=float)
+        assert x.shape == (self._no_regressions, self._input_dimensions)
+        augmented = numpy.empty((self._no_regressions, self._input_dimensions + 1))
+        augmented[:, :-1] = x
+        augmented[:, -1] = 1.
+        return augmented
+
+    def get_parameters(self) -> numpy.ndarray:
+        # no_regressions x (input_dimensions + 1) x output_dimensions, offsets in the last row
+        return self._weights
+
+    def get_variances(self) -> numpy.ndarray:
+        return self._var_y
+
+    def fit(self, x: numpy.ndarray, y: numpy.ndarray):
+        target = numpy.asarray(y, dtype=float)
+        assert target.shape == (self._no_regressions, self._output_dimensions)
+        if self._drag < 0:
+            return
+
+        augmented = self._augmented(x)
+
+        dy = target - self._mean_y
+        self._var_y = smear(self._var_y, dy ** 2., self._drag)
+        if 0 >= self._iterations:
+            self._mean_y = target
+        self._mean_y = smear(self._mean_y, target, self._drag)
+
+        projected = numpy.einsum("nij,nj->ni", self._covariance, augmented)
+        gain = projected / (self._forgetting + numpy.einsum("ni,ni->n", augmented, projected))[:, None]
+        error = target - numpy.einsum("ni,nio->no", augmented, self._weights)
+        self._weights += gain[:, :, None] * error[:, None, :]
+        self._covariance -= gain[:, :, None] * projected[:, None, :]
+        self._covariance /= self._forgetting
+        # rounding makes the covariance asymmetric, it then loses definiteness and the weights diverge
+        self._covariance = (self._covariance + self._covariance.transpose(0, 2, 1)) / 2.
+
+        trace = numpy.trace(self._covariance, axis1=1, axis2=2)
+        wound_up = self._max_trace < trace
+        if numpy.any(wound_up):
+            # prevent covariance wind-up in directions without excitation
+            self._covariance[wound_up] *= (self._max_trace / trace[wound_up])[:, None, None]
+
+        self._iterations += 1
+
+    def output(self, x: numpy.ndarray) -> numpy.ndarray:
+        return numpy.einsum("ni,nio->no", self._augmented(x), self._weights)
+
+
+def plot_surface(axis: "pyplot.Axes.axes", _fun: Callable[[float, float], float], dim_range: Tuple[float, float], colormap=None):
     _x = numpy.linspace(dim_range[0], dim_range[1], endpoint=True, num=int(dim_range[1] - dim_range[0]))
     _y = numpy.linspace(dim_range[0], dim_range[1], endpoint=True, num=int(dim_range[1] - dim_range[0]))
     _z = tuple(_fun(__x, __y) for __x, __y in zip(_x, _y))
@@ -176,7 +445,7 @@ def plot_surface(axis: pyplot.Axes.axes, _fun: Callable[[float, float], float],
     return axis.plot_surface(_X, _Y, _Z, alpha=.2, antialiased=False, cmap=colormap)
 
 
-def plot_line(axis: pyplot.Axes.axes, _coefficients: Sequence[float], dim_range: Tuple[float, float], color: Optional[str] = None):
+def plot_line(axis: "pyplot.Axes.axes", _coefficients: Sequence[float], dim_range: Tuple[float, float], color: Optional[str] = None):
     _X = numpy.linspace(dim_range[0], dim_range[1], endpoint=True, num=int(dim_range[1] - dim_range[0]))
     _Z = tuple(sum(_c * _x ** _i for _i, _c in enumerate(_coefficients)) for _x in _X)
 
@@ -195,6 +464,7 @@ def trig_function() -> Callable[[float, float], float]:
 
 
 def test_2d():
+    from matplotlib import pyplot
     fig = pyplot.figure()
     plot_axis = fig.add_subplot(211)
     plot_axis.set_xlabel("x")
@@ -268,6 +538,8 @@ def test_2d():
 
 
 def test_3d():
+    from matplotlib import pyplot, cm
+    from mpl_toolkits.mplot3d import Axes3D
     fig = pyplot.figure()
     axis_3d = fig.add_subplot(221, projection='3d')
     axis_3d.set_xlabel("x")
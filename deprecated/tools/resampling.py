@@ -0,0 +1,78 @@
+# coding=utf-8
+import itertools
+from typing import Generator, Iterable, Optional, Sequence, Tuple
+
+import numpy
+
+BLOCK = Tuple[numpy.ndarray, numpy.ndarray]
+BLOCK_SIZE = 1 << 12
+
+
+class EquiSampler:
+    # linear interpolation onto the grid first timestamp + k * target delta, fed block by block.
+    # the last sample and the next grid index carry over, so blocks can be split anywhere.
+    def __init__(self, target_delta: float):
+        if not 0 < target_delta:
+            raise ValueError("Target delta must be positive.")
+        self._delta = target_delta                      # type: float
+        self._origin = None                             # type: Optional[float]
+        self._next_step = 0                             # type: int
+        self._last_time = None                          # type: Optional[float]
+        self._last_value = None                         # type: Optional[float]
+
+    def feed(self, time_stamps: numpy.ndarray, values: numpy.ndarray) -> BLOCK:
+        time_stamps = numpy.asarray(time_stamps, dtype=float)
+        values = numpy.asarray(values, dtype=float)
+        assert time_stamps.shape == values.shape
+        if len(time_stamps) < 1:
+            return numpy.empty(0), numpy.empty(0)
+
+        if self._origin is None:
+            self._origin = time_stamps[0]
+        else:
+            time_stamps = numpy.concatenate(([self._last_time], time_stamps))
+            values = numpy.concatenate(([self._last_value], values))
+        self._last_time = time_stamps[-1]
+        self._last_value = values[-1]
+
+        last_step = int((time_stamps[-1] - self._origin) // self._delta)
+        steps = numpy.arange(self._next_step, last_step + 1)
+        self._next_step = max(self._next_step, last_step + 1)
+
+        grid = self._origin + steps * self._delta
+        return grid, numpy.interp(grid, time_stamps, values)
+
+
+def equisample_blocks(blocks: Iterable[BLOCK], target_delta: float) -> Generator[BLOCK, None, None]:
+    sampler = EquiSampler(target_delta)
+    for each_time_stamps, each_values in blocks:
+        grid, sampled = sampler.feed(each_time_stamps, each_values)
+        if 0 < len(grid):
+            yield grid, sampled
+
+
+def sample_blocks(iterator: Iterable[Tuple[float, float]], block_size: int = BLOCK_SIZE) -> Generator[BLOCK, None, None]:
+    # groups (time stamp, value) pairs into array blocks
+    iterator = iter(iterator)
+    while True:
+        chunk = list(itertools.islice(iterator, block_size))
+        if len(chunk) < 1:
+            break
+        yield numpy.array(chunk, dtype=float).T
+        if len(chunk) < block_size:
+            break
+
+
+def align_series(series: Sequence[BLOCK], target_delta: float, start: Optional[float] = None, end: Optional[float] = None) -> BLOCK:
+    # one shared grid over the common time range of all series, (no_series x no_steps) values
+    if not 0 < target_delta:
+        raise ValueError("Target delta must be positive.")
+    common_start = max(float(_t[0]) for _t, _ in series) if start is None else start
+    common_end = min(float(_t[-1]) for _t, _ in series) if end is None else end
+    no_steps = max(0, int((common_end - common_start) // target_delta) + 1)
+    grid = common_start + numpy.arange(no_steps) * target_delta
+
+    aligned = numpy.empty((len(series), no_steps))
+    for _i, (each_time_stamps, each_values) in enumerate(series):
+        aligned[_i] = numpy.interp(grid, each_time_stamps, each_values)
+    return grid, aligned
@@ -0,0 +1,75 @@
+# coding=utf-8
+from typing import Generic, TypeVar, Tuple, Iterator, Optional, Any
+
+import numpy
+from numpy.lib.stride_tricks import sliding_window_view
+
+TYPE_A = TypeVar("TYPE_A")
+
+
+class RingBuffer(Generic[TYPE_A]):
+    # every value is written twice, at its slot and at its slot plus capacity.
+    # the most recent values therefore always form one contiguous slice that can be returned as a view.
+    def __init__(self, capacity: int, dtype: Any = object, item_shape: Tuple[int, ...] = (), fill: Optional[TYPE_A] = None):
+        if capacity < 1:
+            raise ValueError("Capacity must be positive.")
+
+        self._capacity = capacity                                                       # type: int
+        self._buffer = numpy.empty((2 * capacity,) + tuple(item_shape), dtype=dtype)    # type: numpy.ndarray
+        self._head = 0                                                                  # type: int
+        self._size = 0                                                                  # type: int
+
+        if fill is not None:
+            self._buffer[:] = fill
+            self._size = capacity
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def is_full(self) -> bool:
+        return self._size >= self._capacity
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[TYPE_A]:
+        return iter(self.view().tolist())
+
+    def __getitem__(self, index):
+        return self.view()[index]
+
+    def __repr__(self) -> str:
+        return "{:s}({:s})".format(self.__class__.__name__, str(self.view().tolist()))
+
+    def append(self, value: TYPE_A):
+        self._buffer[self._head] = value
+        self._buffer[self._head + self._capacity] = value
+        self._head = (self._head + 1) % self._capacity
+        if self._size < self._capacity:
+            self._size += 1
+
+    def popleft(self) -> TYPE_A:
+        if self._size < 1:
+            raise IndexError("pop from empty buffer")
+        value = self._buffer[(self._head - self._size) % self._capacity]
+        self._size -= 1
+        return value
+
+    def clear(self):
+        self._size = 0
+
+    def view(self) -> numpy.ndarray:
+        # zero-copy, oldest value first. the view is overwritten by subsequent appends.
+        start = (self._head - self._size) % self._capacity
+        return self._buffer[start:start + self._size]
+
+    def as_tuple(self) -> Tuple[TYPE_A, ...]:
+        # hashable copy for use as a dictionary key
+        return tuple(self.view().tolist())
+
+
+def sliding_windows(values: numpy.ndarray, size: int) -> numpy.ndarray:
+    # zero-copy (N - size + 1, size, ...) view of all windows over the first axis
+    return numpy.moveaxis(sliding_window_view(values, size, axis=0), -1, 1)
+
@@ -0,0 +1,155 @@
+# coding=utf-8
+import datetime
+import json
+import os
+import tempfile
+from typing import Any, Callable, Dict, Generator, IO, Tuple
+
+import numpy
+from dateutil.tz import tzutc
+
+COLUMNS = "timestamp", "open", "high", "low", "close"
+INDEX_FILE = "index.json"
+BLOCK_SIZE = 1 << 16
+
+
+def _cache_dir(file_path: str) -> str:
+    return file_path + ".columns"
+
+
+def _source_signature(file_path: str) -> Dict[str, int]:
+    status = os.stat(file_path)
+    return {"size": status.st_size, "modified": status.st_mtime_ns}
+
+
+def _parse_source(file_path: str) -> Dict[str, numpy.ndarray]:
+    # tab separated binance klines, open time in milliseconds then ohlc
+    raw = numpy.loadtxt(file_path, delimiter="\t", usecols=range(len(COLUMNS)), dtype=float, ndmin=2)
+    columns = {_name: numpy.ascontiguousarray(raw[:, _i]) for _i, _name in enumerate(COLUMNS)}
+    columns["timestamp"] = columns["timestamp"].astype(numpy.int64)
+    return columns
+
+
+def replace_file(path: str, write: Callable[[IO[Any]], None], binary: bool = True):
+    # readers see the old file or the complete new one, memory maps of the old file stay valid
+    handle, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(handle, mode="wb" if binary else "w") as file:
+            write(file)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+
+def _write_cache(file_path: str, columns: Dict[str, numpy.ndarray]):
+    cache_dir = _cache_dir(file_path)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # invalid until the new index is in place, an interrupted conversion is repeated
+    index_path = os.path.join(cache_dir, INDEX_FILE)
+    if os.path.exists(index_path):
+        os.remove(index_path)
+
+    for each_name, each_column in columns.items():
+        replace_file(os.path.join(cache_dir, each_name + ".npy"), lambda _file, _column=each_column: numpy.save(_file, _column))
+
+    timestamps = columns["timestamp"]
+    index = dict(_source_signature(file_path), rows=len(timestamps))
+    if 0 < len(timestamps):
+        index["first"] = int(timestamps[0])
+        index["last"] = int(timestamps[-1])
+
+    replace_file(index_path, lambda _file: json.dump(index, _file), binary=False)
+
+
+def _read_cache(file_path: str) -> Dict[str, numpy.ndarray]:
+    # empty if the cache is missing, outdated or incomplete
+    cache_dir = _cache_dir(file_path)
+    try:
+        with open(os.path.join(cache_dir, INDEX_FILE), mode="r") as file:
+            index = json.load(file)
+    except (OSError, ValueError):
+        return dict()
+
+    signature = _source_signature(file_path)
+    if any(index.get(_key) != _value for _key, _value in signature.items()):
+        return dict()
+
+    if index["rows"] < 1:
+        return {_name: numpy.empty(0, dtype=numpy.int64 if _name == "timestamp" else float) for _name in COLUMNS}
+
+    try:
+        columns = {_name: numpy.load(os.path.join(cache_dir, _name + ".npy"), mmap_mode="r") for _name in COLUMNS}
+    except (OSError, ValueError):
+        return dict()
+
+    if any(each_column.shape != (index["rows"],) for each_column in columns.values()):
+        return dict()
+    return columns
+
+
+def load_columns(file_path: str) -> Dict[str, numpy.ndarray]:
+    # memory mapped columns of the source, converted once and refreshed when the source changes
+    columns = _read_cache(file_path)
+    if 0 < len(columns):
+        return columns
+
+    print("Converting {:s} to columns...".format(file_path))
+    columns = _parse_source(file_path)
+    try:
+        _write_cache(file_path, columns)
+    except OSError as e:
+        print("Could not cache columns of {:s}: {:s}".format(file_path, str(e)))
+    return columns
+
+
+def select_range(timestamps: numpy.ndarray, file_path: str, start_timestamp: float = -1, end_timestamp: float = -1) -> Tuple[int, int]:
+    # row slice and range checks of the former line by line reader, timestamps in milliseconds
+    no_rows = len(timestamps)
+    if -1 < start_timestamp and 0 < no_rows and start_timestamp < timestamps[0] / 1000.:
+        first_ts = timestamps[0] / 1000.
+        first_date = datetime.datetime.fromtimestamp(first_ts, tz=tzutc())
+        start_time = datetime.datetime.fromtimestamp(start_timestamp, tz=tzutc())
+        msg = "Source {:s} starts after {:s} (ts {:f}) at {:s} (ts {:f})!"
+        raise ValueError(msg.format(file_path, str(start_time), start_timestamp, str(first_date), first_ts))
+
+    start_ms = numpy.float64(start_timestamp) * 1000.
+    end_ms = numpy.float64(end_timestamp) * 1000.
+
+    from_row = 0
+    if -1 < start_timestamp:
+        # rows up to start are skipped unless they already reached end
+        from_row = min(int(numpy.searchsorted(timestamps, start_ms, side="right")), int(numpy.searchsorted(timestamps, end_ms, side="left")))
+
+    to_row = no_rows
+    if -1 < end_timestamp:
+        to_row = int(numpy.searchsorted(timestamps, end_ms, side="right"))
+
+    last_ts = timestamps[to_row] / 1000. if to_row < no_rows else (timestamps[-1] / 1000. if 0 < no_rows else -1)
+    if last_ts < end_timestamp:
+        last_date = datetime.datetime.fromtimestamp(last_ts, tz=tzutc())
+        end_time = datetime.datetime.fromtimestamp(end_timestamp, tz=tzutc())
+        msg = "Source {:s} ends before {:s} (ts {:f}) at {:s} (ts {:f})!"
+        raise ValueError(msg.format(file_path, str(end_time), end_timestamp, str(last_date), last_ts))
+
+    return from_row, to_row
+
+
+def series_blocks(file_path: str, start_timestamp: float = -1, end_timestamp: float = -1,
+                  column: str = "close", block_size: int = BLOCK_SIZE) -> Generator[Tuple[numpy.ndarray, numpy.ndarray], None, None]:
+    # (timestamps in seconds, values) blocks of the selected time range
+    columns = load_columns(file_path)
+    timestamps = columns["timestamp"]
+    values = columns[column]
+    from_row, to_row = select_range(timestamps, file_path, start_timestamp=start_timestamp, end_timestamp=end_timestamp)
+
+    for _i in range(from_row, to_row, block_size):
+        _j = min(_i + block_size, to_row)
+        yield timestamps[_i:_j] / 1000., numpy.asarray(values[_i:_j], dtype=float)
+
+
+def series_values(file_path: str, start_timestamp: float = -1, end_timestamp: float = -1, column: str = "close") -> Generator[Tuple[float, float], None, None]:
+    print("Reading time series from {:s}...".format(file_path))
+    for each_timestamps, each_values in series_blocks(file_path, start_timestamp=start_timestamp, end_timestamp=end_timestamp, column=column):
+        yield from zip(each_timestamps.tolist(), each_values.tolist())
@@ -1,43 +1,240 @@
 # coding=utf-8
+import asyncio
+import threading
 import time
-from typing import TypeVar, Generator, Tuple, Iterator, Optional, Sequence
+from collections import deque
+from typing import TypeVar, Generator, Tuple, Iterator, Optional, Sequence, AsyncIterator, Any, List, Deque
 
 TYPE_A = TypeVar("TYPE_A")
 
+MAX_BUFFERED = 1024
+
 
 def merge_iterators(iterators: Sequence[Iterator[TYPE_A]]) -> Generator[Tuple[TYPE_A, ...], None, None]:
-    no_iterators = len(iterators)
-    while True:
-        yield_value = tuple(next(_it) for _it in iterators)
-        if len(yield_value) != no_iterators:
+    # ends with the shortest iterator
+    yield from zip(*iterators)
+
+
+class _FanOut:
+    # distributes the components of each source tuple to one queue per consumer. a consumer with an empty queue
+    # pulls the next tuple from the source unless another consumer still has max_buffered values queued.
+    # then it waits for that consumer if thread safe and raises BufferError otherwise.
+    # consumers that are closed no longer hold the others back and end right away. if the source raises, every
+    # consumer raises the same error once its queue is drained.
+    def __init__(self, source: Iterator[Tuple[TYPE_A, ...]], size: int, max_buffered: int, thread_safe: bool):
+        if size < 1 or max_buffered < 1:
+            raise ValueError("Size and buffer must be positive.")
+        self._source = source
+        self._size = size
+        self._max_buffered = max_buffered
+        self._queues = tuple(deque() for _ in range(size))                         # type: Tuple[Deque[TYPE_A], ...]
+        self._active = [True for _ in range(size)]                                  # type: List[bool]
+        self._finished = False
+        self._error = None                                                          # type: Optional[BaseException]
+        self._pulling = False
+        self._condition = threading.Condition() if thread_safe else None            # type: Optional[threading.Condition]
+
+    def _can_pull(self) -> bool:
+        return not self._pulling and all(len(_q) < self._max_buffered for _q, _a in zip(self._queues, self._active) if _a)
+
+    def _distribute(self, value: Tuple[TYPE_A, ...]):
+        if len(value) != self._size:
+            raise ValueError("Expected tuples of size {:d}, got {:d}.".format(self._size, len(value)))
+        for each_queue, each_active, each_component in zip(self._queues, self._active, value):
+            if each_active:
+                each_queue.append(each_component)
+
+    def _next(self) -> Tuple[bool, Any]:
+        try:
+            return True, next(self._source)
+        except StopIteration:
+            return False, None
+        except BaseException as e:
+            self._finished = True
+            self._error = e
+            raise
+
+    def _end(self) -> Tuple[bool, None]:
+        if self._error is not None:
+            raise self._error
+        return False, None
+
+    def get(self, index: int) -> Tuple[bool, Optional[TYPE_A]]:
+        # (False, None) once the source is exhausted and the queue drained
+        if self._condition is None:
+            return self._get(index)
+
+        queue = self._queues[index]
+        with self._condition:
+            while True:
+                if not self._active[index]:
+                    return False, None
+
+                if 0 < len(queue):
+                    value = queue.popleft()
+                    self._condition.notify_all()
+                    return True, value
+
+                if self._finished:
+                    return self._end()
+
+                if not self._can_pull():
+                    self._condition.wait()
+                    continue
+
+                # the source is read outside the lock, others keep draining their queues meanwhile
+                self._pulling = True
+                self._condition.release()
+                try:
+                    available, value = self._next()
+                finally:
+                    self._condition.acquire()
+                    self._pulling = False
+                    self._condition.notify_all()
+
+                if available:
+                    self._distribute(value)
+                else:
+                    self._finished = True
+
+    def _get(self, index: int) -> Tuple[bool, Optional[TYPE_A]]:
+        queue = self._queues[index]
+        if not self._active[index]:
+            return False, None
+        if len(queue) < 1:
+            if self._finished:
+                return self._end()
+            if not self._can_pull():
+                raise BufferError("Consumer {:d} is {:d} values ahead of the slowest consumer.".format(index, self._max_buffered))
+
+            available, value = self._next()
+            if not available:
+                self._finished = True
+                return False, None
+            self._distribute(value)
+
+        return True, queue.popleft()
+
+    def detach(self, index: int):
+        if self._condition is None:
+            self._active[index] = False
+            self._queues[index].clear()
+            return
+
+        with self._condition:
+            self._active[index] = False
+            self._queues[index].clear()
+            self._condition.notify_all()
+
+
+class _SubIterator(Iterator[TYPE_A]):
+    def __init__(self, index: int, fan_out: _FanOut):
+        self._index = index
+        self._fan_out = fan_out
+
+    def __iter__(self) -> Iterator[TYPE_A]:
+        return self
+
+    def __next__(self) -> TYPE_A:
+        available, value = self._fan_out.get(self._index)
+        if not available:
             raise StopIteration()
-        yield yield_value
+        return value
+
+    def close(self):
+        # stops buffering for this consumer
+        self._fan_out.detach(self._index)
+
+
+def split_iterator(source: Iterator[Tuple[TYPE_A, ...]], size: int, max_buffered: int = MAX_BUFFERED, thread_safe: bool = False) -> Tuple[Iterator[TYPE_A], ...]:
+    # iterator i yields component i of each source tuple. consumers can be up to max_buffered values apart,
+    # with thread_safe they can be advanced from different threads and block instead of raising.
+    fan_out = _FanOut(source, size, max_buffered, thread_safe)
+    return tuple(_SubIterator(_i, fan_out) for _i in range(size))
+
+
+def tee_iterator(source: Iterator[TYPE_A], size: int, max_buffered: int = MAX_BUFFERED, thread_safe: bool = False) -> Tuple[Iterator[TYPE_A], ...]:
+    # every iterator yields every source value, the source is read once
+    return split_iterator(((_x,) * size for _x in source), size, max_buffered=max_buffered, thread_safe=thread_safe)
+
+
+class _AsyncFanOut(_FanOut):
+    # _FanOut for asynchronous sources, consumers ahead of the slowest one wait
+    def __init__(self, source: AsyncIterator[Tuple[TYPE_A, ...]], size: int, max_buffered: int):
+        super().__init__(source, size, max_buffered, False)
+        self._condition = asyncio.Condition()
+
+    async def _anext(self) -> Tuple[bool, Any]:
+        try:
+            return True, await self._source.__anext__()
+        except StopAsyncIteration:
+            return False, None
+        except BaseException as e:
+            self._finished = True
+            self._error = e
+            raise
+
+    async def get(self, index: int) -> Tuple[bool, Optional[TYPE_A]]:
+        queue = self._queues[index]
+        async with self._condition:
+            while True:
+                if not self._active[index]:
+                    return False, None
+
+                if 0 < len(queue):
+                    value = queue.popleft()
+                    self._condition.notify_all()
+                    return True, value
+
+                if self._finished:
+                    return self._end()
+
+                if not self._can_pull():
+                    await self._condition.wait()
+                    continue
+
+                self._pulling = True
+                self._condition.release()
+                try:
+                    available, value = await self._anext()
+                finally:
+                    await self._condition.acquire()
+                    self._pulling = False
+                    self._condition.notify_all()
+
+                if available:
+                    self._distribute(value)
+                else:
+                    self._finished = True
+
+    async def detach(self, index: int):
+        async with self._condition:
+            self._active[index] = False
+            self._queues[index].clear()
+            self._condition.notify_all()
 
 
-# TODO: add buffer!
-def _next_value(source: Iterator[Tuple[TYPE_A, ...]], size: int) -> Generator[Tuple[TYPE_A, ...], Optional[int], None]:
-    checked = [False for _ in range(size)]
-    value = next(source)
-    while True:
-        index = yield value
-        if all(checked):
-            value = next(source)
-            for _i in range(len(checked)):
-                checked[_i] = False
-        checked[index] = True
+class _AsyncSubIterator(AsyncIterator[TYPE_A]):
+    def __init__(self, index: int, fan_out: _AsyncFanOut):
+        self._index = index
+        self._fan_out = fan_out
 
+    def __aiter__(self) -> AsyncIterator[TYPE_A]:
+        return self
 
-def _sub_iterator(index: int, callback: Generator[Tuple[TYPE_A, ...], int, None]) -> Generator[TYPE_A, None, None]:
-    while True:
-        value = callback.send(index)
-        yield value[index]
+    async def __anext__(self) -> TYPE_A:
+        available, value = await self._fan_out.get(self._index)
+        if not available:
+            raise StopAsyncIteration()
+        return value
 
+    async def aclose(self):
+        await self._fan_out.detach(self._index)
 
-def split_iterator(source: Iterator[Tuple[TYPE_A, ...]], size: int) -> Tuple[Generator[TYPE_A, Optional[TYPE_A], None], ...]:
-    _cb = _next_value(source, size)
-    _cb.send(None)
 
-    return tuple(_sub_iterator(_i, _cb) for _i in range(size))
+def async_split_iterator(source: AsyncIterator[Tuple[TYPE_A, ...]], size: int, max_buffered: int = MAX_BUFFERED) -> Tuple[AsyncIterator[TYPE_A], ...]:
+    fan_out = _AsyncFanOut(source, size, max_buffered)
+    return tuple(_AsyncSubIterator(_i, fan_out) for _i in range(size))
 
 
 if __name__ == "__main__":
@@ -8,7 +8,8 @@ from matplotlib.colors import hsv_to_rgb
 from matplotlib.dates import date2num
 from matplotlib.patches import Rectangle
 
-from tools.math_functions import distribute_circular, smoothing_generator
+from data_generation.data_processing import Smoothing
+from tools.math_functions import distribute_circular
 from tools.timer import Timer
 
 
@@ -136,8 +137,8 @@ class QualitativeEvaluationMultiSequence:
         fig, (ax1, ax2) = pyplot.subplots(2, sharex="all")
         s = 1000
         for _i, each_certainty in enumerate(self.certainties):
-            smooth_certainty = smoothing_generator(each_certainty, s)
-            ax1.plot(self.time_axis, list(smooth_certainty), label="certainty {:d} (smooth {:d})".format(_i, s))
+            smooth_certainty = Smoothing(s)(each_certainty)
+            ax1.plot(self.time_axis, smooth_certainty, label="certainty {:d} (smooth {:d})".format(_i, s))
 
             cumulative_error = []
             for each_error in self.errors[_i]:
@@ -262,8 +263,8 @@ class QualitativeEvaluationSingleSequence(ComparativeEvaluation):
 
     def _plot_certainty(self, ax1):
         s = 1000
-        smooth_certainty = smoothing_generator(self.certainties, s)
-        ax1.plot(self.time_axis, list(smooth_certainty), label="certainty (smooth {:d})".format(s), alpha=.3)
+        smooth_certainty = Smoothing(s)(self.certainties)
+        ax1.plot(self.time_axis, smooth_certainty, label="certainty (smooth {:d})".format(s), alpha=.3)
         ax1.set_ylabel("certainty")
         ax1.legend(loc="upper left")
 
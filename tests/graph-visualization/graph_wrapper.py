@@ -92,6 +92,11 @@ class GraphManager:
 
         self._message_listener: asyncio.Task | None = None
 
+        self._version = 0
+        self._client_version = -1
+        self._deltas: list[dict[str, any]] = []
+        # networkx.Graph is undirected, the frontend matches links by the orientation it first got them in
+        self._link_ends: dict[frozenset, tuple[Hashable, Hashable]] = dict()
 
     async def handle_messages(self) -> None:
         while True:
@@ -155,12 +160,104 @@ class GraphManager:
     async def sync_graph(self) -> None:
         # Sync graph data with the frontend
 
+        links = []
+        for u, v, a in self._graph.edges(data=True):
+            source_id, target_id = self._link_orientation(u, v)
+            links.append({**a, "source": source_id, "target": target_id})
+
         graph_data = GraphData(
-            nodes=[{"id": n, "label": str(n)} for n in self._graph.nodes()],
-            links=[{"source": u, "target": v} for u, v in self._graph.edges()]
+            nodes=[{"label": str(n), **a, "id": n} for n, a in self._graph.nodes(data=True)],
+            links=links
         )
         # return await self.set_graph_data(graph_data)
-        return await self._send_command("synchronizeGraph", [graph_data.nodes, graph_data.links], is_native=False)
+        self._deltas.clear()
+        self._version += 1
+        # the confirmed version, the next `apply_deltas` synchronizes again if the frontend did not get here
+        self._client_version = await self._send_command("synchronizeGraph", [graph_data.nodes, graph_data.links, self._version], is_native=False)
+
+    def _link_orientation(self, source_id: Hashable, target_id: Hashable) -> tuple[Hashable, Hashable]:
+        return self._link_ends.setdefault(frozenset((source_id, target_id)), (source_id, target_id))
+
+    # incremental updates
+    def queue_add_node(self, node_id: Hashable, **attributes: any) -> None:
+        """
+        Add a node, or merge attributes into an existing one, with the next `apply_deltas`.
+        """
+        self._graph.add_node(node_id, **attributes)
+        self._deltas.append({"op": "addNode", "node": {"label": str(node_id), **attributes, "id": node_id}})
+
+    def queue_update_node(self, node_id: Hashable, **attributes: any) -> None:
+        """
+        Merge attributes into an existing node with the next `apply_deltas`.
+        """
+        self._graph.nodes[node_id].update(attributes)
+        self._deltas.append({"op": "updateNode", "id": node_id, "attributes": attributes})
+
+    def queue_remove_node(self, node_id: Hashable) -> None:
+        """
+        Remove a node and its links with the next `apply_deltas`.
+        """
+        for each_neighbor in self._graph.neighbors(node_id):
+            self._link_ends.pop(frozenset((node_id, each_neighbor)), None)
+        self._graph.remove_node(node_id)
+        self._deltas.append({"op": "removeNode", "id": node_id})
+
+    def queue_add_link(self, source_id: Hashable, target_id: Hashable, **attributes: any) -> None:
+        """
+        Add a link, or merge attributes into an existing one, with the next `apply_deltas`.
+        """
+        if self._graph.has_edge(source_id, target_id):
+            self.queue_update_link(source_id, target_id, **attributes)
+            return
+
+        # the frontend drops links to nodes it does not know, announce the endpoints networkx creates implicitly
+        for each_node in (source_id, target_id):
+            if not self._graph.has_node(each_node):
+                self.queue_add_node(each_node)
+
+        self._graph.add_edge(source_id, target_id, **attributes)
+        source_id, target_id = self._link_orientation(source_id, target_id)
+        self._deltas.append({"op": "addLink", "link": {**attributes, "source": source_id, "target": target_id}})
+
+    def queue_update_link(self, source_id: Hashable, target_id: Hashable, **attributes: any) -> None:
+        """
+        Merge attributes into an existing link with the next `apply_deltas`.
+        """
+        self._graph.edges[source_id, target_id].update(attributes)
+        source_id, target_id = self._link_orientation(source_id, target_id)
+        self._deltas.append({"op": "updateLink", "source": source_id, "target": target_id, "attributes": attributes})
+
+    def queue_remove_link(self, source_id: Hashable, target_id: Hashable) -> None:
+        """
+        Remove a link with the next `apply_deltas`.
+        """
+        self._graph.remove_edge(source_id, target_id)
+        source_id, target_id = self._link_ends.pop(frozenset((source_id, target_id)), (source_id, target_id))
+        self._deltas.append({"op": "removeLink", "source": source_id, "target": target_id})
+
+    async def apply_deltas(self) -> None:
+        """
+        Send all queued changes as one versioned batch. The frontend applies the batch only on top of the version it
+        was computed for and confirms its resulting version. A frontend that fell behind, or a batch larger than the
+        graph itself, gets a full `sync_graph` instead.
+        """
+        if len(self._deltas) < 1:
+            return
+
+        if self._client_version != self._version or len(self._deltas) >= self._graph.number_of_nodes() + self._graph.number_of_edges():
+            await self.sync_graph()
+            return
+
+        deltas = list(self._deltas)
+        self._deltas.clear()
+        base_version = self._version
+        self._version += 1
+
+        client_version = await self._send_command("applyDeltas", [base_version, self._version, deltas], is_native=False)
+        self._client_version = client_version
+        if client_version != self._version:
+            print(f"Frontend at version {client_version} instead of {self._version}, resynchronizing...")
+            await self.sync_graph()
 
     # initialization
     async def initialize_graph(self, config_options: ConfigOptions | None = None) -> None:
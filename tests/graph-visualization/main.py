@@ -33,15 +33,18 @@ async def main(websocket: WebSocket) -> None:
     for i in range(50):
         await asyncio.sleep(1)
         nodes = list(graph_manager._graph.nodes)
-        await graph_manager.add_node({"Label": f"Node {i}"}, node_id=i)
+        graph_manager.queue_add_node(i, Label=f"Node {i}")
 
         if i >= 1:
             random_node = random.choice(nodes)
             print(f"Adding link from {random_node} to {i}")
-            await graph_manager.add_link(random_node, i)
+            graph_manager.queue_add_link(random_node, i)
 
             if random.random() < .5:
-                await graph_manager.remove_node(i)
+                graph_manager.queue_remove_node(i)
+
+        # one batch per tick
+        await graph_manager.apply_deltas()
 
     await graph_manager.close()
 
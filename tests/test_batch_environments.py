@@ -0,0 +1,134 @@
+import math
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from _framework.systems.tasks.rational.resources.batch_environments import BatchContinuousMountainCar, BatchInfiniteCartPole, BatchMountainCar
+
+import numpy
+
+
+# the single environment steps, copied without gym
+
+
+def _cart_pole_step(state, action: float, kinematics_integrator: str):
+    gravity, mass_pole, total_mass, length, tau = 9.8, .1, 1.1, .5, .02
+    pole_mass_length = mass_pole * length
+    x_pos, x_vel, theta_ang, theta_vel = state
+    force = 10. * action
+    cos_theta = math.cos(theta_ang)
+    sin_theta = math.sin(theta_ang)
+    temp = (force + pole_mass_length * theta_vel * theta_vel * sin_theta) / total_mass
+    theta_acc = (gravity * sin_theta - cos_theta * temp) / (length * (4. / 3. - mass_pole * cos_theta * cos_theta / total_mass))
+    x_acc = temp - pole_mass_length * theta_acc * cos_theta / total_mass
+
+    if kinematics_integrator == "euler":
+        x_pos += tau * x_vel
+        x_vel += tau * x_acc
+        theta_ang += tau * theta_vel
+        theta_vel += tau * theta_acc
+    else:
+        x_vel += tau * x_acc
+        x_pos += tau * x_vel
+        theta_vel += tau * theta_acc
+        theta_ang += tau * theta_vel
+
+    theta_vel *= .99
+    x_vel = min(max(x_vel, -10.), 10.)
+    if x_pos < -2.4:
+        x_pos += 4.8
+    elif 2.4 < x_pos:
+        x_pos += -4.8
+
+    reward = abs(abs(theta_ang % (2. * math.pi)) - math.pi) / math.pi - 1.
+    return (x_pos, x_vel, theta_ang, theta_vel), reward, False
+
+
+def _continuous_mountain_car_step(state, action: float):
+    position, velocity = state
+    force = min(max(action, -1.), 1.)
+    velocity += force * .0015 - .0025 * math.cos(3. * position)
+    velocity = min(max(velocity, -.07), .07)
+    position += velocity
+    position = min(max(position, -1.2), .6)
+    if position == -1.2 and velocity < 0.:
+        velocity = 0.
+    done = position >= .45
+    reward = (100. if done else 0.) - math.pow(action, 2) * .1
+    return (position, velocity), reward, done
+
+
+def _mountain_car_step(state, action: float):
+    location, velocity = state
+    force = action + -float(numpy.sign(location)) * (-math.cos(location * 2.) + 1.) / 2.
+    velocity = (velocity + force / 100.) * .999
+    location += velocity
+    if location >= math.pi:
+        location += -2. * math.pi
+    elif -math.pi >= location:
+        location = 2. * math.pi - location
+    reward = (-math.cos(location) + 1.) / 2. - 1.
+    return (location, velocity), reward, False
+
+
+def _actions(random_state: numpy.random.Generator, states: numpy.ndarray) -> numpy.ndarray:
+    # random actions for half the environments, pushing along the velocity for the others so that they reach the goal or wrap
+    actions = random_state.uniform(-1., 1., size=(len(states), 1))
+    actions[::2, 0] = numpy.where(0. <= states[::2, 1], 1., -1.)
+    return actions
+
+
+class TestBatchEnvironments(unittest.TestCase):
+
+    def _compare(self, batch, step, no_steps: int, **kwargs) -> int:
+        # number of finished environments over all steps, or of wrapped ones for the mountain car
+        random_state = numpy.random.default_rng(11)
+        states = batch.state.copy()
+        expected_states = [tuple(_s) for _s in states.tolist()]
+        no_done = 0
+        for _ in range(no_steps):
+            actions = _actions(random_state, states)
+            states, rewards, done = batch.step(actions)
+            expected = [step(_s, _a, **kwargs) for _s, _a in zip(expected_states, actions[:, 0].tolist())]
+            expected_states = [_s for _s, _, _ in expected]
+            numpy.testing.assert_allclose(states, expected_states, rtol=1e-12, atol=1e-12)
+            numpy.testing.assert_allclose(rewards, [_r for _, _r, _ in expected], rtol=1e-12, atol=1e-12)
+            self.assertEqual(done.tolist(), [_d for _, _, _d in expected])
+            no_done += int(done.sum()) + int(numpy.sum(getattr(batch, "at_top", 0)))
+        return no_done
+
+    def test_cart_pole(self):
+        for each_integrator in ("euler", "semi-implicit"):
+            self._compare(BatchInfiniteCartPole(8, kinematics_integrator=each_integrator), _cart_pole_step, 2000, kinematics_integrator=each_integrator)
+
+    def test_continuous_mountain_car(self):
+        batch = BatchContinuousMountainCar(8, random_state=numpy.random.default_rng(12))
+        self.assertTrue(numpy.all((-.6 <= batch.state[:, 0]) & (batch.state[:, 0] <= -.4)))
+        self.assertLess(0, self._compare(batch, _continuous_mountain_car_step, 2000))
+
+    def test_mountain_car(self):
+        self.assertLess(0, self._compare(BatchMountainCar(8), _mountain_car_step, 2000))
+
+    def test_reset_mask(self):
+        batch = BatchInfiniteCartPole(4)
+        batch.step(numpy.ones((4, 1)))
+        stepped = batch.state.copy()
+        mask = numpy.array([True, False, True, False])
+        states = batch.reset(mask)
+        numpy.testing.assert_array_equal(states[mask], [[0., 0., math.pi, 0.]] * 2)
+        numpy.testing.assert_array_equal(states[~mask], stepped[~mask])
+
+    def test_bad_actions(self):
+        for each_batch in (BatchInfiniteCartPole(3), BatchContinuousMountainCar(3), BatchMountainCar(3)):
+            with self.assertRaises(ValueError):
+                each_batch.step(numpy.zeros((2, 1)))
+            with self.assertRaises(ValueError):
+                each_batch.step(numpy.zeros(3))
+        with self.assertRaises(ValueError):
+            BatchInfiniteCartPole(3).step(numpy.full((3, 1), 1.5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from _framework.systems.tasks.nominal.implementations.grid_world.resources.batch_grid_world import BatchGridWorld
+from _framework.systems.tasks.nominal.implementations.grid_world.resources.grid_world import GridWorldGlobal, GridWorldLocal
+
+import numpy
+
+
+# open borders so that agents wrap around
+GRID = (
+    "..x....x.",
+    ".s..x..2.",
+    "x...x....",
+    "..0...x..",
+    "...x...1x",
+    ".x.......",
+)
+
+
+class TestBatchGridWorld(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, "grid.txt")
+        with open(self.file_path, mode="w") as file:
+            file.write("\n".join(GRID) + "\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _compare(self, rotational: bool, local: bool):
+        random_state = numpy.random.default_rng(8)
+        batch = BatchGridWorld(self.file_path, 6, rotational=rotational, local=local)
+        worlds = [(GridWorldLocal if local else GridWorldGlobal)(self.file_path, rotational=rotational) for _ in range(6)]
+
+        motors = None
+        for _ in range(2000):
+            sensors, rewards = batch.react_to_batch(None if motors is None else batch.encode_motors(motors))
+            expected = [_w.react_to(None if motors is None else _m) for _w, _m in zip(worlds, motors or [None] * 6)]
+            self.assertEqual(rewards.tolist(), [_r for _, _r in expected])
+            if local:
+                self.assertEqual([tuple("x" if _s else "." for _s in _p) for _p in sensors.tolist()], [_s for _s, _ in expected])
+            else:
+                self.assertEqual([((_x, _y), _o, _g) for _x, _y, _o, _g in sensors.tolist()], [_s for _s, _ in expected])
+            motors = [batch.motor_space[_i] for _i in random_state.integers(0, 4, size=6)]
+
+    def test_rotational_local(self):
+        self._compare(True, True)
+
+    def test_rotational_global(self):
+        self._compare(True, False)
+
+    def test_transitional_local(self):
+        self._compare(False, True)
+
+    def test_transitional_global(self):
+        self._compare(False, False)
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            BatchGridWorld(self.file_path, 0)
+        batch = BatchGridWorld(self.file_path, 3)
+        with self.assertRaises(ValueError):
+            batch.react_to_batch(numpy.zeros(2, dtype=int))
+
+
+if __name__ == '__main__':
+    unittest.main()
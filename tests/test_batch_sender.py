@@ -0,0 +1,52 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from _framework.visualization_server.send_data import BatchSender
+from tools.logger import Logger
+
+
+class TestBatchSender(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.dir_path = Logger.dir_path
+        Logger.dir_path = self.directory + "/"
+        # nothing listens on port 9 of localhost
+        self.sender = BatchSender(url="http://127.0.0.1:9/", interval_secs=60.)
+
+    def tearDown(self):
+        self.sender.close()
+        Logger.dir_path = self.dir_path
+        shutil.rmtree(self.directory)
+
+    def test_connection_error_is_counted(self):
+        self.sender.put(0, [("error", "train", [1.])])
+        self.sender.put(1, [("error", "train", [2.])])
+        self.assertTrue(self.sender.flush(timeout=10.))
+        self.assertEqual(self.sender.no_failed, 2)
+
+    def test_any_error_releases_flush(self):
+        self.sender.put(0, [("error", "train", [object()])])
+        self.assertTrue(self.sender.flush(timeout=10.))
+        self.assertEqual(self.sender.no_failed, 1)
+
+        self.sender.put(1, [("error", "train", [1.])])
+        self.assertTrue(self.sender.flush(timeout=10.))
+        self.assertEqual(self.sender.no_failed, 2)
+
+    def test_oldest_iterations_are_dropped(self):
+        sender = BatchSender(url="http://127.0.0.1:9/", interval_secs=60., max_pending=3)
+        for _i in range(5):
+            sender.put(_i, [("error", "train", [float(_i)])])
+        self.assertEqual(sender.no_dropped, 2)
+        self.assertEqual(list(sender._pending), [2, 3, 4])
+        sender.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
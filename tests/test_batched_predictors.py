@@ -0,0 +1,85 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from _framework.systems.predictors.rational.implementations.rational_average_predictor import RationalAverage
+from _framework.systems.predictors.rational.implementations.rational_regression_predictor import RationalLinearRegression
+from tools.functionality import smear
+from tools.regression_experiments import BatchRecursiveLeastSquares, LinearRegressor, RecursiveLeastSquares
+
+import numpy
+
+
+class _PerOutputRegression:
+    # the baseline RationalLinearRegression, one LinearRegressor per state and output
+    def __init__(self, no_states: int, history_length: int, input_dimensions: int, output_dimensions: int, drag: int):
+        self._regressions = tuple(tuple(LinearRegressor(input_dimensions * history_length, drag) for _ in range(output_dimensions)) for _ in range(no_states))
+
+    def predict(self, data_in):
+        data_out = []
+        for _regression_array, _input_history in zip(self._regressions, data_in):
+            _flat_input = tuple(_value for _vector in _input_history for _value in _vector)
+            data_out.append(tuple(_each_regressor.output(_flat_input) for _each_regressor in _regression_array))
+        return tuple(data_out)
+
+    def fit(self, data_in, data_out):
+        for _regression_array, _input_history, _each_target in zip(self._regressions, data_in, data_out):
+            _flat_input = tuple(_value for _vector in _input_history for _value in _vector)
+            for _each_regressor, _target_value in zip(_regression_array, _each_target):
+                _each_regressor.fit(_flat_input, _target_value)
+
+
+class TestBatchedPredictors(unittest.TestCase):
+
+    def setUp(self):
+        random_state = numpy.random.default_rng(7)
+        # 300 steps, 5 states, history of 2 with 3 dimensions, 2 outputs
+        self.inputs = random_state.normal(size=(300, 5, 2, 3))
+        self.targets = numpy.einsum("tshi,hio->tso", self.inputs, random_state.normal(size=(2, 3, 2))) + random_state.normal(scale=.1, size=(300, 5, 2))
+
+    def test_batch_rls_like_separate(self):
+        for each_drag in (50, 500):
+            batch = BatchRecursiveLeastSquares(5, 6, 2, each_drag)
+            separate = [RecursiveLeastSquares(6, 2, each_drag) for _ in range(5)]
+            for each_inputs, each_targets in zip(self.inputs.reshape(300, 5, 6), self.targets):
+                expected = numpy.array([_r.output(_x) for _r, _x in zip(separate, each_inputs)])
+                numpy.testing.assert_allclose(batch.output(each_inputs), expected, rtol=1e-9, atol=1e-9)
+                batch.fit(each_inputs, each_targets)
+                for each_regression, each_input, each_target in zip(separate, each_inputs, each_targets):
+                    each_regression.fit(each_input, each_target)
+
+    def test_linear_regression_like_baseline(self):
+        for each_drag in (0, 50):
+            predictor, reference = RationalLinearRegression(5, 2, 3, 2, each_drag), _PerOutputRegression(5, 2, 3, 2, each_drag)
+            for each_inputs, each_targets in zip(self.inputs, self.targets):
+                tuple_inputs = tuple(tuple(map(tuple, _h)) for _h in each_inputs.tolist())
+                tuple_targets = tuple(map(tuple, each_targets.tolist()))
+                # python squares with pow and numpy by multiplying, they differ in the last bit at times
+                numpy.testing.assert_allclose(predictor.predict(tuple_inputs), reference.predict(tuple_inputs), rtol=1e-9, atol=1e-9)
+                predictor.fit(tuple_inputs, tuple_targets)
+                reference.fit(tuple_inputs, tuple_targets)
+
+    def test_arrays_like_tuples(self):
+        for each_class, each_args in ((RationalLinearRegression, (5, 2, 3, 2, 50)), (RationalAverage, (5, 3, 2, 50))):
+            tuple_predictor, array_predictor = each_class(*each_args), each_class(*each_args)
+            for each_inputs, each_targets in zip(self.inputs, self.targets):
+                tuple_inputs = tuple(tuple(map(tuple, _h)) for _h in each_inputs.tolist())
+                outputs = array_predictor.predict(each_inputs)
+                self.assertIsInstance(outputs, numpy.ndarray)
+                self.assertEqual(tuple(map(tuple, outputs.tolist())), tuple_predictor.predict(tuple_inputs))
+                array_predictor.fit(each_inputs, each_targets)
+                tuple_predictor.fit(tuple_inputs, tuple(map(tuple, each_targets.tolist())))
+
+    def test_average(self):
+        predictor = RationalAverage(5, 3, 2, 10)
+        expected = numpy.zeros((5, 2))
+        for each_inputs, each_targets in zip(self.inputs, self.targets):
+            predictor.fit(each_inputs, each_targets)
+            expected = smear(expected, each_targets, 10)
+        numpy.testing.assert_allclose(predictor.predict(self.inputs[0]), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from itertools import islice
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from data_generation.data_processing import Difference, MinMaxNormalization, Smoothing, ZScoreNormalization, difference, equisample, my_normalization, process_blocks, series_generator, smear_blocks, zscore_normalization
+from data_generation.data_sources.sequences.non_interactive import sequence_rational_crypto
+from tools.math_functions import smoothing_generator
+
+import numpy
+
+
+class TestBlockStages(unittest.TestCase):
+
+    def setUp(self):
+        random_state = numpy.random.default_rng(3)
+        self.values = numpy.cumsum(random_state.normal(size=20000)) + 50.
+        self.blocks = numpy.array_split(self.values, numpy.sort(random_state.integers(0, len(self.values), size=30)))
+
+    def _processed(self, stage) -> numpy.ndarray:
+        return numpy.concatenate(list(process_blocks(self.blocks, stage)))
+
+    def test_smear_is_recurrence(self):
+        average = 2.
+        expected = []
+        for each_value in self.values[:5000].tolist():
+            average = (average * 100 + each_value) / 101.
+            expected.append(average)
+        numpy.testing.assert_array_equal(smear_blocks(self.values[:5000], 100, 2.), expected)
+
+    def test_smoothing(self):
+        for each_drag in (0, 1, 10, 1000):
+            expected = list(smoothing_generator(self.values.tolist(), each_drag))
+            numpy.testing.assert_array_equal(self._processed(Smoothing(each_drag)), expected)
+
+    def test_zscore_normalization(self):
+        for each_drag in (0, 1, 10, 1000):
+            expected = numpy.array(list(zscore_normalization(iter(self.values.tolist()), each_drag)))
+            numpy.testing.assert_array_equal(self._processed(ZScoreNormalization(each_drag)), expected)
+
+    def test_long_zscore_normalization(self):
+        # deviations cross zero many times on a long random walk
+        values = numpy.cumsum(numpy.random.default_rng(5).normal(size=200000))
+        blocks = [values[_i:_i + 4096] for _i in range(0, len(values), 4096)]
+        for each_drag in (10, 1000):
+            expected = numpy.array(list(zscore_normalization(iter(values.tolist()), each_drag)))
+            numpy.testing.assert_array_equal(numpy.concatenate(list(process_blocks(blocks, ZScoreNormalization(each_drag)))), expected)
+
+    def test_min_max_normalization(self):
+        expected = list(my_normalization(iter(self.values.tolist()), 10))
+        self.assertEqual(self._processed(MinMaxNormalization(10)).tolist(), expected)
+
+    def test_difference(self):
+        expected = list(difference(iter(self.values.tolist())))
+        self.assertEqual(self._processed(Difference()).tolist(), expected)
+
+
+class TestCryptoSequence(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.source = os.path.join(self.directory, "klines.tsv")
+        random_state = numpy.random.default_rng(4)
+        timestamp = 0
+        with open(self.source, mode="w") as file:
+            for _i in range(500):
+                timestamp += 60000 * int(random_state.integers(1, 4))
+                file.write("{:d}\t0\t0\t0\t{:f}\t0\n".format(timestamp, 10. + random_state.normal()))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_same_values_as_equisample(self):
+        expected = [_v for _, _v in equisample(series_generator(self.source), 120)]
+        self.assertEqual(list(islice(sequence_rational_crypto(self.source, 120), len(expected))), expected)
+
+    def test_stages(self):
+        expected = list(zscore_normalization(difference(_v for _, _v in equisample(series_generator(self.source), 120)), 10))
+        values = list(islice(sequence_rational_crypto(self.source, 120, stages=(Difference(), ZScoreNormalization(10))), len(expected)))
+        self.assertEqual(values, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
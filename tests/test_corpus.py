@@ -0,0 +1,86 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from tools import corpus
+from tools.corpus import corpus_characters, encode_corpus, load_corpus
+
+import numpy
+
+
+TEXT = "The Nameless City, 1921!\nWhen I drew nigh the nameless city # I knew it was accursed.\n"
+
+
+class TestCorpus(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, "text.txt")
+        self._write(TEXT * 50)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, text: str, modified: int = 10 ** 18):
+        with open(self.file_path, mode="w") as file:
+            file.write(text)
+        os.utime(self.file_path, ns=(modified, modified))
+
+    @staticmethod
+    def _expected(text: str) -> str:
+        return "".join(corpus._nominal(text))
+
+    def test_encode_and_load(self):
+        symbols, alphabet = encode_corpus(self.file_path)
+        self.assertEqual("".join(alphabet[_s] for _s in symbols.tolist()), self._expected(TEXT * 50))
+        loaded, loaded_alphabet = load_corpus(self.file_path)
+        self.assertIsInstance(loaded, numpy.memmap)
+        self.assertEqual(loaded_alphabet, alphabet)
+        numpy.testing.assert_array_equal(loaded, symbols)
+        self.assertEqual("".join(corpus_characters(self.file_path)), self._expected(TEXT * 50))
+
+    def test_unchanged_text_is_not_hashed(self):
+        load_corpus(self.file_path)
+        with mock.patch.object(corpus, "_content_hash", wraps=corpus._content_hash) as content_hash:
+            for _ in range(3):
+                load_corpus(self.file_path)
+            self.assertEqual(content_hash.call_count, 0)
+
+            # touched but the same text, hashed once and not encoded again
+            os.utime(self.file_path, ns=(2 * 10 ** 18, 2 * 10 ** 18))
+            with mock.patch.object(corpus, "encode_corpus") as encode:
+                load_corpus(self.file_path)
+                load_corpus(self.file_path)
+                self.assertEqual(encode.call_count, 0)
+            self.assertEqual(content_hash.call_count, 1)
+
+    def test_encoded_again_on_change(self):
+        old_symbols, old_alphabet = load_corpus(self.file_path)
+        old_text = "".join(old_alphabet[_s] for _s in old_symbols.tolist())
+
+        # same size, only the modification time tells that the text changed
+        self._write("x" + (TEXT * 50)[1:], modified=3 * 10 ** 18)
+        symbols, alphabet = load_corpus(self.file_path)
+        self.assertEqual("".join(alphabet[_s] for _s in symbols.tolist()), self._expected("x" + (TEXT * 50)[1:]))
+        # the earlier memory map still reads the old symbols
+        self.assertEqual("".join(old_alphabet[_s] for _s in old_symbols.tolist()), old_text)
+        self.assertEqual([_f for _f in os.listdir(self.directory) if _f.endswith(".tmp")], [])
+
+    def test_empty_text(self):
+        self._write("")
+        symbols, alphabet = load_corpus(self.file_path)
+        self.assertEqual((len(symbols), alphabet), (0, ""))
+        self.assertEqual(len(load_corpus(self.file_path)[0]), 0)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            encode_corpus(self.file_path, mode="lower")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from _framework.visualization_server.downsampling import MultiResolutionSeries
+
+import numpy
+
+
+class TestMultiResolutionSeries(unittest.TestCase):
+
+    def setUp(self):
+        random_state = numpy.random.default_rng(14)
+        # three series ordered at every point, like the quantile bands of a plot
+        self.y = numpy.sort(numpy.cumsum(random_state.normal(size=(1003, 3)), axis=0), axis=1)
+        self.x = numpy.arange(1003, dtype=float)
+
+    def _series(self, fan_out: int = 4, capacity: int = 64) -> MultiResolutionSeries:
+        series = MultiResolutionSeries(3, fan_out=fan_out, capacity=capacity)
+        for each_x, each_y in zip(self.x.tolist(), self.y.tolist()):
+            series.append(each_x, each_y)
+        return series
+
+    def test_level_selection(self):
+        series = self._series()
+        # the recent past comes from the raw points
+        x, y = series.view(990., 1002., 100)
+        numpy.testing.assert_array_equal(x, self.x[990:])
+        numpy.testing.assert_array_equal(y, self.y[990:])
+
+        # the whole run only from a level that still holds its start
+        x, y = series.view(0., 1002., 100)
+        self.assertLessEqual(len(x), 100 + 2 * 4)
+        self.assertEqual(x[0], 0.)
+        self.assertEqual(x[-1], 1002.)
+
+        # more points allowed, a finer level
+        finer_x, _ = series.view(500., 1002., 300)
+        coarser_x, _ = series.view(500., 1002., 50)
+        self.assertLess(len(coarser_x), len(finer_x))
+        self.assertLessEqual(len(finer_x), 300 + 2 * 4)
+
+    def test_envelope(self):
+        series = self._series(capacity=2048)
+        for each_max_points in (2000, 300, 40):
+            x, y = series.view(0., 1002., each_max_points)
+            self.assertTrue(numpy.all(numpy.diff(x) > 0.))
+            # minimum and maximum of every series survive the downsampling
+            numpy.testing.assert_array_equal(y.min(axis=0), self.y.min(axis=0))
+            numpy.testing.assert_array_equal(y.max(axis=0), self.y.max(axis=0))
+            # every value is a value of its series
+            for _j in range(3):
+                self.assertTrue(numpy.all(numpy.isin(y[:, _j], self.y[:, _j])))
+
+    def test_bands_do_not_cross(self):
+        series = self._series(capacity=2048)
+        for each_max_points in (2000, 300, 40):
+            _, y = series.view(0., 1002., each_max_points)
+            self.assertTrue(numpy.all(numpy.diff(y, axis=1) >= 0.))
+
+    def test_appends_across_buckets(self):
+        series = MultiResolutionSeries(3, fan_out=4, capacity=2048)
+        for _i, (each_x, each_y) in enumerate(zip(self.x.tolist(), self.y.tolist())):
+            series.append(each_x, each_y)
+            if _i in (0, 2, 3, 4, 15, 16, 17, 100):
+                # all raw points while they fit
+                x, y = series.view(0., each_x, 2000)
+                numpy.testing.assert_array_equal(x, self.x[:_i + 1])
+                numpy.testing.assert_array_equal(y, self.y[:_i + 1])
+                # points waiting for their bucket still count for the envelope of coarse views
+                x, y = series.view(0., each_x, 4)
+                self.assertTrue(numpy.all(numpy.diff(x) > 0.))
+                numpy.testing.assert_array_equal(y.min(axis=0), self.y[:_i + 1].min(axis=0))
+                numpy.testing.assert_array_equal(y.max(axis=0), self.y[:_i + 1].max(axis=0))
+        self.assertEqual(len(series), 1003)
+
+    def test_bad_arguments(self):
+        for each_fan_out in (2, 5):
+            with self.assertRaises(ValueError):
+                MultiResolutionSeries(3, fan_out=each_fan_out)
+        with self.assertRaises(ValueError):
+            MultiResolutionSeries(3).append(0., (1., 2.))
+
+
+if __name__ == '__main__':
+    unittest.main()
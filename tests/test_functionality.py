@@ -0,0 +1,89 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from tools.functionality import NominalFunctionality, encode_symbols, functionality_nominal, functionality_nominal_arrays, functionality_rational_arrays, functionality_rational_linear
+
+import numpy
+
+
+def _rational_loop(sequence) -> float:
+    # the two pass loop the window moments replaced
+    no_examples = len(sequence)
+    x_mean = sum(_x for _x, _ in sequence) / no_examples
+    y_mean = sum(_y for _, _y in sequence) / no_examples
+    cov = sum((_x - x_mean) * (_y - y_mean) for _x, _y in sequence)
+    var = sum((_x - x_mean) ** 2. for _x, _ in sequence)
+    a = 0. if var == 0. else cov / var
+    t = y_mean - a * x_mean
+
+    dist_total = 0.
+    for each_input, each_output in sequence:
+        each_var = (each_output - (each_input * a + t)) ** 2.
+        normalized_distance = float(not each_var == 0.) if var == 0. else no_examples * each_var / var
+        dist_total += min(1., max(0., normalized_distance))
+    return 1. - dist_total / no_examples
+
+
+def _nominal_dicts(sequence) -> float:
+    # the nested dict counting the code pairs replaced
+    examples = dict()
+    for each_input, each_output in sequence:
+        sub_dict = examples.setdefault(each_input, dict())
+        sub_dict[each_output] = sub_dict.get(each_output, 0) + 1
+    best = sum(max(_f.values()) for _f in examples.values())
+    total = sum(sum(_f.values()) for _f in examples.values())
+    return best / total
+
+
+class TestRationalFunctionality(unittest.TestCase):
+
+    def setUp(self):
+        random_state = numpy.random.default_rng(9)
+        self.x = random_state.normal(loc=100., size=5000)
+        self.y = .01 * self.x + random_state.normal(scale=.001, size=5000)
+
+    def test_like_loop(self):
+        sequence = list(zip(self.x.tolist(), self.y.tolist()))
+        self.assertAlmostEqual(functionality_rational_linear(sequence), _rational_loop(sequence), places=9)
+
+    def test_windows(self):
+        expected = functionality_rational_arrays(self.x, self.y)
+        for each_window_size in (1, 7, 1000):
+            self.assertAlmostEqual(functionality_rational_arrays(self.x, self.y, window_size=each_window_size), expected, places=9)
+
+    def test_constant_inputs(self):
+        sequence = [(2., 1.), (2., 1.), (2., 3.), (2., 1.)]
+        self.assertEqual(functionality_rational_linear(sequence), _rational_loop(sequence))
+
+
+class TestNominalFunctionality(unittest.TestCase):
+
+    def setUp(self):
+        random_state = random.Random(10)
+        symbols = [1, "a", None, 2.5, "b", (0, 1)]
+        inputs = [random_state.choice(symbols) for _ in range(5001)]
+        self.sequence = [(_x, random_state.choice(symbols) if random_state.random() < .4 else _y) for _x, _y in zip(inputs[:-1], inputs[1:])]
+
+    def test_like_dicts(self):
+        self.assertEqual(functionality_nominal(self.sequence), _nominal_dicts(self.sequence))
+
+    def test_windows(self):
+        inputs = encode_symbols(_x for _x, _ in self.sequence)
+        outputs = encode_symbols(_y for _, _y in self.sequence)
+        expected = _nominal_dicts(self.sequence)
+        for each_window_size in (1, 7, 1000, 10000):
+            self.assertEqual(functionality_nominal_arrays(inputs, outputs, window_size=each_window_size), expected)
+
+    def test_codes_in_range(self):
+        functionality = NominalFunctionality()
+        for each_inputs, each_outputs in (([-1], [0]), ([1 << 31], [0]), ([0], [1 << 32])):
+            with self.assertRaises(ValueError):
+                functionality.feed(numpy.array(each_inputs), numpy.array(each_outputs))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "graph-visualization"))
+
+from graph_wrapper import GraphManager
+
+
+class _Frontend:
+    # python copy of `applyDeltas` and `customSynchronizeGraph` in templates/index.html
+    def __init__(self):
+        self.version = 0
+        self.nodes = dict()
+        self.links = list()
+        self.commands = list()
+        self.drop_deltas = False
+        self._messages = asyncio.Queue()
+
+    async def send_json(self, message: dict) -> None:
+        command, arguments = message["command"], message["positionalArguments"]
+        self.commands.append(command)
+        return_value = None
+        if command == "synchronizeGraph":
+            self.nodes = {_node["id"]: dict(_node) for _node in arguments[0]}
+            self.links = [dict(_link) for _link in arguments[1]]
+            self.version = return_value = arguments[2]
+
+        elif command == "applyDeltas":
+            base_version, version, deltas = arguments
+            if self.version == base_version and not self.drop_deltas:
+                for each_delta in deltas:
+                    self._apply(each_delta)
+                self.version = version
+            return_value = self.version
+
+        await self._messages.put({"type": "confirmation", "messageId": message["messageId"], "returnValue": return_value})
+
+    async def receive_json(self) -> dict:
+        return await self._messages.get()
+
+    def _apply(self, delta: dict) -> None:
+        operation = delta["op"]
+        if operation == "addNode":
+            self.nodes.setdefault(delta["node"]["id"], dict()).update(delta["node"])
+        elif operation == "updateNode":
+            if delta["id"] in self.nodes:
+                self.nodes[delta["id"]].update(delta["attributes"])
+        elif operation == "removeNode":
+            del self.nodes[delta["id"]]
+            self.links = [_link for _link in self.links if delta["id"] not in (_link["source"], _link["target"])]
+        elif operation == "addLink":
+            self.links.append(dict(delta["link"]))
+        elif operation == "updateLink":
+            for each_link in self.links:
+                if (each_link["source"], each_link["target"]) == (delta["source"], delta["target"]):
+                    each_link.update(delta["attributes"])
+        elif operation == "removeLink":
+            self.links = [_link for _link in self.links if (_link["source"], _link["target"]) != (delta["source"], delta["target"])]
+
+
+class TestGraphWrapper(unittest.TestCase):
+
+    def _run(self, steps) -> tuple[GraphManager, _Frontend]:
+        async def run():
+            frontend = _Frontend()
+            manager = GraphManager(frontend)
+            await manager.initialize_graph()
+            try:
+                await steps(manager, frontend)
+            finally:
+                await manager.close()
+            return manager, frontend
+
+        return asyncio.run(asyncio.wait_for(run(), 10))
+
+    def _assert_synchronized(self, manager: GraphManager, frontend: _Frontend) -> None:
+        self.assertEqual(frontend.version, manager._version)
+        self.assertEqual(frontend.nodes, {_node: {"label": str(_node), **_attributes, "id": _node} for _node, _attributes in manager._graph.nodes(data=True)})
+        links = {frozenset((_link["source"], _link["target"])): {_key: _value for _key, _value in _link.items() if _key not in ("source", "target")} for _link in frontend.links}
+        self.assertEqual(len(links), len(frontend.links))
+        self.assertEqual(links, {frozenset((_source, _target)): _attributes for _source, _target, _attributes in manager._graph.edges(data=True)})
+
+    def test_deltas_advance_version(self):
+        async def steps(manager, frontend):
+            for each_node in range(10):
+                manager.queue_add_node(each_node)
+            await manager.apply_deltas()
+            version = manager._version
+            manager.queue_add_link(0, 1, weight=1)
+            manager.queue_add_link(1, 0, weight=2)
+            manager.queue_update_node(2, color="red")
+            await manager.apply_deltas()
+            self.assertEqual(manager._version, version + 1)
+            self.assertEqual(frontend.commands[-1], "applyDeltas")
+            self.assertEqual(frontend.links, [{"weight": 2, "source": 0, "target": 1}])
+            manager.queue_remove_node(1)
+            await manager.apply_deltas()
+            self.assertEqual(frontend.commands[-1], "applyDeltas")
+            self._assert_synchronized(manager, frontend)
+
+        self._run(steps)
+
+    def test_no_deltas_no_command(self):
+        async def steps(manager, frontend):
+            number_of_commands = len(frontend.commands)
+            await manager.apply_deltas()
+            self.assertEqual(len(frontend.commands), number_of_commands)
+
+        self._run(steps)
+
+    def test_resync_after_missed_deltas(self):
+        async def steps(manager, frontend):
+            for each_node in range(10):
+                manager.queue_add_node(each_node)
+            await manager.apply_deltas()
+            frontend.drop_deltas = True
+            manager.queue_add_link(3, 4)
+            await manager.apply_deltas()
+            # the frontend confirmed its old version, the manager sent the whole graph
+            self.assertEqual(frontend.commands[-2:], ["applyDeltas", "synchronizeGraph"])
+            self._assert_synchronized(manager, frontend)
+            frontend.drop_deltas = False
+            manager.queue_add_link(4, 5)
+            await manager.apply_deltas()
+            self.assertEqual(frontend.commands[-1], "applyDeltas")
+            self._assert_synchronized(manager, frontend)
+
+        self._run(steps)
+
+    def test_large_batch_resyncs(self):
+        async def steps(manager, frontend):
+            manager.queue_add_node(0)
+            manager.queue_add_node(1)
+            await manager.apply_deltas()
+            self.assertEqual(frontend.commands[-1], "synchronizeGraph")
+            self._assert_synchronized(manager, frontend)
+
+        self._run(steps)
+
+    def test_link_announces_endpoints(self):
+        async def steps(manager, frontend):
+            for each_node in range(10):
+                manager.queue_add_node(each_node)
+            await manager.apply_deltas()
+            manager.queue_add_link(0, "new")
+            manager.queue_add_link("other", "new", weight=3)
+            await manager.apply_deltas()
+            self.assertEqual(frontend.commands[-1], "applyDeltas")
+            self.assertIn("new", frontend.nodes)
+            self.assertIn("other", frontend.nodes)
+            self._assert_synchronized(manager, frontend)
+
+        self._run(steps)
+
+    def test_add_node_merges_attributes(self):
+        async def steps(manager, frontend):
+            for each_node in range(10):
+                manager.queue_add_node(each_node, size=1)
+            await manager.apply_deltas()
+            manager.queue_add_node(0, color="red")
+            await manager.apply_deltas()
+            self.assertEqual(manager._graph.nodes[0], {"size": 1, "color": "red"})
+            self._assert_synchronized(manager, frontend)
+
+        self._run(steps)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from tools.import_check import CORE_MODULES, check_imports, import_cost
+
+
+class TestImportCheck(unittest.TestCase):
+
+    def test_no_visualization_packages(self):
+        for each_module in CORE_MODULES:
+            with self.subTest(module=each_module):
+                # generous bound, slow machines only have to stay in the same order of magnitude
+                seconds, loaded = import_cost(each_module)
+                self.assertEqual(list(loaded), [])
+                self.assertLess(seconds, 10.)
+
+    def test_check_imports(self):
+        self.assertTrue(check_imports(max_seconds=10.))
+
+
+if __name__ == '__main__':
+    unittest.main()
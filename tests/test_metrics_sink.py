@@ -0,0 +1,92 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from tools.logger import MetricsSink, read_metrics
+
+import numpy
+
+
+def _no_lines(file_path: str) -> int:
+    with open(file_path, mode="r") as file:
+        return sum(1 for _ in file)
+
+
+def _wait_for(condition, timeout: float = 5.) -> bool:
+    end = time.time() + timeout
+    while not condition():
+        if time.time() >= end:
+            return False
+        time.sleep(.01)
+    return True
+
+
+class TestMetricsSink(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, "metrics", "run")
+        self.rows = numpy.random.default_rng(13).normal(size=(2500, 3))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_text_round_trip(self):
+        with MetricsSink(self.file_path, ("a", "b", "c"), formats=("%.17g", "%.17g", "%.17g")) as sink:
+            for each_row in self.rows.tolist():
+                sink.write(each_row)
+        # appending keeps the single header
+        with MetricsSink(self.file_path, ("a", "b", "c"), formats=("%.17g", "%.17g", "%.17g")) as sink:
+            sink.write((1., 2., 3.))
+
+        with open(self.file_path, mode="r") as file:
+            self.assertEqual(file.readline(), "a\tb\tc\n")
+        numpy.testing.assert_array_equal(numpy.loadtxt(self.file_path, skiprows=1), numpy.vstack((self.rows, [1., 2., 3.])))
+
+    def test_binary_round_trip(self):
+        with MetricsSink(self.file_path, ("a", "b", "c"), binary=True) as sink:
+            for each_row in self.rows.tolist():
+                sink.write(each_row)
+        numpy.testing.assert_array_equal(read_metrics(self.file_path), self.rows)
+
+    def test_flush_by_rows(self):
+        sink = MetricsSink(self.file_path, ("a", "b", "c"), flush_rows=10, flush_secs=60.)
+        for each_row in self.rows[:25].tolist():
+            sink.write(each_row)
+        self.assertTrue(_wait_for(lambda: _no_lines(self.file_path) == 21))
+        time.sleep(.1)
+        self.assertEqual(_no_lines(self.file_path), 21)
+        sink.close()
+        self.assertEqual(_no_lines(self.file_path), 26)
+
+    def test_flush_by_time(self):
+        sink = MetricsSink(self.file_path, ("a", "b", "c"), flush_rows=1000, flush_secs=.1)
+        sink.write((1., 2., 3.))
+        self.assertTrue(_wait_for(lambda: _no_lines(self.file_path) == 2))
+        sink.close()
+
+    def test_error_is_raised(self):
+        sink = MetricsSink(self.file_path, ("a", "b"), flush_rows=1)
+        # right length, but the block cannot be written
+        sink.write((1., [2., 3.]))
+        self.assertTrue(_wait_for(lambda: not sink._thread.is_alive()))
+        with self.assertRaises(ValueError):
+            sink.write((1., 2.))
+        with self.assertRaises(ValueError):
+            sink.close()
+
+    def test_wrong_size(self):
+        with MetricsSink(self.file_path, ("a", "b")) as sink:
+            with self.assertRaises(ValueError):
+                sink.write((1., 2., 3.))
+        with self.assertRaises(ValueError):
+            MetricsSink(self.file_path, ("a", "b"), formats=("%f", ))
+
+
+if __name__ == '__main__':
+    unittest.main()
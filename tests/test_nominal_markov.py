@@ -0,0 +1,81 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from _framework.systems.predictors.nominal.implementations.nominal_markov_predictor import NominalMarkov
+
+import numpy
+
+
+class _JointMarkov:
+    # the previous NominalMarkov, one table keyed on the histories of all states together
+    def __init__(self, no_states: int):
+        self._table = dict()
+        self._dummy = tuple("#" for _ in range(no_states))
+
+    def predict(self, data_in):
+        sub_dict = self._table.get(data_in)
+        if sub_dict is None:
+            return self._dummy
+        prediction, _ = max(sub_dict.items(), key=lambda x: x[1])
+        return prediction
+
+    def fit(self, data_in, data_out):
+        sub_dict = self._table.get(data_in)
+        if sub_dict is None:
+            self._table[data_in] = {data_out: 1}
+        else:
+            sub_dict[data_out] = sub_dict.get(data_out, 0) + 1
+
+
+def _examples(no_states: int, no_steps: int, symbols, seed: int):
+    # histories of three symbols and the symbol after them, with some repetition so that counts tie and change
+    random_state = random.Random(seed)
+    sequences = [[random_state.choice(symbols[:3]) if random_state.random() < .7 else random_state.choice(symbols) for _ in range(no_steps + 3)] for _ in range(no_states)]
+    for _i in range(no_steps):
+        yield tuple(tuple(_s[_i:_i + 3]) for _s in sequences), tuple(_s[_i + 3] for _s in sequences)
+
+
+class TestNominalMarkov(unittest.TestCase):
+
+    def test_one_state_like_joint_table(self):
+        predictor, reference = NominalMarkov(1), _JointMarkov(1)
+        for data_in, data_out in _examples(1, 3000, "abcdefg", 0):
+            self.assertEqual(predictor.predict(data_in), reference.predict(data_in))
+            predictor.fit(data_in, data_out)
+            reference.fit(data_in, data_out)
+
+    def test_states_are_independent(self):
+        predictor = NominalMarkov(4)
+        references = [_JointMarkov(1) for _ in range(4)]
+        for data_in, data_out in _examples(4, 2000, "abcdefg", 1):
+            expected = tuple(_r.predict((_h, ))[0] for _r, _h in zip(references, data_in))
+            self.assertEqual(predictor.predict(data_in), expected)
+            predictor.fit(data_in, data_out)
+            for each_reference, each_history, each_output in zip(references, data_in, data_out):
+                each_reference.fit((each_history, ), (each_output, ))
+
+    def test_arrays_like_tuples(self):
+        symbols = [1, "a", None, 2.5, "b", (0, 1)]
+        tuple_predictor, array_predictor = NominalMarkov(3), NominalMarkov(3)
+        for data_in, data_out in _examples(3, 1000, symbols, 2):
+            array_in = numpy.empty((3, 3), dtype=object)
+            for _i, each_history in enumerate(data_in):
+                for _j, each_symbol in enumerate(each_history):
+                    array_in[_i, _j] = each_symbol
+            array_out = numpy.empty(3, dtype=object)
+            for _i, each_output in enumerate(data_out):
+                array_out[_i] = each_output
+
+            prediction = array_predictor.predict(array_in)
+            self.assertIsInstance(prediction, numpy.ndarray)
+            self.assertEqual(tuple(prediction.tolist()), tuple_predictor.predict(data_in))
+            array_predictor.fit(array_in, array_out)
+            tuple_predictor.fit(data_in, data_out)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import math
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from tools.base_tools.optimization import RegionOptimizer, batch_optimizer, stateful_optimizer
+
+import numpy
+
+
+def _peak(point) -> float:
+    # single maximum at (7.3, -2.1), positive everywhere
+    return math.exp(-((point[0] - 7.3) ** 2. + (point[1] + 2.1) ** 2.) / 8.)
+
+
+class TestOptimization(unittest.TestCase):
+
+    def setUp(self):
+        self.ranges = (0., 10.), (3., -5.)
+
+    def test_limit_bounds_frontier(self):
+        random_state = random.Random(3)
+        optimizer = RegionOptimizer(self.ranges, limit=5)
+        for _ in range(200):
+            points = optimizer.suggest(no_points=3)
+            values = [random_state.random() for _ in points]
+            candidates = [-_diagonal * _value for _value, (_, _, _diagonal) in zip(values, optimizer._suggested)]
+            candidates.extend(_element[0] for _element in optimizer._frontier)
+            optimizer.update(values)
+            self.assertLess(len(optimizer._frontier), 2 * 5)
+            # pruning keeps the regions that would be split first
+            self.assertEqual(optimizer._frontier[0][0], min(candidates))
+            self.assertEqual(sorted(_element[0] for _element in optimizer._frontier), sorted(candidates)[:len(optimizer._frontier)])
+
+    def test_invalid_limit(self):
+        with self.assertRaises(ValueError):
+            RegionOptimizer(self.ranges, limit=0)
+
+    def test_divide_inside_region(self):
+        optimizer = RegionOptimizer(((-1., 2.), (5., 3.), (0., .5)))
+        region = numpy.array([-1., 3., 0.]), numpy.array([2., 5., .5])
+        center = (region[0] + region[1]) / 2.
+        candidates = optimizer._divide(region, center)
+        self.assertEqual(len(candidates), 2 ** 3)
+        self.assertEqual(len({tuple(_center.tolist()) for _, _center, _ in candidates}), 2 ** 3)
+        half_diagonal = numpy.linalg.norm(region[1] - region[0]) / 2.
+        for (each_corner, each_end), each_center, each_diagonal in candidates:
+            numpy.testing.assert_array_equal(each_end, center)
+            numpy.testing.assert_allclose(each_center, (each_corner + center) / 2.)
+            self.assertAlmostEqual(each_diagonal, half_diagonal)
+            self.assertTrue(numpy.all(region[0] < each_center) and numpy.all(each_center < region[1]))
+
+    def test_suggestions_inside_ranges(self):
+        random_state = random.Random(5)
+        optimizer = RegionOptimizer(self.ranges, limit=20)
+        for _ in range(300):
+            points = optimizer.suggest(no_points=4)
+            for each_x, each_y in points:
+                self.assertTrue(0. < each_x < 10.)
+                self.assertTrue(-5. < each_y < 3.)
+            optimizer.update([random_state.random() for _ in points])
+
+    def test_batch_round_trip(self):
+        optimizer = batch_optimizer(self.ranges, 6, limit=50)
+        reference = RegionOptimizer(self.ranges, limit=50)
+        points = next(optimizer)
+        # the first region splits into four
+        self.assertEqual(len(points), 4)
+        for _i in range(50):
+            self.assertEqual(points, reference.suggest(no_points=6))
+            self.assertEqual(len(points), 4 if _i < 1 else 6)
+            values = [_peak(_point) for _point in points]
+            reference.update(values)
+            points = optimizer.send(values)
+
+    def test_small_frontier_small_batch(self):
+        # the first region has only two subregions in one dimension
+        optimizer = RegionOptimizer(((0., 1.),))
+        points = optimizer.suggest(no_points=5)
+        self.assertEqual(sorted(points), [(.25,), (.75,)])
+        optimizer.update((1., 1.))
+        self.assertEqual(len(optimizer.suggest(no_points=5)), 4)
+
+    def test_missing_values(self):
+        optimizer = RegionOptimizer(self.ranges)
+        points = optimizer.suggest(no_points=3)
+        with self.assertRaises(ValueError):
+            optimizer.suggest(no_points=3)
+        with self.assertRaises(ValueError):
+            optimizer.update([1.] * (len(points) - 1))
+        optimizer.update([1.] * len(points))
+        self.assertEqual(len(optimizer.suggest(no_points=3)), 3)
+
+    def test_send_protocol(self):
+        optimizer = stateful_optimizer(self.ranges, limit=100)
+        batched = batch_optimizer(self.ranges, 1, limit=100)
+        point = optimizer.send(None)
+        points = batched.send(None)
+        best_value = 0.
+        for _ in range(500):
+            self.assertEqual((point,), points)
+            value = _peak(point)
+            best_value = max(best_value, value)
+            point = optimizer.send(value)
+            points = batched.send((value,))
+        self.assertGreater(best_value, .999)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from _framework.setup import ExperimentFactory, ParallelSetup
+from _framework.streams.linear.rational.abstract import RationalStream
+from _framework.systems.predictors.rational.implementations.rational_average_predictor import RationalAverage
+
+
+class _RampStream(RationalStream):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._iteration = 0
+
+    def __str__(self):
+        return self.__class__.__name__
+
+    def _before(self):
+        pass
+
+    def _get_inputs(self):
+        return (float(self._iteration), ),
+
+    def _get_outputs(self):
+        return (self._iteration / 10., ),
+
+    def _after(self):
+        self._iteration += 1
+
+
+def _experiment(drag) -> dict:
+    return {
+        "predictor_def": (RationalAverage, {"no_states": 1, "input_dimensions": 1, "output_dimensions": 1, "drag": drag}),
+        "streams_def": (_RampStream, {"history_length": 1}, {"history_length": 1}),
+    }
+
+
+class TestParallelSetup(unittest.TestCase):
+
+    def _setup(self, *experiments) -> ParallelSetup:
+        return ParallelSetup(experiments, 2, 50, storage_interval_its=0, visualization_interval_secs=0., no_processes=2)
+
+    def test_all_instances_finish(self):
+        setup = self._setup(_experiment(10), _experiment(100))
+        setup.run_experiment()
+        self.assertTrue(all(_r.finished and _r.iteration == 50 for each_array in setup._experiments for _r in each_array))
+
+    def test_worker_error_is_raised(self):
+        with self.assertRaises(RuntimeError):
+            self._setup(_experiment("no drag")).run_experiment()
+
+    def test_unpicklable_arguments_are_raised(self):
+        setup = self._setup(_experiment(lambda: 10))
+        with self.assertRaises(Exception) as context:
+            setup.run_experiment()
+        self.assertNotIsInstance(context.exception, RuntimeError)
+
+
+class TestExperimentFactory(unittest.TestCase):
+
+    def test_instance_numbers(self):
+        factory = ExperimentFactory(no_instance=3, **_experiment(10))
+        self.assertEqual([str(factory.create())[-4:] for _ in range(2)], ["#003", "#004"])
+        self.assertTrue(str(ExperimentFactory(**_experiment(10)).create()).endswith("#000"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from _framework.setup import Experiment, PipelinedExperiment, Setup
+from _framework.streams.linear.rational.abstract import RationalStream
+from _framework.systems.predictors.rational.implementations.rational_average_predictor import RationalAverage
+
+
+class _RampStream(RationalStream):
+    def __init__(self, fail_at: int = -1, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._fail_at = fail_at
+        self._iteration = 0
+
+    def __str__(self):
+        return self.__class__.__name__
+
+    def _before(self):
+        if self._iteration == self._fail_at:
+            raise KeyError(self._iteration)
+
+    def _get_inputs(self):
+        return (float(self._iteration % 7), ),
+
+    def _get_outputs(self):
+        return (self._iteration % 5 / 10., ),
+
+    def _after(self):
+        self._iteration += 1
+
+
+def _experiment_args(fail_at: int = -1) -> dict:
+    return {
+        "predictor_def": (RationalAverage, {"no_states": 1, "input_dimensions": 1, "output_dimensions": 1, "drag": 10}),
+        "streams_def": (_RampStream, {"fail_at": fail_at, "history_length": 1}, {"history_length": 1}),
+    }
+
+
+def _prefetch_threads() -> int:
+    return sum(each_thread.name.endswith("(_produce)") for each_thread in threading.enumerate())
+
+
+class TestPipelinedExperiment(unittest.TestCase):
+
+    def _experiment(self, experiment_class, **kwargs):
+        predictor = RationalAverage(1, 1, 1, 10)
+        return experiment_class("ramp", predictor, _RampStream(history_length=1), _RampStream(history_length=1), **kwargs)
+
+    def test_same_metrics_as_sequential(self):
+        sequential = self._experiment(Experiment)
+        pipelined = self._experiment(PipelinedExperiment, prefetch_depth=3)
+        for _ in range(300):
+            expected = sequential.step()
+            metrics = pipelined.step()
+            self.assertEqual(metrics[1:], expected[1:])
+        pipelined.close()
+
+    def test_stream_error_is_raised_and_threads_stop(self):
+        no_threads = _prefetch_threads()
+        setup = Setup((_experiment_args(fail_at=20), ), 2, 100, storage_interval_its=0, visualization_interval_secs=0., prefetch_depth=2)
+        with self.assertRaises(RuntimeError):
+            setup.run_experiment()
+        self.assertEqual(_prefetch_threads(), no_threads)
+
+    def test_setup_runs_to_the_end(self):
+        setup = Setup((_experiment_args(), ), 2, 50, storage_interval_its=0, visualization_interval_secs=0., prefetch_depth=2)
+        setup.run_experiment()
+        self.assertEqual(setup._iteration, 50)
+        self.assertTrue(all(each_instance._prefetchers is None for each_instance in setup._experiments[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
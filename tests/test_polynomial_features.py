@@ -0,0 +1,83 @@
+import itertools
+import os
+import sys
+import unittest
+from functools import reduce
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from tools.base_tools.approximation.functions import MultiplePolynomialFunction, exponent_matrix, input_distribution, polynomial_features
+from tools.base_tools.approximation.rational_to_rational import MultiplePolynomialFromLinearRegression
+
+import numpy
+
+
+def _polynomial_values(input_values, degree: int):
+    # the reduce based expansion the exponent matrix replaced
+    return tuple(
+        tuple(
+            reduce(lambda _x, _y: _x * _y, each_combination)
+            for each_combination in itertools.combinations_with_replacement(input_values, _i + 1)
+        )
+        for _i in range(degree)
+    )
+
+
+def _derive_coefficients(coefficients, input_distribution_, derive_by: int):
+    # the exponent counting derivation the index map replaced
+    derived_coefficients = []
+    for _i, (_coefficients, _inputs) in enumerate(zip(coefficients, input_distribution_)):
+        if _i < 1:
+            continue
+        new_ = []
+        for _each_input, _base_coef in zip(_inputs, _coefficients):
+            degree = _each_input.count(derive_by)
+            if 0 < degree:
+                new_.append(degree * _base_coef)
+        if 0 < len(new_):
+            derived_coefficients.append(new_)
+    return tuple(derived_coefficients)
+
+
+class TestPolynomialFeatures(unittest.TestCase):
+
+    def setUp(self):
+        self.random_state = numpy.random.default_rng(4)
+
+    def test_batch_like_reduce(self):
+        for each_dimensionality, each_degree in ((1, 1), (1, 4), (3, 2), (3, 3), (5, 3)):
+            inputs = self.random_state.normal(size=(50, each_dimensionality))
+            features = polynomial_features(inputs, each_degree)
+            self.assertEqual(features.shape, (50, len(exponent_matrix(each_dimensionality, each_degree))))
+            for each_input, each_features in zip(inputs.tolist(), features):
+                expected = [_v for _d in _polynomial_values(each_input, each_degree) for _v in _d]
+                numpy.testing.assert_allclose(each_features, expected, rtol=1e-12)
+
+    def test_values_and_inputs_keep_order(self):
+        for each_dimensionality, each_degree in ((1, 3), (2, 2), (4, 3)):
+            each_input = tuple(self.random_state.normal(size=each_dimensionality).tolist())
+            expected = _polynomial_values(each_input, each_degree)
+            values = MultiplePolynomialFunction.polynomial_values(each_input, each_degree)
+            self.assertEqual([len(_d) for _d in values], [len(_d) for _d in expected])
+            for each_values, each_expected in zip(values, expected):
+                numpy.testing.assert_allclose(each_values, each_expected, rtol=1e-12)
+            flat = MultiplePolynomialFromLinearRegression.polynomial_inputs(each_input, each_degree)
+            numpy.testing.assert_allclose(flat, [_v for _d in expected for _v in _d], rtol=1e-12)
+
+    def test_derive_like_counting(self):
+        for each_dimensionality, each_degree in ((1, 3), (3, 2), (3, 4)):
+            distribution = input_distribution(each_dimensionality, each_degree)
+            coefficients = tuple(self.random_state.normal(size=len(_d)).tolist() for _d in distribution)
+            for each_variable in range(each_dimensionality):
+                self.assertEqual(
+                    MultiplePolynomialFunction.derive_coefficients(coefficients, distribution, each_variable),
+                    _derive_coefficients(coefficients, distribution, each_variable))
+
+    def test_layout_is_shared_and_read_only(self):
+        self.assertIs(exponent_matrix(3, 2), exponent_matrix(3, 2))
+        with self.assertRaises(ValueError):
+            exponent_matrix(3, 2)[0, 0] = 5
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from tools.functionality import smear
+from tools.regression_experiments import FullPolynomialRegressor, LinearRegressor, SinglePolynomialRegressor
+
+import numpy
+
+
+class _SmearPolynomial:
+    # the list based SinglePolynomialRegressor the arrays replaced
+    def __init__(self, degree: int):
+        self._degree = degree
+        self._var_matrix = tuple([0. for _ in range(degree + 1)] for _ in range(degree + 1))
+        self._cov_matrix = [0. for _ in range(degree + 1)]
+
+    def fit(self, in_value: float, out_value: float, drag: int):
+        for _r, _var_row in enumerate(self._var_matrix):
+            for _c in range(self._degree + 1):
+                _var_row[_c] = smear(_var_row[_c], in_value ** (_r + _c), drag)
+            self._cov_matrix[_r] = smear(self._cov_matrix[_r], out_value * in_value ** _r, drag)
+
+    def get_parameters(self):
+        try:
+            return tuple(numpy.linalg.solve(self._var_matrix, self._cov_matrix))
+        except numpy.linalg.LinAlgError:
+            return tuple(0. for _ in range(self._degree + 1))
+
+
+class TestPolynomialRegressor(unittest.TestCase):
+
+    def setUp(self):
+        random_state = numpy.random.default_rng(3)
+        self.inputs = random_state.uniform(-2., 2., size=(400, 2))
+        self.targets = numpy.column_stack((
+            self.inputs[:, 0] ** 3. - self.inputs[:, 1],
+            2. * self.inputs[:, 1] ** 2. + self.inputs[:, 0])) + random_state.normal(scale=.1, size=(400, 2))
+
+    def test_fit_like_smear(self):
+        for each_drag in (1, 30, 1000):
+            regressor, reference = SinglePolynomialRegressor(3), _SmearPolynomial(3)
+            for each_input, each_target in zip(self.inputs[:, 0].tolist(), self.targets[:, 0].tolist()):
+                regressor.fit(each_input, each_target, each_drag)
+                reference.fit(each_input, each_target, each_drag)
+            numpy.testing.assert_allclose(regressor.get_parameters(), reference.get_parameters(), rtol=1e-9, atol=1e-9)
+
+    def test_fit_batch_like_fit(self):
+        for each_drag in (1, 30, 1000):
+            batch, sequential = SinglePolynomialRegressor(3), SinglePolynomialRegressor(3)
+            # uneven blocks, the first empty
+            for each_start, each_end in ((0, 0), (0, 1), (1, 57), (57, 300), (300, 400)):
+                batch.fit_batch(self.inputs[each_start:each_end, 0], self.targets[each_start:each_end, 0], each_drag)
+                for each_input, each_target in zip(self.inputs[each_start:each_end, 0].tolist(), self.targets[each_start:each_end, 0].tolist()):
+                    sequential.fit(each_input, each_target, each_drag)
+                if each_end < 4:
+                    # too few examples for a cubic, the moment matrix is singular
+                    continue
+                numpy.testing.assert_allclose(batch.get_parameters(), sequential.get_parameters(), rtol=1e-9, atol=1e-9)
+            numpy.testing.assert_allclose(batch.output_batch(self.inputs[:20, 0]), [sequential.output(_x) for _x in self.inputs[:20, 0].tolist()], rtol=1e-9, atol=1e-9)
+
+    def test_full_fit_batch_like_fit(self):
+        batch, sequential = FullPolynomialRegressor((3, 2), 2), FullPolynomialRegressor((3, 2), 2)
+        batch.fit_batch(self.inputs, self.targets, 50)
+        for each_input, each_target in zip(self.inputs.tolist(), self.targets.tolist()):
+            sequential.fit(each_input, each_target, 50)
+        for each_input in self.inputs[:20].tolist():
+            numpy.testing.assert_allclose(batch.output(each_input), sequential.output(each_input), rtol=1e-9, atol=1e-9)
+
+    def test_cached_parameters_follow_fit(self):
+        regressor = LinearRegressor(2, 10)
+        for each_input, each_target in zip(self.inputs.tolist(), self.targets[:, 1].tolist()):
+            regressor.fit(each_input, each_target)
+            parameters = regressor.get_parameters()
+            self.assertEqual(regressor.output(each_input), sum(_x * _p for _x, _p in zip(each_input, parameters[:-1])) + parameters[-1])
+
+        single = SinglePolynomialRegressor(2)
+        for each_input, each_target in zip(self.inputs[:, 0].tolist(), self.targets[:, 0].tolist()):
+            single.fit(each_input, each_target, 10)
+        single.get_parameters()
+        single.fit(2., 1., 10)
+        self.assertEqual(single.get_parameters(), tuple(numpy.linalg.solve(single._var_matrix, single._cov_matrix).tolist()))
+
+
+if __name__ == '__main__':
+    unittest.main()
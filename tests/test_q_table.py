@@ -0,0 +1,172 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from _framework.systems.controllers.nominal.abstract import NominalController
+from _framework.systems.controllers.nominal.implementations.nominal_sarsa_controller import NominalSarsaController
+from data_generation.data_sources.systems.controller_nominal import SarsaController
+from tools.q_table import QTable
+
+import numpy
+
+
+MOTORS = "n", "e", "s", "w"
+MOVES = {"n": (0, 1), "e": (1, 0), "s": (0, -1), "w": (-1, 0)}
+
+
+class _DictSarsa:
+    # the dict based SarsaController the table replaced
+    def __init__(self, alpha: float, gamma: float, epsilon: float, default_evaluation: float):
+        self.alpha, self.gamma, self.epsilon = alpha, gamma, epsilon
+        self.default_evaluation = default_evaluation
+        self.evaluation = dict()
+        self.last_perception = None
+        self.last_action = None
+
+    def _evaluate(self, perception, action):
+        return self.evaluation.get(perception, dict()).get(action, self.default_evaluation)
+
+    def react_to(self, sensor, reward: float):
+        if random.random() < self.epsilon:
+            action = random.choice(MOTORS)
+            evaluation = self._evaluate(sensor, action)
+        elif sensor not in self.evaluation:
+            action = random.choice(MOTORS)
+            evaluation = self._evaluate(sensor, action)
+        else:
+            action, evaluation = max(self.evaluation[sensor].items(), key=lambda _x: _x[1])
+
+        new_value = reward + self.gamma * evaluation
+        sub_dict = self.evaluation.get(self.last_perception)
+        if sub_dict is None:
+            self.evaluation[self.last_perception] = {self.last_action: new_value}
+        else:
+            last_evaluation = sub_dict.get(self.last_action, self.default_evaluation)
+            sub_dict[self.last_action] = last_evaluation + self.alpha * (new_value - last_evaluation)
+
+        self.last_perception = sensor
+        self.last_action = action
+        return action
+
+
+class _DictNominalSarsa(NominalController):
+    # the dict based NominalSarsaController the table replaced
+    def __init__(self, motor_space, alpha: float, gamma: float, epsilon: float, default_evaluation: float):
+        super().__init__(motor_space)
+        self._alpha, self._gamma, self._epsilon = alpha, gamma, epsilon
+        self._default_evaluation = default_evaluation
+        self._evaluation_function = dict()
+        self._last_condition = None
+        self._last_reward = 0.
+
+    def decide(self, perception):
+        if random.random() < self._epsilon or perception not in self._evaluation_function:
+            return self._random_action()
+        action, _ = max(self._evaluation_function[perception].items(), key=lambda _x: _x[1])
+        return action
+
+    def _integrate(self, perception, action, reward: float):
+        this_evaluation = self._evaluation_function.get(perception, dict()).get(action, self._default_evaluation)
+        if self._last_condition is not None:
+            last_perception, last_action = self._last_condition
+            new_value = self._last_reward + self._gamma * this_evaluation
+            last_sub_dict = self._evaluation_function.get(last_perception)
+            if last_sub_dict is None:
+                self._evaluation_function[last_perception] = {last_action: new_value}
+            else:
+                last_evaluation = last_sub_dict.get(last_action, self._default_evaluation)
+                last_sub_dict[last_action] = last_evaluation + self._alpha * (new_value - last_evaluation)
+        self._last_condition = perception, action
+        self._last_reward = reward
+
+
+def _reacting(controller):
+    # decide, then integrate the perception and action with the reward they got
+    def _react(perception, reward: float):
+        action = controller.react(perception)
+        controller.integrate(perception, action, reward)
+        return action
+    return _react
+
+
+def _walk(react, seed: int, no_steps: int):
+    # grid of 5 x 5, reward for reaching the far corner
+    random.seed(seed)
+    x = y = 0
+    reward = 0.
+    actions = []
+    for _ in range(no_steps):
+        action = react((x, y), reward)
+        actions.append(action)
+        dx, dy = MOVES[action]
+        x, y = min(max(x + dx, 0), 4), min(max(y + dy, 0), 4)
+        reward = float((x, y) == (4, 4))
+        if 0. < reward:
+            x = y = 0
+    return actions
+
+
+def _first_difference(actions, expected) -> int:
+    # step of the first different decision, -1 if there is none
+    return next((_i for _i, (_a, _e) in enumerate(zip(actions, expected)) if _a != _e), -1 if len(actions) == len(expected) else min(len(actions), len(expected)))
+
+
+class TestQTable(unittest.TestCase):
+
+    def test_update_batch_is_update_in_order(self):
+        random_state = numpy.random.default_rng(6)
+        batch_table, pair_table = QTable(3, capacity=2), QTable(3, capacity=2)
+        for _ in range(20):
+            # few perceptions and motors, so most batches repeat pairs and first visit rows
+            perceptions = random_state.integers(0, 12, size=30)
+            rows = batch_table.intern_batch(perceptions.tolist())
+            self.assertEqual(pair_table.intern_batch(perceptions.tolist()).tolist(), rows.tolist())
+            motors = random_state.integers(0, 3, size=30)
+            targets = random_state.normal(size=30)
+
+            batch_table.update_batch(rows, motors, targets, .3)
+            for each_row, each_motor, each_target in zip(rows.tolist(), motors.tolist(), targets.tolist()):
+                pair_table.update(each_row, each_motor, each_target, .3)
+
+            numpy.testing.assert_allclose(batch_table.values(), pair_table.values(), rtol=1e-12)
+            self.assertEqual([batch_table.best(_r) for _r in range(len(batch_table))], [pair_table.best(_r) for _r in range(len(pair_table))])
+
+    def test_ties_go_to_first_visit(self):
+        table = QTable(3)
+        row = table.intern("a")
+        table.update(row, 2, 1., .5)
+        table.update(row, 0, 2., .5)
+        self.assertEqual(table.evaluate(row, 0), table.evaluate(row, 2))
+        self.assertEqual(table.best(row), 2)
+        self.assertEqual(table.select_batch(numpy.array([row]), 0.).tolist(), [2])
+
+    def test_snapshot(self):
+        table = QTable(2, capacity=1)
+        for each_perception in "abc":
+            table.update(table.intern(each_perception), 1, 1., .5)
+        restored = QTable.__new__(QTable)
+        restored.__setstate__(table.__getstate__())
+        numpy.testing.assert_array_equal(restored.values(), table.values())
+        self.assertEqual(restored.perceptions, list("abc"))
+
+
+class TestSarsaControllers(unittest.TestCase):
+
+    def test_same_decisions_as_dict(self):
+        for each_seed in range(5):
+            expected = _walk(_DictSarsa(.1, .5, .1, 10.).react_to, each_seed, 5000)
+            actions = _walk(SarsaController(MOTORS, .1, .5, .1, default_evaluation=10.).react_to, each_seed, 5000)
+            self.assertEqual(_first_difference(actions, expected), -1)
+
+    def test_nominal_controller_same_decisions_as_dict(self):
+        for each_seed in range(5):
+            expected = _walk(_reacting(_DictNominalSarsa(MOTORS, .1, .5, .1, default_evaluation=10.)), each_seed, 5000)
+            actions = _walk(_reacting(NominalSarsaController(MOTORS, .1, .5, .1, default_evaluation=10.)), each_seed, 5000)
+            self.assertEqual(_first_difference(actions, expected), -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
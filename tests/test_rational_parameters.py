@@ -0,0 +1,56 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from modelling.content import ContentFactory
+from modelling.semiotic_functions import _most_probable
+
+import numpy
+
+
+class TestRationalParameters(unittest.TestCase):
+
+    def setUp(self):
+        self.random_state = numpy.random.default_rng(2)
+        self.factory = ContentFactory(2, 2, 10, 3)
+        self.layer = dict()
+
+    def _condition(self):
+        return tuple(self.random_state.normal(size=2).tolist())
+
+    def _add(self, no_contents: int):
+        for _ in range(no_contents):
+            shape = len(self.layer)
+            self.layer[shape] = self.factory.rational(shape)
+
+    def _adapt_some(self):
+        for each_content in self.random_state.choice(list(self.layer.values()), size=5):
+            each_content.adapt(self._condition(), self._condition())
+
+    def test_matches_contents_while_level_grows(self):
+        for _ in range(10):
+            self._add(4)
+            self._adapt_some()
+            parameters = self.factory.rational_parameters
+
+            condition, consequence = self._condition(), self._condition()
+            expected = [_c.probability(condition, consequence) for _c in self.layer.values()]
+            numpy.testing.assert_allclose(parameters.probabilities(condition, consequence), expected, rtol=1e-12)
+            numpy.testing.assert_allclose(parameters.predict(condition), [_c.predict(condition) for _c in self.layer.values()], rtol=1e-12)
+
+        self.assertEqual(len(parameters), 40)
+        self.assertEqual(parameters.contents, list(self.layer.values()))
+
+    def test_most_probable_is_first_maximum(self):
+        self._add(30)
+        for _ in range(50):
+            self._adapt_some()
+            condition, consequence = self._condition(), self._condition()
+            expected = max(self.layer.values(), key=lambda _x: _x.probability(condition, consequence))
+            self.assertIs(_most_probable(self.layer, condition, consequence), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from itertools import islice
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from data_generation.data_sources.sequences.read_gif import generate_grayscale_pixels, generate_pixel_examples, generate_rbg_pixels, load_frames, pool_frames
+
+import numpy
+from PIL import Image
+
+
+def _getpixel_frames(file_path, window_size):
+    # the seek and getpixel loop pool_frames replaced, one pass only
+    frame = Image.open(file_path)
+    square = window_size ** 2
+    n_frames = 0
+    while True:
+        frame_rgb = frame.convert("RGB")
+        pixels = []
+        for _y in range(0, (frame_rgb.height // window_size) * window_size, window_size):
+            for _x in range(0, (frame_rgb.width // window_size) * window_size, window_size):
+                window = tuple(frame_rgb.getpixel((_x + __x, _y + __y)) for __y in range(window_size) for __x in range(window_size))
+                _r, _g, _b = zip(*window)
+                pixels.append((sum(_r) // square, sum(_g) // square, sum(_b) // square))
+        yield tuple(pixels)
+
+        n_frames += 1
+        try:
+            frame.seek(n_frames)
+        except EOFError:
+            break
+
+
+class TestReadGif(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "frames.gif")
+        random_state = numpy.random.default_rng(5)
+        images = [Image.fromarray(random_state.integers(0, 256, size=(7, 11, 3), dtype=numpy.uint8)) for _ in range(4)]
+        images[0].save(self.path, save_all=True, append_images=images[1:], duration=10, loop=0, disposal=1)
+        self.no_frames = len(list(_getpixel_frames(self.path, 1)))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_first_pass_matches_getpixel(self):
+        for each_window in (1, 2, 3):
+            expected = list(_getpixel_frames(self.path, each_window))
+            self.assertEqual(list(islice(generate_rbg_pixels(self.path, window_size=each_window), self.no_frames)), expected)
+
+    def test_passes_start_at_first_frame(self):
+        frames = list(islice(generate_rbg_pixels(self.path), 2 * self.no_frames))
+        self.assertEqual(frames[:self.no_frames], frames[self.no_frames:])
+
+    def test_pool_frames_does_not_overflow(self):
+        frames = numpy.full((2, 64, 64, 3), 255, dtype=numpy.uint8)
+        pooled = pool_frames(frames, 64)
+        self.assertEqual(pooled.dtype, numpy.uint8)
+        self.assertEqual(pooled.tolist(), [[[[255, 255, 255]]]] * 2)
+
+    def test_cache(self):
+        frames = load_frames(self.path, window_size=2, cache=True)
+        self.assertTrue(os.path.isfile(self.path + ".2.npy"))
+        numpy.testing.assert_array_equal(load_frames(self.path, window_size=2, cache=True), frames)
+
+    def test_grayscale_examples(self):
+        pixels = list(_getpixel_frames(self.path, 2))
+        grayscale = list(islice(generate_grayscale_pixels(generate_rbg_pixels(self.path, window_size=2)), self.no_frames))
+        self.assertEqual(grayscale, [tuple((sum(_p) // 3, ) for _p in _f) for _f in pixels])
+
+        examples = next(generate_pixel_examples(iter(pixels)))
+        expected = tuple(((__l, ), (float(__n >= __l), )) for _l, _n in zip(pixels[0], pixels[1]) for __l, __n in zip(_l, _n))
+        self.assertEqual(examples, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from modelling.content import RationalContent, RLS_MIN_COEFFICIENTS
+from tools.regression_experiments import BatchRecursiveLeastSquares, LinearRegressor, RecursiveLeastSquares
+
+import numpy
+
+
+def _weighted_least_squares(inputs: numpy.ndarray, targets: numpy.ndarray, forgetting: float) -> numpy.ndarray:
+    # closed form solution, the newest example has weight one
+    augmented = numpy.column_stack((inputs, numpy.ones(len(inputs))))
+    weights = numpy.sqrt(forgetting ** numpy.arange(len(inputs))[::-1])
+    solution, *_ = numpy.linalg.lstsq(augmented * weights[:, None], targets * weights[:, None], rcond=None)
+    return solution
+
+
+class TestRecursiveLeastSquares(unittest.TestCase):
+
+    def setUp(self):
+        random_state = numpy.random.default_rng(0)
+        self.inputs = random_state.normal(size=(500, 3))
+        self.targets = self.inputs @ numpy.array([[1., -2.], [.5, 0.], [0., 3.]]) + numpy.array([.3, -1.]) + random_state.normal(scale=.1, size=(500, 2))
+
+    def _fit(self, drag: int) -> RecursiveLeastSquares:
+        regression = RecursiveLeastSquares(3, 2, drag)
+        for each_input, each_target in zip(self.inputs, self.targets):
+            regression.fit(each_input, each_target)
+        return regression
+
+    def test_large_drag_is_ordinary_least_squares(self):
+        expected = _weighted_least_squares(self.inputs, self.targets, 1.)
+        numpy.testing.assert_allclose(self._fit(10 ** 9).get_parameters(), expected, atol=1e-4)
+
+    def test_drag_is_exponential_forgetting(self):
+        expected = _weighted_least_squares(self.inputs, self.targets, 50. / 51.)
+        numpy.testing.assert_allclose(self._fit(50).get_parameters(), expected, atol=1e-4)
+
+    def test_zero_drag_is_rejected(self):
+        with self.assertRaises(ValueError):
+            RecursiveLeastSquares(3, 2, 0)
+        with self.assertRaises(ValueError):
+            BatchRecursiveLeastSquares(4, 3, 2, 0)
+
+    def test_targets_smeared_like_linear_regressor(self):
+        regression = self._fit(50)
+        reference = LinearRegressor(3, 50)
+        for each_input, each_target in zip(self.inputs.tolist(), self.targets[:, 0].tolist()):
+            reference.fit(each_input, each_target)
+        self.assertAlmostEqual(regression.get_variances()[0], reference.get_variance(), places=12)
+
+    def test_output(self):
+        regression = self._fit(50)
+        parameters = regression.get_parameters()
+        numpy.testing.assert_allclose(regression.output(self.inputs[0]), self.inputs[0] @ parameters[:-1] + parameters[-1])
+
+
+class TestRationalContent(unittest.TestCase):
+
+    def test_low_dimensions_use_closed_form(self):
+        random_state = numpy.random.default_rng(1)
+        content = RationalContent(2, 1, 0, 10, 5)
+        reference = LinearRegressor(2, 10)
+        self.assertIsNone(content.regression)
+
+        for _ in range(200):
+            condition = tuple(random_state.normal(size=2).tolist())
+            consequence = sum(condition) + random_state.normal(scale=.1),
+            self.assertEqual(content.predict(condition), (reference.output(condition),))
+            content.adapt(condition, consequence)
+            reference.fit(condition, consequence[0])
+
+    def test_high_dimensions_use_least_squares(self):
+        content = RationalContent(RLS_MIN_COEFFICIENTS, 1, 0, 10, 5)
+        self.assertIsNone(content.regressions)
+        content.adapt(tuple(range(RLS_MIN_COEFFICIENTS)), (1.,))
+        self.assertEqual(content.get_parameters().shape, (RLS_MIN_COEFFICIENTS + 1, 1))
+
+    def _switched(self, output_dimension: int, drag: int) -> numpy.ndarray:
+        # absolute errors on the second of two linear functions, after learning the first for long
+        content = RationalContent(1, output_dimension, 0, drag, 5)
+        for each_slope, each_offset, no_steps in ((2., 1., 1000), (-3., 4., 300)):
+            for each_input in numpy.linspace(-1., 1., no_steps).tolist():
+                content.adapt((each_input, ), tuple(each_slope * each_input + each_offset for _ in range(output_dimension)))
+        return numpy.abs(numpy.array([content.predict((_x, )) for _x in (-.5, 0., .5)]) - numpy.array([[-3. * _x + 4.] for _x in (-.5, 0., .5)]))
+
+    def test_same_drag_across_threshold(self):
+        below, above = RLS_MIN_COEFFICIENTS // 2 - 1, RLS_MIN_COEFFICIENTS // 2
+        self.assertIsNotNone(RationalContent(1, below, 0, 20, 5).regressions)
+        self.assertIsNotNone(RationalContent(1, above, 0, 20, 5).regression)
+        for each_drag in (0, 20):
+            # both sides forget the first function
+            self.assertLess(numpy.max(self._switched(below, each_drag)), .01)
+            self.assertLess(numpy.max(self._switched(above, each_drag)), .01)
+        self.assertIsNotNone(RationalContent(1, above, 0, 0, 5).regressions)
+
+
+if __name__ == '__main__':
+    unittest.main()
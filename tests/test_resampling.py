@@ -0,0 +1,98 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from data_generation.data_processing import equisample
+from tools.resampling import EquiSampler, align_series, equisample_blocks, sample_blocks
+
+import numpy
+
+
+def _loop_equisample(iterator, target_delta: float):
+    # the per-sample loop the block resampling replaced
+    last_time = -1
+    last_value = 0.
+    for time_stamp, value in iterator:
+        delta = time_stamp - last_time
+        if delta < target_delta:
+            continue
+        elif delta == target_delta or last_time < 0:
+            yield time_stamp, value
+            last_value = value
+            last_time = time_stamp
+        else:
+            value_change = (value - last_value) / delta
+            for _ in range(round(delta // target_delta)):
+                last_value += value_change
+                last_time += target_delta
+                yield last_time, last_value
+
+
+class TestEquiSampler(unittest.TestCase):
+
+    def setUp(self):
+        random_state = numpy.random.default_rng(5)
+        # irregular time stamps with gaps, some closer than the target delta
+        self.time_stamps = 1000. + numpy.cumsum(random_state.choice([7., 30., 60., 61., 300., 1000.], size=3000))
+        self.values = numpy.cumsum(random_state.normal(size=3000))
+        self.splits = numpy.sort(random_state.integers(0, 3000, size=40))
+
+    def _sampled(self, blocks, target_delta: float):
+        sampled = list(equisample_blocks(blocks, target_delta))
+        return numpy.concatenate([_g for _g, _ in sampled]), numpy.concatenate([_v for _, _v in sampled])
+
+    def test_linear_interpolation(self):
+        grid, values = self._sampled([(self.time_stamps, self.values)], 60.)
+        expected_grid = self.time_stamps[0] + 60. * numpy.arange(int((self.time_stamps[-1] - self.time_stamps[0]) // 60.) + 1)
+        numpy.testing.assert_array_equal(grid, expected_grid)
+        numpy.testing.assert_allclose(values, numpy.interp(expected_grid, self.time_stamps, self.values), rtol=1e-12)
+
+    def test_split_anywhere(self):
+        whole = self._sampled([(self.time_stamps, self.values)], 45.)
+        # empty blocks, single samples and blocks shorter than the delta included
+        blocks = list(zip(numpy.split(self.time_stamps, self.splits), numpy.split(self.values, self.splits)))
+        blocks += [(self.time_stamps[:0], self.values[:0])]
+        split = self._sampled(blocks, 45.)
+        numpy.testing.assert_array_equal(split[0], whole[0])
+        numpy.testing.assert_array_equal(split[1], whole[1])
+
+        pairs = list(zip(self.time_stamps.tolist(), self.values.tolist()))
+        for each_block_size in (1, 7, 4096):
+            numpy.testing.assert_array_equal(self._sampled(sample_blocks(iter(pairs), block_size=each_block_size), 45.)[1], whole[1])
+
+    def test_sample_blocks_from_list(self):
+        pairs = list(zip(self.time_stamps[:20].tolist(), self.values[:20].tolist()))
+        blocks = list(sample_blocks(pairs, block_size=7))
+        self.assertEqual([_t.shape for _t in blocks], [(2, 7), (2, 7), (2, 6)])
+        numpy.testing.assert_array_equal(numpy.concatenate(blocks, axis=1), numpy.array(pairs).T)
+
+    def test_on_grid_like_loop(self):
+        time_stamps = 1030. + 60. * numpy.arange(500)
+        pairs = list(zip(time_stamps.tolist(), self.values[:500].tolist()))
+        self.assertEqual(list(equisample(iter(pairs), 60.)), list(_loop_equisample(iter(pairs), 60.)))
+
+    def test_first_sample_below_delta(self):
+        self.assertEqual(list(equisample(iter([(10., 1.), (70., 2.), (130., 4.)]), 60.)), [(10., 1.), (70., 2.), (130., 4.)])
+
+    def test_positive_delta(self):
+        for each_delta in (0., -1.):
+            with self.assertRaises(ValueError):
+                EquiSampler(each_delta)
+            with self.assertRaises(ValueError):
+                align_series([(self.time_stamps, self.values)], each_delta)
+
+    def test_align_series(self):
+        other_time_stamps = self.time_stamps[100:] + 13.
+        grid, aligned = align_series([(self.time_stamps, self.values), (other_time_stamps, self.values[100:])], 60.)
+        self.assertEqual(grid[0], other_time_stamps[0])
+        self.assertLessEqual(grid[-1], self.time_stamps[-1])
+        self.assertLess(self.time_stamps[-1] - grid[-1], 60.)
+        self.assertEqual(aligned.shape, (2, len(grid)))
+        numpy.testing.assert_allclose(aligned[0], numpy.interp(grid, self.time_stamps, self.values), rtol=1e-12)
+        numpy.testing.assert_allclose(aligned[1], numpy.interp(grid, other_time_stamps, self.values[100:]), rtol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from data_generation.data_processing import trail
+from data_generation.data_sources.sequences.non_interactive import examples_rational_trigonometric
+from tools.io_tools import generate_window
+from tools.ring_buffer import RingBuffer, sliding_windows
+
+import numpy
+
+
+def _list_trail(values, length):
+    # the list based implementation the ring buffer replaced
+    window = []
+    for each_value in values:
+        window.append(each_value)
+        if length < len(window):
+            window.pop(0)
+        if len(window) == length:
+            yield tuple(window)
+
+
+class TestRingBuffer(unittest.TestCase):
+
+    def test_keeps_last_values_in_order(self):
+        buffer = RingBuffer(3, dtype=int)
+        for each_value in range(10):
+            buffer.append(each_value)
+            self.assertEqual(buffer.as_tuple(), tuple(range(max(0, each_value - 2), each_value + 1)))
+        self.assertTrue(buffer.is_full())
+        self.assertEqual(list(buffer), [7, 8, 9])
+        self.assertEqual(buffer[-1], 9)
+
+    def test_view_is_contiguous(self):
+        buffer = RingBuffer(4, dtype=float)
+        for each_value in range(7):
+            buffer.append(each_value)
+        view = buffer.view()
+        self.assertIs(view.base, buffer._buffer)
+        self.assertEqual(view.tolist(), [3., 4., 5., 6.])
+
+    def test_popleft_and_clear(self):
+        buffer = RingBuffer(2)
+        buffer.append("a")
+        buffer.append("b")
+        buffer.append("c")
+        self.assertEqual(buffer.popleft(), "b")
+        self.assertEqual(len(buffer), 1)
+        buffer.clear()
+        with self.assertRaises(IndexError):
+            buffer.popleft()
+
+    def test_rejects_empty_capacity(self):
+        with self.assertRaises(ValueError):
+            RingBuffer(0)
+
+    def test_sliding_windows(self):
+        values = numpy.arange(6)
+        self.assertEqual(sliding_windows(values, 3).tolist(), [list(_w) for _w in _list_trail(range(6), 3)])
+
+
+class TestWindows(unittest.TestCase):
+
+    def test_trail_yields_copies(self):
+        windows = list(trail(iter(range(6)), 3))
+        self.assertEqual(windows, list(_list_trail(range(6), 3)))
+
+    def test_trail_views_are_opt_in(self):
+        windows = [_w.copy() for _w in trail(iter(range(6)), 3, dtype=int, view=True)]
+        self.assertEqual([tuple(_w.tolist()) for _w in windows], list(_list_trail(range(6), 3)))
+
+    def test_generate_window_yields_copies(self):
+        windows = list(generate_window(iter("abcde"), 2))
+        self.assertEqual(windows, list(_list_trail("abcde", 2)))
+
+    def test_trigonometric_history(self):
+        for each_length in (0, 1, 3):
+            generator = examples_rational_trigonometric(history_length=each_length)
+            inputs = [next(generator)[0] for _ in range(5)]
+            self.assertTrue(all(len(_i) == each_length for _i in inputs))
+        self.assertEqual(next(examples_rational_trigonometric(history_length=0)), ((), (1.,)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from _framework.systems.controllers.nominal.implementations.nominal_semiotic_sarsa_controller import NominalSemioticSarsaBatchController, NominalSemioticSarsaController
+
+import numpy
+
+
+MOTORS = "n", "e", "s", "w"
+
+
+class TestSemioticSarsa(unittest.TestCase):
+
+    def test_key_truncates_levels(self):
+        # shapes of two examples with three and two levels
+        predictor_state = (4, 1, 7), (2, 5)
+        controller = NominalSemioticSarsaController(MOTORS, .1, .5, .1, no_levels=2)
+        self.assertEqual(controller._key(((), "a", predictor_state)), ("a", ((4, 1), (2, 5))))
+        self.assertEqual(controller._key(((), "a", ((4, 1, 0), (2, 5)))), controller._key(((), "a", predictor_state)))
+        self.assertNotEqual(controller._key(((), "a", ((4, 2, 7), (2, 5)))), controller._key(((), "a", predictor_state)))
+        self.assertNotEqual(controller._key(((), "b", predictor_state)), controller._key(((), "a", predictor_state)))
+
+        controller = NominalSemioticSarsaController(MOTORS, .1, .5, .1)
+        self.assertEqual(controller._key(((), "a", predictor_state)), ("a", predictor_state))
+
+    def test_batch_key_truncates_levels(self):
+        controller = NominalSemioticSarsaBatchController(MOTORS, .1, .5, .1, no_levels=1, random_state=numpy.random.default_rng(0))
+        controller.decide_batch(("a", "a", "b"), ((3, 1), (3, 2), (3, 1)))
+        self.assertEqual(controller.evaluation_function.perceptions, [("a", (3,)), ("b", (3,))])
+
+    def test_integrate_before_decide(self):
+        controller = NominalSemioticSarsaBatchController(MOTORS, .1, .5, .1, random_state=numpy.random.default_rng(0))
+        with self.assertRaises(ValueError):
+            controller.integrate_batch((1., 1.))
+
+        controller.decide_batch(("a", "b"), ((0,), (1,)))
+        controller.integrate_batch((1., 1.))
+        # every decision is integrated once
+        with self.assertRaises(ValueError):
+            controller.integrate_batch((1., 1.))
+
+    def test_batch_like_single_controllers(self):
+        # agents see disjoint sensors, the shared table then holds the tables of independent controllers
+        no_agents, no_levels = 6, 2
+        random_state = numpy.random.default_rng(11)
+        batch = NominalSemioticSarsaBatchController(MOTORS, .2, .8, .3, no_levels=no_levels, random_state=numpy.random.default_rng(3))
+        singles = [NominalSemioticSarsaController(MOTORS, .2, .8, .3, no_levels=no_levels) for _ in range(no_agents)]
+
+        for _ in range(300):
+            sensors = tuple((_i, int(_s)) for _i, _s in enumerate(random_state.integers(3, size=no_agents)))
+            predictor_state = tuple(tuple(_state) for _state in random_state.integers(2, size=(no_agents, 3)).tolist())
+            rewards = random_state.normal(size=no_agents)
+
+            motors = batch.decide_batch(sensors, predictor_state)
+            batch.integrate_batch(rewards)
+            for each_single, each_sensor, each_state, each_motor, each_reward in zip(singles, sensors, predictor_state, motors, rewards):
+                each_single.integrate(((), each_sensor, (each_state,)), MOTORS[each_motor], float(each_reward))
+
+        table = batch.evaluation_function
+        no_perceptions = 0
+        for each_single in singles:
+            single_table = each_single._evaluation_function
+            for each_row, (each_sensor, (each_state,)) in enumerate(single_table.perceptions):
+                batch_row = table.row((each_sensor, each_state))
+                self.assertEqual(table.values()[batch_row].tolist(), single_table.values()[each_row].tolist())
+                self.assertEqual(table.best(batch_row), single_table.best(each_row))
+            no_perceptions += len(single_table)
+        self.assertEqual(len(table), no_perceptions)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from tools.series_cache import INDEX_FILE, load_columns, series_values
+
+import numpy
+
+
+class TestSeriesCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.source = os.path.join(self.directory, "klines.tsv")
+        self._write_source(100)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write_source(self, no_rows: int, offset: float = 0.):
+        with open(self.source, mode="w") as file:
+            for _i in range(no_rows):
+                file.write("{:d}\t{:f}\t{:f}\t{:f}\t{:f}\t0\n".format(60000 * _i, _i, _i + 1., _i - 1., _i + offset))
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.source + ".columns", name + ".npy")
+
+    def test_same_values_as_source(self):
+        values = list(series_values(self.source))
+        self.assertEqual(values, [(60. * _i, float(_i)) for _i in range(100)])
+        self.assertIsInstance(load_columns(self.source)["close"], numpy.memmap)
+
+    def test_rebuild_keeps_open_views(self):
+        old_close = load_columns(self.source)["close"]
+        self._write_source(50, offset=.5)
+        os.utime(self.source, ns=(0, 0))
+
+        new_close = load_columns(self.source)["close"]
+        self.assertEqual(len(new_close), 50)
+        self.assertEqual(new_close[1], 1.5)
+        self.assertEqual(old_close.tolist(), [float(_i) for _i in range(100)])
+
+    def test_missing_column_is_rebuilt(self):
+        load_columns(self.source)
+        os.remove(self._column_path("close"))
+        self.assertEqual(len(load_columns(self.source)["close"]), 100)
+        self.assertTrue(os.path.exists(self._column_path("close")))
+
+    def test_short_column_is_rebuilt(self):
+        load_columns(self.source)
+        path = self._column_path("high")
+        with open(path, mode="r+b") as file:
+            file.truncate(os.path.getsize(path) // 2)
+        self.assertEqual(load_columns(self.source)["high"].tolist(), [_i + 1. for _i in range(100)])
+
+    def test_no_temporary_files_remain(self):
+        load_columns(self.source)
+        self.assertEqual(sorted(os.listdir(self.source + ".columns")), sorted(["timestamp.npy", "open.npy", "high.npy", "low.npy", "close.npy", INDEX_FILE]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import asyncio
+import itertools
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deprecated"))
+
+from tools.split_merge import async_split_iterator, merge_iterators, split_iterator, tee_iterator
+
+
+def _triples(no_values: int, error_at: int = -1):
+    for _i in range(no_values):
+        if _i == error_at:
+            raise KeyError(_i)
+        yield _i, _i * 10, _i * 100
+
+
+async def _async_triples(no_values: int, error_at: int = -1):
+    for each_triple in _triples(no_values, error_at=error_at):
+        await asyncio.sleep(0)
+        yield each_triple
+
+
+def _consume(iterator, results: list, index: int):
+    # values until the end, then the error or None
+    values = []
+    try:
+        for each_value in iterator:
+            values.append(each_value)
+        results[index] = values, None
+    except KeyError as e:
+        results[index] = values, e
+
+
+class TestSplitIterator(unittest.TestCase):
+
+    def test_split_and_merge(self):
+        a, b, c = split_iterator(_triples(50), 3)
+        self.assertEqual(list(merge_iterators((a, b, c))), list(_triples(50)))
+
+    def test_tee(self):
+        iterators = tee_iterator(iter(range(20)), 3)
+        self.assertEqual([list(_i) for _i in iterators], [list(_i) for _i in itertools.tee(range(20), 3)])
+
+    def test_bounded(self):
+        a, b = tee_iterator(iter(range(10)), 2, max_buffered=3)
+        self.assertEqual([next(a) for _ in range(3)], [0, 1, 2])
+        with self.assertRaises(BufferError):
+            next(a)
+        self.assertEqual(next(b), 0)
+        self.assertEqual(next(a), 3)
+
+        b.close()
+        self.assertEqual(list(a), list(range(4, 10)))
+
+    def test_closed_consumer_stops(self):
+        a, b = tee_iterator(iter(range(10)), 2)
+        self.assertEqual([next(a) for _ in range(3)], [0, 1, 2])
+        a.close()
+        with self.assertRaises(StopIteration):
+            next(a)
+        b.close()
+        with self.assertRaises(StopIteration):
+            next(b)
+
+    def test_error_reaches_every_consumer(self):
+        a, b, c = split_iterator(_triples(10, error_at=4), 3)
+        self.assertEqual([next(a) for _ in range(4)], [0, 1, 2, 3])
+        with self.assertRaises(KeyError):
+            next(a)
+        self.assertEqual([next(b) for _ in range(4)], [0, 10, 20, 30])
+        with self.assertRaises(KeyError):
+            next(b)
+        with self.assertRaises(KeyError):
+            list(c)
+        with self.assertRaises(KeyError):
+            next(a)
+
+
+class TestThreadSafeSplitIterator(unittest.TestCase):
+
+    def _run(self, no_values: int, error_at: int = -1) -> list:
+        iterators = split_iterator(_triples(no_values, error_at=error_at), 3, max_buffered=4, thread_safe=True)
+        results = [None] * 3
+        threads = [threading.Thread(target=_consume, args=(_i, results, _j)) for _j, _i in enumerate(iterators)]
+        for each_thread in threads:
+            each_thread.start()
+        for each_thread in threads:
+            each_thread.join(timeout=10.)
+            self.assertFalse(each_thread.is_alive())
+        return results
+
+    def test_consumers_in_threads(self):
+        results = self._run(200)
+        self.assertEqual([_v for _v, _ in results], [list(_c) for _c in zip(*_triples(200))])
+        self.assertTrue(all(_e is None for _, _e in results))
+
+    def test_error_reaches_every_thread(self):
+        results = self._run(200, error_at=50)
+        self.assertEqual([_v for _v, _ in results], [list(_c) for _c in zip(*_triples(50))])
+        self.assertTrue(all(isinstance(_e, KeyError) for _, _e in results))
+
+    def test_closed_consumer_stops(self):
+        a, b = tee_iterator(iter(range(10)), 2, max_buffered=2, thread_safe=True)
+        self.assertEqual([next(a) for _ in range(2)], [0, 1])
+        # a waits for b until it is closed from another thread
+        results = [None]
+        thread = threading.Thread(target=_consume, args=(a, results, 0), daemon=True)
+        thread.start()
+        thread.join(timeout=.1)
+        a.close()
+        thread.join(timeout=10.)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(results, [([], None)])
+        self.assertEqual(list(b), list(range(10)))
+
+
+class TestAsyncSplitIterator(unittest.TestCase):
+
+    @staticmethod
+    async def _consume(iterator) -> tuple:
+        values = []
+        try:
+            async for each_value in iterator:
+                values.append(each_value)
+        except KeyError as e:
+            return values, e
+        return values, None
+
+    def _run(self, no_values: int, error_at: int = -1) -> list:
+        async def _main():
+            iterators = async_split_iterator(_async_triples(no_values, error_at=error_at), 3, max_buffered=4)
+            return await asyncio.wait_for(asyncio.gather(*(self._consume(_i) for _i in iterators)), 10.)
+        return asyncio.run(_main())
+
+    def test_consumers(self):
+        results = self._run(100)
+        self.assertEqual([_v for _v, _ in results], [list(_c) for _c in zip(*_triples(100))])
+        self.assertTrue(all(_e is None for _, _e in results))
+
+    def test_error_reaches_every_consumer(self):
+        results = self._run(100, error_at=30)
+        self.assertEqual([_v for _v, _ in results], [list(_c) for _c in zip(*_triples(30))])
+        self.assertTrue(all(isinstance(_e, KeyError) for _, _e in results))
+
+    def test_closed_consumer_stops(self):
+        async def _main():
+            a, b, _ = async_split_iterator(_async_triples(10), 3)
+            self.assertEqual(await a.__anext__(), 0)
+            await a.aclose()
+            with self.assertRaises(StopAsyncIteration):
+                await a.__anext__()
+            self.assertEqual((await self._consume(b))[0], list(range(0, 100, 10)))
+        asyncio.run(asyncio.wait_for(_main(), 10.))
+
+
+if __name__ == '__main__':
+    unittest.main()